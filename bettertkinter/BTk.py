@@ -1,5 +1,9 @@
 import tkinter as tk
 import os
+from contextlib import contextmanager
+from .BTkAnimator import BTkAnimator
+from .BTkCanvasWidget import BTkRenderQueue
+from .BTkTheme import get_theme, subscribe, set_background
 
 class BTk(tk.Tk):
     """Modern BetterTkinter main window with professional styling"""
@@ -11,9 +15,16 @@ class BTk(tk.Tk):
     def __init__(self, title="BetterTkinter Application", **kwargs):
         super().__init__()
         
+        # Shared frame clock for widget animations
+        self.animator = BTkAnimator(self, fps=kwargs.get('fps', BTkAnimator.DEFAULT_FPS))
+        
+        # Deferred redraws of invalidated widgets
+        self.render_queue = BTkRenderQueue(self)
+        
         # Configuration
         self.title(title)
-        self.configure(bg="#FFFFFF")
+        self.configure(bg=get_theme().widget_palette("window")["bg"])
+        subscribe(self)
         
         # Set default geometry
         width = kwargs.get('width', 800)
@@ -29,6 +40,19 @@ class BTk(tk.Tk):
         # Configure window properties
         self.configure_window(**kwargs)
     
+    def apply_theme(self, theme, batch=None):
+        """Change the window background for a new theme"""
+        set_background(self, theme.widget_palette("window")["bg"], batch)
+    
+    @contextmanager
+    def batch(self):
+        """Suspend widget rendering; every changed widget redraws once when the block ends"""
+        self.render_queue.hold()
+        try:
+            yield self
+        finally:
+            self.render_queue.release()
+    
     def center_window(self):
         """Center the window on screen"""
         self.update_idletasks()
@@ -0,0 +1,127 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+# Top-level module, so the spawned worker does not import the GUI package
+from bettertkinter_analyzers import BTkDiagnostic, analyze_python
+
+class BTkAnalysisService:
+    """Runs an analyzer over buffer snapshots in a worker process
+    
+    At most one snapshot is analyzed at a time; submitting while a job runs
+    replaces the queued snapshot, so only the newest one is analyzed next.
+    Results are collected with poll() from the Tk thread and carry the
+    version they were submitted with, so the owner can drop stale ones. If
+    worker processes are unavailable, a worker thread is used instead. The
+    worker is started with "spawn" on every platform, so the analyzer must be
+    a module-level function in a module that does not import bettertkinter
+    (see bettertkinter_analyzers), and scripts need an
+    if __name__ == "__main__": guard, as on Windows and macOS. If the worker
+    dies, the snapshot it was analyzing is analyzed again on a thread.
+    """
+    
+    def __init__(self, analyzer=analyze_python):
+        self.analyzer = analyzer
+        self._executor = None
+        self._future = None
+        self._running = None    # (version, text) being analyzed
+        self._pending = None
+    
+    def _get_executor(self):
+        if self._executor is None:
+            try:
+                # Spawned, not forked: forking a process running Tk's threads is unsafe
+                self._executor = ProcessPoolExecutor(max_workers=1,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            except (OSError, NotImplementedError, ImportError, ValueError) as e:
+                print(f"Analysis error: no worker process ({e}), using a thread")
+                self._executor = ThreadPoolExecutor(max_workers=1)
+        return self._executor
+    
+    def _use_thread(self, error):
+        """Replace a broken worker process with a worker thread"""
+        print(f"Analysis error: {error}, using a thread")
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = ThreadPoolExecutor(max_workers=1)
+    
+    def submit(self, version, text):
+        """Queue a snapshot for analysis"""
+        self._pending = (version, text)
+        if self._future is None:
+            self._start_pending()
+    
+    def _start_pending(self):
+        self._running = self._pending
+        self._pending = None
+        text = self._running[1]
+        try:
+            self._future = self._get_executor().submit(self.analyzer, text)
+        except Exception as e:
+            # Broken pool (worker died): fall back to a thread
+            self._use_thread(e)
+            self._future = self._executor.submit(self.analyzer, text)
+    
+    @property
+    def busy(self):
+        """Whether a snapshot is being analyzed or waiting"""
+        return self._future is not None or self._pending is not None
+    
+    def poll(self):
+        """Get (version, diagnostics, symbols) of a finished job, or None"""
+        future = self._future
+        if future is None or not future.done():
+            return None
+        
+        self._future = None
+        version, text = self._running
+        try:
+            diagnostics, symbols = future.result()
+        except BrokenProcessPool as e:
+            # Worker died: analyze the same snapshot on a thread, unless a newer one waits
+            self._use_thread(e)
+            if self._pending is None:
+                self._pending = (version, text)
+            self._start_pending()
+            return None
+        except Exception as e:
+            print(f"Analysis error: {e}")
+            result = None
+        else:
+            result = (version, diagnostics, symbols)
+        
+        if self._pending is not None:
+            self._start_pending()
+        return result
+    
+    def shutdown(self):
+        """Stop the worker; a running analysis is abandoned"""
+        self._pending = None
+        self._future = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+# Benchmark
+if __name__ == "__main__":
+    import time
+    
+    source = "\n".join(
+        f"class Model{i}:\n    def method(self, value):\n        return value * {i}\n"
+        for i in range(10000))
+    service = BTkAnalysisService()
+    
+    start = time.perf_counter()
+    service.submit(1, source)
+    service.submit(2, source + "\ndef broken(:\n")
+    results = []
+    while len(results) < 2:
+        result = service.poll()
+        if result:
+            results.append(result)
+        time.sleep(0.005)
+    elapsed = time.perf_counter() - start
+    
+    version, diagnostics, symbols = results[0]
+    print(f"v{version}: {len(symbols)} symbols, v{results[1][0]}: {results[1][1]} "
+          f"({elapsed * 1000:.0f} ms for {source.count(chr(10)) + 1} lines, off the UI thread)")
+    service.shutdown()
@@ -0,0 +1,228 @@
+import time
+import tkinter as tk
+from collections import deque
+
+# Easing curves: map linear progress 0..1 to eased progress 0..1
+def ease_linear(t):
+    return t
+
+def ease_out(t):
+    return 1 - (1 - t) ** 3
+
+def ease_in_out(t):
+    return t * t * (3 - 2 * t)
+
+class BTkAnimation:
+    """One animation registered with a BTkAnimator"""
+    
+    __slots__ = ('widget', 'key', 'duration', 'step', 'easing', 'on_done', 'start')
+    
+    def __init__(self, widget, key, duration, step, easing, on_done, start):
+        self.widget = widget
+        self.key = key
+        self.duration = duration
+        self.step = step
+        self.easing = easing
+        self.on_done = on_done
+        self.start = start
+
+class BTkAnimator:
+    """Shared frame clock that drives every animation of one Tk root
+    
+    All animations advance from a single after() callback at the target
+    frame rate, so many animating widgets cost one timer per frame. Progress
+    is computed from elapsed time, not counted frames, so a slow frame makes
+    an animation jump ahead instead of run long. Widgets that are not
+    viewable (unmapped, or in a withdrawn or iconified toplevel) are skipped
+    until their animation ends, when they get one final step. The clock
+    stops when nothing is animating. Use BTkAnimator.of(widget) to get the
+    animator of a widget's root.
+    """
+    
+    # Constants
+    DEFAULT_FPS = 60
+    STATS_FRAMES = 120    # Frames kept for statistics
+    
+    def __init__(self, root, fps=DEFAULT_FPS, clock=time.perf_counter):
+        self.root = root
+        self.fps = fps
+        self.clock = clock
+        self.animations = {}
+        self.paused = False
+        
+        # Statistics
+        self.frames = 0
+        self.skipped = 0
+        self._frame_times = deque(maxlen=self.STATS_FRAMES)
+        self._intervals = deque(maxlen=self.STATS_FRAMES)
+        
+        self._job = None
+        self._last_tick = None
+        self._paused_at = None
+    
+    @classmethod
+    def of(cls, widget):
+        """Get the animator of a widget's root, creating it on first use"""
+        root = widget._root()
+        animator = getattr(root, "animator", None)
+        if not isinstance(animator, BTkAnimator):
+            animator = cls(root)
+            root.animator = animator
+        return animator
+    
+    # Animations
+    def animate(self, widget, duration, step, easing=ease_out, on_done=None, key=None):
+        """Call step(progress) each frame for duration seconds
+        
+        progress runs from 0 to 1 through easing and the last call is always
+        step(1.0). With duration None the animation runs until cancelled and
+        step gets the elapsed seconds instead. A new animation replaces the
+        one running for the same widget and key.
+        """
+        animation = BTkAnimation(widget, key, duration, step, easing, on_done, self.clock())
+        self.animations[(str(widget), key)] = animation
+        self._schedule()
+        return animation
+    
+    def cancel(self, widget=None, key=None):
+        """Stop animations: all of them, all of a widget's, or one by key"""
+        if widget is None:
+            self.animations.clear()
+        elif key is not None:
+            self.animations.pop((str(widget), key), None)
+        else:
+            name = str(widget)
+            for entry in [entry for entry in self.animations if entry[0] == name]:
+                del self.animations[entry]
+    
+    def is_animating(self, widget, key=None):
+        """Whether a widget has a running animation (for key, if given)"""
+        if key is not None:
+            return (str(widget), key) in self.animations
+        name = str(widget)
+        return any(entry[0] == name for entry in self.animations)
+    
+    def pause(self):
+        """Freeze all animations"""
+        if self.paused:
+            return
+        self.paused = True
+        self._paused_at = self.clock()
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+    
+    def resume(self):
+        """Continue all animations where they were paused"""
+        if not self.paused:
+            return
+        paused_for = self.clock() - self._paused_at
+        for animation in self.animations.values():
+            animation.start += paused_for
+        self.paused = False
+        self._last_tick = None
+        self._schedule()
+    
+    # Frame clock
+    def _schedule(self):
+        if self._job is not None or self.paused or not self.animations:
+            return
+        interval = 1.0 / self.fps
+        if self._last_tick is None:
+            delay = interval
+        else:
+            delay = self._last_tick + interval - self.clock()
+        self._job = self.root.after(max(1, int(delay * 1000)), self._tick)
+    
+    def _tick(self):
+        """Advance every animation by one frame"""
+        self._job = None
+        now = self.clock()
+        if self._last_tick is not None:
+            self._intervals.append(now - self._last_tick)
+        self._last_tick = now
+        
+        for entry, animation in list(self.animations.items()):
+            try:
+                visible = animation.widget.winfo_viewable()
+            except tk.TclError:
+                # Widget destroyed
+                self._remove(entry, animation)
+                continue
+            
+            elapsed = now - animation.start
+            done = animation.duration is not None and elapsed >= animation.duration
+            if not visible and not done:
+                self.skipped += 1
+                continue
+            try:
+                if animation.duration is None:
+                    animation.step(elapsed)
+                else:
+                    animation.step(1.0 if done else animation.easing(elapsed / animation.duration))
+            except Exception as e:
+                print(f"Animation error: {e}")
+                done = True
+            
+            if done and self._remove(entry, animation) and animation.on_done:
+                animation.on_done()
+        
+        self.frames += 1
+        self._frame_times.append(self.clock() - now)
+        if not self.animations:
+            self._last_tick = None
+        self._schedule()
+    
+    def _remove(self, entry, animation):
+        """Remove an animation unless it was replaced meanwhile"""
+        if self.animations.get(entry) is animation:
+            del self.animations[entry]
+            return True
+        return False
+    
+    # Statistics
+    def stats(self):
+        """Get frame statistics over the last STATS_FRAMES frames"""
+        frame_times = sorted(self._frame_times)
+        intervals = self._intervals
+        return {
+            "frames": self.frames,
+            "animations": len(self.animations),
+            "fps": len(intervals) / sum(intervals) if intervals else 0.0,
+            "frame_ms": 1000 * sum(frame_times) / len(frame_times) if frame_times else 0.0,
+            "frame_ms_p95": 1000 * frame_times[int(len(frame_times) * 0.95)] if frame_times else 0.0,
+            "frame_ms_max": 1000 * frame_times[-1] if frame_times else 0.0,
+            "skipped": self.skipped,
+        }
+
+# Performance test
+if __name__ == "__main__":
+    def performance_test():
+        """Animate 300 widgets from one frame clock and report frame statistics"""
+        root = tk.Tk()
+        root.title("BTkAnimator Test")
+        animator = BTkAnimator.of(root)
+        
+        bars = []
+        for i in range(300):
+            canvas = tk.Canvas(root, width=40, height=8, bg="#E9ECEF", highlightthickness=0)
+            canvas.grid(row=i // 10, column=i % 10, padx=2, pady=2)
+            bars.append((canvas, canvas.create_rectangle(0, 0, 0, 8, fill="#007BFF", outline="")))
+        
+        def bounce(canvas, item, phase):
+            def step(elapsed):
+                width = 20 + 20 * ((elapsed + phase) % 2 - 1)
+                canvas.coords(item, 0, 0, abs(width), 8)
+            return step
+        
+        for i, (canvas, item) in enumerate(bars):
+            animator.animate(canvas, None, bounce(canvas, item, i / 150))
+        
+        def report():
+            print(animator.stats())
+            root.after(1000, report)
+        
+        root.after(1000, report)
+        root.mainloop()
+    
+    performance_test()
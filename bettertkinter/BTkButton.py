@@ -1,7 +1,9 @@
 import tkinter as tk
 import math
+from .BTkCanvasWidget import BTkCanvasWidget
+from .BTkTheme import get_theme, subscribe, set_background, parent_background
 
-class BTkButton(tk.Canvas):
+class BTkButton(BTkCanvasWidget):
     """Modern, high-performance BetterTkinter button component"""
     
     # Constants
@@ -9,6 +11,7 @@ class BTkButton(tk.Canvas):
     DEFAULT_WIDTH = 120
     DEFAULT_HEIGHT = 40
     DEFAULT_RADIUS = 8
+    COLOR_OPTIONS = ('bg_color', 'hover_color', 'press_color', 'fg_color')
     
     def __init__(self, parent, text="Button", style="primary", **kwargs):
         # Extract configuration
@@ -32,30 +35,35 @@ class BTkButton(tk.Canvas):
         
         # Button state
         self._state = "normal"
-        self._rendered = False
         
         # Render and bind events
-        self._render()
+        self.redraw()
         self._bind_events()
     
+        # Follow theme changes
+        subscribe(self)
+    
     def _load_style(self, style, kwargs):
-        """Load optimized color scheme"""
-        # Modern color palette
-        color_schemes = {
-            "primary": {"bg": "#007BFF", "hover": "#0056B3", "press": "#004085", "fg": "white"},
-            "success": {"bg": "#28A745", "hover": "#1E7E34", "press": "#155724", "fg": "white"},
-            "warning": {"bg": "#FFC107", "hover": "#E0A800", "press": "#D39E00", "fg": "#212529"},
-            "danger": {"bg": "#DC3545", "hover": "#BD2130", "press": "#A71E2A", "fg": "white"},
-            "secondary": {"bg": "#6C757D", "hover": "#5A6268", "press": "#494F54", "fg": "white"},
-            "light": {"bg": "#F8F9FA", "hover": "#E2E6EA", "press": "#DAE0E5", "fg": "#212529"},
-            "dark": {"bg": "#343A40", "hover": "#23272B", "press": "#1D2024", "fg": "white"}
-        }
-        
-        colors = color_schemes.get(style, color_schemes["primary"])
-        self.bg_color = kwargs.get('bg_color', colors["bg"])
-        self.hover_color = kwargs.get('hover_color', colors["hover"])
-        self.press_color = kwargs.get('press_color', colors["press"])
-        self.fg_color = kwargs.get('fg_color', colors["fg"])
+        """Load the style's colors from the current theme, keeping given colors"""
+        self.style = style
+        self._color_overrides = {key: kwargs[key] for key in self.COLOR_OPTIONS if key in kwargs}
+        self._apply_palette(get_theme().button_palette(style))
+        
+    def _apply_palette(self, palette):
+        """Take colors from a theme palette except the overridden ones"""
+        overrides = self._color_overrides
+        self.bg_color = overrides.get('bg_color', palette["bg"])
+        self.hover_color = overrides.get('hover_color', palette["hover"])
+        self.press_color = overrides.get('press_color', palette["press"])
+        self.fg_color = overrides.get('fg_color', palette["fg"])
+    
+    def apply_theme(self, theme, batch=None):
+        """Recolor for a new theme in place, without a redraw"""
+        self._apply_palette(theme.button_palette(self.style))
+        set_background(self, parent_background(self), batch)
+        color = self._get_current_color()
+        self.recolor({"button_bg": {"fill": color, "outline": color},
+                      "button_text": {"fill": self.fg_color}}, batch)
     
     def _get_parent_bg(self, parent):
         """Get parent background with fallback"""
@@ -64,27 +72,6 @@ class BTkButton(tk.Canvas):
         except (AttributeError, tk.TclError):
             return "#FFFFFF"
     
-    def _render(self):
-        """Optimized rendering with caching"""
-        if self._rendered and self.find_all():
-            # Update existing elements for performance
-            self._update_colors()
-            return
-        
-        # Full render
-        self.delete("all")
-        
-        # Get current state color
-        current_color = self._get_current_color()
-        
-        # Draw button shape
-        self._draw_button_shape(current_color)
-        
-        # Draw text
-        self._draw_text()
-        
-        self._rendered = True
-    
     def _get_current_color(self):
         """Get color for current state"""
         if self._state == "pressed":
@@ -94,31 +81,30 @@ class BTkButton(tk.Canvas):
         else:
             return self.bg_color
     
-    def _draw_button_shape(self, color):
-        """Draw optimized button shape"""
-        if self.rounded_radius <= 0:
-            # Simple rectangle for performance
-            self.create_rectangle(0, 0, self.width, self.height, 
-                                fill=color, outline=color, tags="button_bg")
-        else:
-            # Optimized rounded rectangle
-            self._draw_rounded_rect(color)
-    
-    def _draw_rounded_rect(self, color):
-        """Draw optimized rounded rectangle"""
-        # Limit radius
-        max_radius = min(self.width, self.height) // 2
-        radius = min(self.rounded_radius, max_radius)
+    def describe_items(self):
+        """Describe the button shape and text for the current state"""
+        color = self._get_current_color()
         
+        # Limit radius; very small radii use a simple rectangle for performance
+        radius = min(self.rounded_radius, min(self.width, self.height) // 2)
         if radius <= 2:
-            # Use simple rectangle for very small radius
-            self.create_rectangle(0, 0, self.width, self.height,
-                                fill=color, outline=color, tags="button_bg")
-            return
+            shape = ("rectangle", (0, 0, self.width, self.height),
+                     {"fill": color, "outline": color, "tags": "button_bg"})
+        else:
+            shape = ("polygon", self._calculate_rounded_points(radius),
+                     {"fill": color, "outline": color, "smooth": True, "tags": "button_bg"})
+    
+        # Calculate font size based on button size
+        base_font_size = min(self.width // 10, self.height // 3)
+        font_size = max(8, min(12, base_font_size))
         
-        # Create smooth rounded shape with fewer points for performance
-        points = self._calculate_rounded_points(radius)
-        self.create_polygon(points, fill=color, outline=color, smooth=True, tags="button_bg")
+        return {
+            "button_bg": shape,
+            "button_text": ("text", (self.width/2, self.height/2),
+                            {"text": self.text, "fill": self.fg_color,
+                             "font": (self.DEFAULT_FONT, font_size, "normal"),
+                             "tags": "button_text"}),
+        }
     
     def _calculate_rounded_points(self, radius):
         """Calculate points for rounded rectangle efficiently"""
@@ -158,27 +144,6 @@ class BTkButton(tk.Canvas):
         
         return points
     
-    def _draw_text(self):
-        """Draw button text with optimal font"""
-        # Calculate font size based on button size
-        base_font_size = min(self.width // 10, self.height // 3)
-        font_size = max(8, min(12, base_font_size))
-        
-        self.create_text(self.width/2, self.height/2, 
-                        text=self.text, 
-                        fill=self.fg_color,
-                        font=(self.DEFAULT_FONT, font_size, "normal"),
-                        tags="button_text")
-    
-    def _update_colors(self):
-        """Update colors for existing elements (performance optimization)"""
-        current_color = self._get_current_color()
-        
-        # Update background color
-        bg_items = self.find_withtag("button_bg")
-        for item in bg_items:
-            self.itemconfig(item, fill=current_color, outline=current_color)
-    
     def _bind_events(self):
         """Bind optimized mouse events"""
         self.bind("<Enter>", self._on_enter, add='+')
@@ -191,19 +156,19 @@ class BTkButton(tk.Canvas):
         """Handle mouse enter with optimized rendering"""
         if self._state != "hovered":
             self._state = "hovered"
-            self._update_colors()
+            self.invalidate()
     
     def _on_leave(self, event=None):
         """Handle mouse leave with optimized rendering"""
         if self._state != "normal":
             self._state = "normal"
-            self._update_colors()
+            self.invalidate()
     
     def _on_press(self, event=None):
         """Handle mouse press with optimized rendering"""
         if self._state != "pressed":
             self._state = "pressed"
-            self._update_colors()
+            self.invalidate()
     
     def _on_release(self, event=None):
         """Handle mouse release"""
@@ -211,7 +176,7 @@ class BTkButton(tk.Canvas):
             self._state = "hovered"
         else:
             self._state = "normal"
-        self._update_colors()
+        self.invalidate()
     
     def _on_click(self, event=None):
         """Handle button click"""
@@ -226,12 +191,11 @@ class BTkButton(tk.Canvas):
         if 'text' in kwargs:
             self.text = kwargs['text']
         if 'bg_color' in kwargs:
-            self.bg_color = kwargs['bg_color']
+            self.bg_color = self._color_overrides['bg_color'] = kwargs['bg_color']
         if 'command' in kwargs:
             self.command = kwargs['command']
         
-        self._rendered = False  # Force re-render
-        self._render()
+        self.invalidate()
 
 # Performance test
 if __name__ == "__main__":
@@ -0,0 +1,259 @@
+import tkinter as tk
+from .BTkTclBatch import BTkTclBatch
+
+class BTkRenderQueue:
+    """Invalidated canvas widgets of one Tk root, redrawn together when idle
+    
+    Widgets call invalidate() on state changes instead of redrawing, so any
+    number of changes to a widget before the next idle callback cost one
+    redraw. hold() and release() suspend the queue around bulk updates (see
+    BTk.batch()); the outermost release() flushes it. Use
+    BTkRenderQueue.of(widget) to get the queue of a widget's root.
+    """
+    
+    def __init__(self, root):
+        self.root = root
+        self.dirty = {}    # widget name -> widget, in invalidation order
+        self.held = 0
+        self.renders = 0   # Redraws run by the queue, for profiling
+        self._job = None
+    
+    @classmethod
+    def of(cls, widget):
+        """Get the render queue of a widget's root, creating it on first use"""
+        root = widget._root()
+        render_queue = getattr(root, "render_queue", None)
+        if not isinstance(render_queue, BTkRenderQueue):
+            render_queue = cls(root)
+            root.render_queue = render_queue
+        return render_queue
+    
+    def add(self, widget):
+        """Mark a widget for redrawing at the next flush"""
+        self.dirty[str(widget)] = widget
+        if self._job is None and not self.held:
+            self._job = self.root.after_idle(self._run)
+    
+    def hold(self):
+        """Suspend flushing until the matching release()"""
+        self.held += 1
+    
+    def release(self):
+        """End a hold(), flushing once the outermost one ends"""
+        self.held -= 1
+        if not self.held:
+            self.flush()
+    
+    def _run(self):
+        self._job = None
+        self.flush()
+    
+    def flush(self):
+        """Redraw every invalidated widget once"""
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+        while self.dirty:
+            dirty = self.dirty
+            self.dirty = {}
+            for widget in dirty.values():
+                try:
+                    widget.redraw()
+                except tk.TclError:
+                    # Widget destroyed
+                    continue
+                self.renders += 1
+
+class BTkCanvasWidget(tk.Canvas):
+    """Base class for canvas widgets drawn from a description of their items
+    
+    Subclasses implement describe_items(), returning the items of the current
+    state as {name: (type, coords, options)} in stacking order, bottom first;
+    type is a canvas item type such as "rectangle" or "text". redraw() creates
+    each item once and afterwards only issues coords() and itemconfigure()
+    for the values that changed since the last redraw. Items left out of the
+    description are deleted; an item whose type or option names change is
+    recreated in place. Hide items with state="hidden" rather than leaving
+    them out when they come and go often. A canvas that is not a subclass can
+    pass its describe function instead. State changes should call
+    invalidate(), which defers the redraw to the root's BTkRenderQueue.
+    Widgets with many items set BATCH_TCL to send each redraw's commands in
+    one Tcl call (see BTkTclBatch).
+    """
+    
+    # Constants
+    BATCH_TCL = False    # Send the commands of a redraw in one Tcl call
+    
+    def __init__(self, parent, describe=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self._describe = describe or self.describe_items
+        self._items = {}       # name -> [item id, type, coords, options]
+        self.item_calls = 0    # Canvas item commands sent to Tcl, for profiling
+        self._render_queue = None
+    
+    def describe_items(self):
+        """Get {name: (type, coords, options)} for the current state"""
+        raise NotImplementedError
+    
+    def item(self, name):
+        """Get the canvas item id of a described item, or None"""
+        entry = self._items.get(name)
+        return entry[0] if entry else None
+    
+    def create_item(self, kind, *coords, **options):
+        """Create a canvas item of a type such as "rectangle" or "text" """
+        return getattr(self, "create_" + kind)(*coords, **options)
+    
+    def invalidate(self):
+        """Redraw at the next idle time, once however often this is called"""
+        if self._render_queue is None:
+            self._render_queue = BTkRenderQueue.of(self)
+        self._render_queue.add(self)
+    
+    def redraw(self):
+        """Bring the canvas items in line with describe_items() now"""
+        items = self._items
+        described = self._describe()
+        batch = BTkTclBatch(self) if self.BATCH_TCL else None
+        canvas = self if batch is None else batch
+        created = []
+        
+        # Delete items no longer described
+        for name in [name for name in items if name not in described]:
+            canvas.delete(items.pop(name)[0])
+            self.item_calls += 1
+        
+        # Items created before the last existing one must be restacked
+        last_existing = -1
+        for index, name in enumerate(described):
+            if name in items:
+                last_existing = index
+        
+        below = None
+        for index, (name, (kind, coords, options)) in enumerate(described.items()):
+            coords = tuple(coords)
+            entry = items.get(name)
+            if entry is not None and (entry[1] != kind or entry[3].keys() != options.keys()):
+                canvas.delete(entry[0])
+                self.item_calls += 1
+                entry = None
+            
+            if entry is None:
+                item = canvas.create_item(kind, *coords, **options)
+                self.item_calls += 1
+                if index < last_existing:
+                    if below is None:
+                        canvas.tag_lower(item)
+                    else:
+                        canvas.tag_raise(item, below)
+                    self.item_calls += 1
+                items[name] = [item, kind, coords, dict(options)]
+                created.append(items[name])
+                below = item
+                continue
+            
+            item, _, old_coords, old_options = entry
+            if coords != old_coords:
+                canvas.coords(item, *coords)
+                self.item_calls += 1
+                entry[2] = coords
+            changed = {key: value for key, value in options.items() if old_options[key] != value}
+            if changed:
+                canvas.itemconfigure(item, **changed)
+                self.item_calls += 1
+                old_options.update(changed)
+            below = item
+        
+        # Swap batch placeholders for the created item ids
+        if batch is not None and len(batch):
+            batch.run()
+            for entry in created:
+                entry[0] = entry[0].id
+    
+    def recolor(self, colors, batch=None):
+        """Change options of drawn items in place, without a redraw
+        
+        colors is {name: {option: value}}; items not drawn yet and options an
+        item does not have are skipped, and only changed values are sent. With
+        a BTkTclBatch the itemconfigure commands are recorded into it instead.
+        The values are kept, so a later redraw() of the same state sends nothing.
+        """
+        items = self._items
+        commands = []
+        for name, options in colors.items():
+            entry = items.get(name)
+            if entry is None:
+                continue
+            old_options = entry[3]
+            words = []
+            for key, value in options.items():
+                if key in old_options and old_options[key] != value:
+                    old_options[key] = value
+                    words += ("-" + key, value)
+            if words:
+                commands.append((self._w, "itemconfigure", entry[0], *words))
+        
+        self.item_calls += len(commands)
+        if batch is not None:
+            batch.extend(commands)
+        else:
+            for command in commands:
+                self.tk.call(command)
+    
+    def refresh_options(self, batch=None):
+        """Send the options of describe_items() that changed, as recolor() does
+        
+        For new colors whose use depends on the widget's state; coordinates
+        and items that come or go are left to the next redraw().
+        """
+        self.recolor({name: options for name, (_, _, options) in self._describe().items()}, batch)
+    
+    def clear_items(self):
+        """Delete every described item, so the next redraw() creates them anew"""
+        for entry in self._items.values():
+            self.delete(entry[0])
+        self._items.clear()
+
+# Performance test
+if __name__ == "__main__":
+    def performance_test():
+        """Count redraws and item commands for hovering and bulk updates of 300 buttons"""
+        from .BTk import BTk
+        from .BTkButton import BTkButton
+        
+        app = BTk("BTkCanvasWidget Test", width=1300, height=700)
+        
+        buttons = []
+        for i in range(300):
+            button = BTkButton(app, text=f"Btn{i}", width=80, height=30)
+            button.grid(row=i // 15, column=i % 15, padx=2, pady=2)
+            buttons.append(button)
+        app.update()
+        
+        def item_calls():
+            return sum(button.item_calls for button in buttons)
+        
+        # Hover: enter and leave before the next idle time cancel out
+        before = item_calls()
+        for button in buttons:
+            button._on_enter()
+            app.update_idletasks()
+            button._on_leave()
+            app.update_idletasks()
+        calls = item_calls() - before
+        print(f"{len(buttons) * 2} hover changes, {calls} item commands "
+              f"({calls / (len(buttons) * 2):.1f} per change)")
+        
+        # Bulk update: three changes per button, one redraw each
+        renders, before = app.render_queue.renders, item_calls()
+        with app.batch():
+            for i, button in enumerate(buttons):
+                button.configure(text=f"Item{i}")
+                button.configure(bg_color="#28A745")
+                button._on_enter()
+        print(f"{len(buttons) * 3} changes in a batch: {app.render_queue.renders - renders} redraws, "
+              f"{item_calls() - before} item commands")
+        
+        app.mainloop()
+    
+    performance_test()
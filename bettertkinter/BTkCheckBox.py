@@ -1,12 +1,15 @@
 import tkinter as tk
 import math
+from .BTkCanvasWidget import BTkCanvasWidget
+from .BTkTheme import get_theme, subscribe, set_background, parent_background
 
-class BTkCheckBox(tk.Canvas):
+class BTkCheckBox(BTkCanvasWidget):
     """Modern BetterTkinter checkbox component"""
     
     # Constants
     DEFAULT_FONT = "Segoe UI"
     DEFAULT_SIZE = 20
+    COLOR_OPTIONS = ('bg_color', 'check_color', 'border_color', 'text_color', 'hover_color')
     
     def __init__(self, parent, text="Checkbox", **kwargs):
         # Configuration
@@ -19,12 +22,9 @@ class BTkCheckBox(tk.Canvas):
         text_width = len(self.text) * 8 + 10
         total_width = self.size + text_width
         
-        # Colors
-        self.bg_color = kwargs.get('bg_color', "#FFFFFF")
-        self.check_color = kwargs.get('check_color', "#007BFF")
-        self.border_color = kwargs.get('border_color', "#CED4DA")
-        self.text_color = kwargs.get('text_color', "#333333")
-        self.hover_color = kwargs.get('hover_color', "#E3F2FD")
+        # Colors from the current theme, keeping given colors
+        self._color_overrides = {key: kwargs[key] for key in self.COLOR_OPTIONS if key in kwargs}
+        self._apply_palette(get_theme().widget_palette("checkbox"))
         
         # Initialize canvas
         super().__init__(parent,
@@ -44,8 +44,22 @@ class BTkCheckBox(tk.Canvas):
             self.variable.trace_add('write', self._on_variable_change)
         
         # Render and bind events
-        self._render()
+        self.redraw()
         self._bind_events()
+        
+        # Follow theme changes
+        subscribe(self)
+    
+    def _apply_palette(self, palette):
+        """Take colors from a theme palette except the overridden ones"""
+        for key, value in palette.items():
+            setattr(self, key, self._color_overrides.get(key, value))
+    
+    def apply_theme(self, theme, batch=None):
+        """Recolor for a new theme in place, without a redraw"""
+        self._apply_palette(theme.widget_palette("checkbox"))
+        set_background(self, parent_background(self), batch)
+        self.refresh_options(batch)
     
     def _get_parent_bg(self, parent):
         """Get parent background color"""
@@ -54,51 +68,33 @@ class BTkCheckBox(tk.Canvas):
         except (AttributeError, tk.TclError):
             return "#FFFFFF"
     
-    def _render(self):
-        """Render checkbox"""
-        self.delete("all")
-        
-        # Checkbox background
-        bg_color = self.hover_color if self._hovered else self.bg_color
-        
-        # Draw checkbox square with rounded corners
-        self._draw_rounded_rect(2, 2, self.size, self.size, 4, bg_color, self.border_color)
-        
-        # Draw checkmark if checked
+    def describe_items(self):
+        """Describe the checkbox square, checkmark and text for the current state"""
+        # Checkbox colors
         if self._checked:
-            self._draw_checkmark()
-        
-        # Draw text
-        self.create_text(self.size + 8, self.size // 2 + 2,
-                        text=self.text,
-                        fill=self.text_color,
-                        font=(self.DEFAULT_FONT, 10, "normal"),
-                        anchor="w",
-                        tags="text")
-    
-    def _draw_rounded_rect(self, x, y, width, height, radius, fill_color, border_color):
-        """Draw rounded rectangle"""
-        if self._checked:
-            fill_color = self.check_color
-            border_color = self.check_color
-        
-        # Simple rounded rectangle using create_rectangle with small radius simulation
-        self.create_rectangle(x, y, width, height,
-                            fill=fill_color,
-                            outline=border_color,
-                            width=2)
-    
-    def _draw_checkmark(self):
-        """Draw checkmark inside checkbox"""
-        # Calculate checkmark points
+            fill_color = border_color = self.check_color
+        else:
+            fill_color = self.hover_color if self._hovered else self.bg_color
+            border_color = self.border_color
+        
+        # Checkmark points
         margin = 6
         x1, y1 = margin, self.size // 2
         x2, y2 = self.size // 2 - 2, self.size - margin
         x3, y3 = self.size - margin + 2, margin
-        
-        # Draw checkmark lines
-        self.create_line(x1, y1, x2, y2, fill="white", width=2, capstyle="round")
-        self.create_line(x2, y2, x3, y3, fill="white", width=2, capstyle="round")
+        check_state = "normal" if self._checked else "hidden"
+        
+        return {
+            "box": ("rectangle", (2, 2, self.size, self.size),
+                    {"fill": fill_color, "outline": border_color, "width": 2}),
+            "check_down": ("line", (x1, y1, x2, y2),
+                           {"fill": "white", "width": 2, "capstyle": "round", "state": check_state}),
+            "check_up": ("line", (x2, y2, x3, y3),
+                         {"fill": "white", "width": 2, "capstyle": "round", "state": check_state}),
+            "text": ("text", (self.size + 8, self.size // 2 + 2),
+                     {"text": self.text, "fill": self.text_color,
+                      "font": (self.DEFAULT_FONT, 10, "normal"), "anchor": "w", "tags": "text"}),
+        }
     
     def _bind_events(self):
         """Bind mouse events"""
@@ -118,12 +114,12 @@ class BTkCheckBox(tk.Canvas):
     def _on_enter(self, event=None):
         """Handle mouse enter"""
         self._hovered = True
-        self._render()
+        self.invalidate()
     
     def _on_leave(self, event=None):
         """Handle mouse leave"""
         self._hovered = False
-        self._render()
+        self.invalidate()
     
     def _on_variable_change(self, *args):
         """Handle variable change"""
@@ -131,14 +127,14 @@ class BTkCheckBox(tk.Canvas):
             new_value = bool(self.variable.get())
             if new_value != self._checked:
                 self._checked = new_value
-                self._render()
+                self.invalidate()
     
     def toggle(self):
         """Toggle checkbox state"""
         self._checked = not self._checked
         if self.variable:
             self.variable.set(self._checked)
-        self._render()
+        self.invalidate()
     
     def get(self):
         """Get checkbox state"""
@@ -149,7 +145,7 @@ class BTkCheckBox(tk.Canvas):
         self._checked = bool(value)
         if self.variable:
             self.variable.set(self._checked)
-        self._render()
+        self.invalidate()
 
 # Test function
 if __name__ == "__main__":
@@ -1,14 +1,16 @@
 import tkinter as tk
 from tkinter import messagebox
 import math
+from .BTkCanvasWidget import BTkCanvasWidget
 
-class BTkColorPicker(tk.Canvas):
+class BTkColorPicker(BTkCanvasWidget):
     """Modern BetterTkinter color picker component"""
     
     # Constants
     DEFAULT_FONT = "Segoe UI"
     DEFAULT_WIDTH = 250
     DEFAULT_HEIGHT = 200
+    BATCH_TCL = True    # Gradients are thousands of items
     
     def __init__(self, parent, **kwargs):
         # Configuration
@@ -36,11 +38,15 @@ class BTkColorPicker(tk.Canvas):
         self.color_area_width = self.width - self.hue_bar_width - 20
         self.color_area_height = self.height - 50
         
+        # Cached gradient descriptions
+        self._area_items = None
+        self._hue_items = None
+        
         # Convert initial color to HSV
         self._rgb_to_hsv(*self._hex_to_rgb(self._selected_color))
         
         # Render and bind events
-        self._render()
+        self.redraw()
         self._bind_events()
     
     def _hex_to_rgb(self, hex_color):
@@ -101,121 +107,90 @@ class BTkColorPicker(tk.Canvas):
         self._saturation = s
         self._value = v
     
-    def _render(self):
-        """Render color picker"""
-        self.delete("all")
-        
-        # Draw color area (saturation/value)
-        self._draw_color_area()
-        
-        # Draw hue bar
-        self._draw_hue_bar()
-        
-        # Draw selected color preview
-        self._draw_color_preview()
-        
-        # Draw selector indicators
-        self._draw_selectors()
-    
-    def _draw_color_area(self):
-        """Draw the main color selection area"""
+    def describe_items(self):
+        """Describe the color area, hue bar, preview and selectors for the current state"""
+        # Gradients only change with the hue, so their descriptions are cached
+        if self._area_items is None or self._area_items[0] != self._hue:
+            self._area_items = (self._hue, self._describe_color_area())
+        if self._hue_items is None:
+            self._hue_items = self._describe_hue_bar()
+        
+        items = dict(self._area_items[1])
+        items.update(self._hue_items)
+        items.update(self._describe_color_preview())
+        items.update(self._describe_selectors())
+        return items
+        
+    def _describe_color_area(self):
+        """Describe the main color selection area"""
         area_x = 10
         area_y = 10
+        items = {}
         
-        # Create gradient from white to pure hue to black
-        for x in range(self.color_area_width):
-            for y in range(self.color_area_height):
+        # Gradient from white to pure hue to black, every 4th pixel for performance
+        for x in range(0, self.color_area_width, 4):
+            for y in range(0, self.color_area_height, 4):
                 sat = x / self.color_area_width
                 val = 1 - (y / self.color_area_height)
                 
                 r, g, b = self._hsv_to_rgb(self._hue, sat, val)
                 color = self._rgb_to_hex(r, g, b)
+                items[f"area_{x}_{y}"] = ("rectangle", (area_x + x, area_y + y, area_x + x + 4, area_y + y + 4),
+                                          {"fill": color, "outline": color})
+        return items
                 
-                # Only draw every 4th pixel for performance
-                if x % 4 == 0 and y % 4 == 0:
-                    self.create_rectangle(
-                        area_x + x, area_y + y,
-                        area_x + x + 4, area_y + y + 4,
-                        fill=color, outline=color
-                    )
-    
-    def _draw_hue_bar(self):
-        """Draw hue selection bar"""
+    def _describe_hue_bar(self):
+        """Describe the hue selection bar"""
         bar_x = self.width - self.hue_bar_width - 5
         bar_y = 10
         bar_height = self.color_area_height
+        items = {}
         
-        # Draw hue gradient
-        for y in range(bar_height):
+        # Hue gradient, every 2nd pixel for performance
+        for y in range(0, bar_height, 2):
             hue = (y / bar_height) * 360
             r, g, b = self._hsv_to_rgb(hue, 1.0, 1.0)
             color = self._rgb_to_hex(r, g, b)
+            items[f"hue_{y}"] = ("rectangle", (bar_x, bar_y + y, bar_x + self.hue_bar_width, bar_y + y + 2),
+                                 {"fill": color, "outline": color})
+        return items
             
-            if y % 2 == 0:  # Performance optimization
-                self.create_rectangle(
-                    bar_x, bar_y + y,
-                    bar_x + self.hue_bar_width, bar_y + y + 2,
-                    fill=color, outline=color
-                )
-    
-    def _draw_color_preview(self):
-        """Draw selected color preview"""
+    def _describe_color_preview(self):
+        """Describe the selected color preview"""
         preview_x = 10
         preview_y = self.height - 30
         preview_width = 80
         preview_height = 20
         
-        # Draw preview rectangle
-        self.create_rectangle(
-            preview_x, preview_y,
-            preview_x + preview_width, preview_y + preview_height,
-            fill=self._selected_color,
-            outline="#CCCCCC",
-            width=1
-        )
-        
-        # Draw color text
-        self.create_text(
-            preview_x + preview_width + 10, preview_y + preview_height // 2,
-            text=self._selected_color,
-            fill="#333333",
-            font=(self.DEFAULT_FONT, 9, "normal"),
-            anchor="w"
-        )
-    
-    def _draw_selectors(self):
-        """Draw selection indicators"""
-        # Color area selector
+        return {
+            "preview": ("rectangle", (preview_x, preview_y,
+                                      preview_x + preview_width, preview_y + preview_height),
+                        {"fill": self._selected_color, "outline": "#CCCCCC", "width": 1}),
+            "preview_text": ("text", (preview_x + preview_width + 10, preview_y + preview_height // 2),
+                             {"text": self._selected_color, "fill": "#333333",
+                              "font": (self.DEFAULT_FONT, 9, "normal"), "anchor": "w"}),
+        }
+        
+    def _describe_selectors(self):
+        """Describe the selection indicators"""
+        # Color area crosshair
         area_x = 10 + (self._saturation * self.color_area_width)
         area_y = 10 + ((1 - self._value) * self.color_area_height)
         
-        # Draw crosshair
-        self.create_oval(
-            area_x - 4, area_y - 4,
-            area_x + 4, area_y + 4,
-            outline="white", width=2, fill=""
-        )
-        self.create_oval(
-            area_x - 3, area_y - 3,
-            area_x + 3, area_y + 3,
-            outline="black", width=1, fill=""
-        )
-        
-        # Hue bar selector
+        # Hue bar indicator
         hue_x = self.width - self.hue_bar_width - 5
         hue_y = 10 + (self._hue / 360) * self.color_area_height
         
-        # Draw hue indicator
-        self.create_rectangle(
-            hue_x - 2, hue_y - 2,
-            hue_x + self.hue_bar_width + 2, hue_y + 2,
-            outline="white", width=2, fill=""
-        )
-        self.create_rectangle(
-            hue_x - 1, hue_y - 1,
-            hue_x + self.hue_bar_width + 1, hue_y + 1,
-            outline="black", width=1, fill=""
-        )
+        return {
+            "area_ring_outer": ("oval", (area_x - 4, area_y - 4, area_x + 4, area_y + 4),
+                                {"outline": "white", "width": 2, "fill": ""}),
+            "area_ring_inner": ("oval", (area_x - 3, area_y - 3, area_x + 3, area_y + 3),
+                                {"outline": "black", "width": 1, "fill": ""}),
+            "hue_marker_outer": ("rectangle", (hue_x - 2, hue_y - 2, hue_x + self.hue_bar_width + 2, hue_y + 2),
+                                 {"outline": "white", "width": 2, "fill": ""}),
+            "hue_marker_inner": ("rectangle", (hue_x - 1, hue_y - 1, hue_x + self.hue_bar_width + 1, hue_y + 1),
+                                 {"outline": "black", "width": 1, "fill": ""}),
+        }
     
     def _bind_events(self):
         """Bind mouse events"""
@@ -248,7 +223,7 @@ class BTkColorPicker(tk.Canvas):
         r, g, b = self._hsv_to_rgb(self._hue, self._saturation, self._value)
         self._selected_color = self._rgb_to_hex(r, g, b)
         
-        self._render()
+        self.invalidate()
         
         if self.command:
             try:
@@ -264,7 +239,7 @@ class BTkColorPicker(tk.Canvas):
         """Set selected color"""
         self._selected_color = color
         self._rgb_to_hsv(*self._hex_to_rgb(color))
-        self._render()
+        self.invalidate()
 
 # Test function
 if __name__ == "__main__":
@@ -0,0 +1,170 @@
+import re
+import heapq
+import bisect
+from .BTkTextChange import BTkLineRanges
+
+class BTkCompletionIndex:
+    """Word index of a buffer for identifier completion
+    
+    Words are counted per buffer and kept in a sorted array of
+    (lowercase, word) pairs, so prefix lookups are a bisect. The words of
+    every line are remembered, which lets an edit drop exactly the words it
+    removed; edited lines are queued in a BTkLineRanges and rescanned later
+    (index_lines), following the editor's dirty-range tracking. Applications
+    add extra word sources (keywords, API names) with their own weights.
+    """
+    
+    WORD_PATTERN = re.compile(r"[^\W\d]\w+")
+    
+    def __init__(self, min_length=3):
+        self.min_length = min_length
+        self.counts = {}
+        self.dirty = BTkLineRanges()
+        self.sources = {}
+        self._keys = []
+        self._line_words = []
+    
+    # Buffer words
+    def reset(self, line_count):
+        """Forget all buffer words and queue every line for indexing"""
+        self.counts = {}
+        self._keys = []
+        self._line_words = [()] * line_count
+        self.dirty.clear()
+        self.dirty.add(1, line_count)
+    
+    def apply_change(self, change, line_count):
+        """Drop the words of edited lines and queue the lines for rescanning"""
+        words = self._line_words
+        if change.is_full or len(words) + change.line_delta != line_count:
+            self.reset(line_count)
+            return
+        
+        first = change.start_line
+        for line_words in words[first - 1:first + change.removed_lines]:
+            self._remove_words(line_words)
+        words[first - 1:first + change.removed_lines] = [()] * (change.added_lines + 1)
+        self.dirty.shift(change)
+        self.dirty.add(first, first + change.added_lines)
+    
+    def index_lines(self, first, lines):
+        """Scan lines starting at line first and record their words"""
+        findall = self.WORD_PATTERN.findall
+        min_length = self.min_length
+        line_words = self._line_words
+        for offset, line in enumerate(lines):
+            index = first - 1 + offset
+            self._remove_words(line_words[index])
+            words = tuple(word for word in findall(line) if len(word) >= min_length)
+            self._add_words(words)
+            line_words[index] = words
+        self.dirty.remove(first, first + len(lines) - 1)
+    
+    def _add_words(self, words):
+        counts = self.counts
+        for word in words:
+            count = counts.get(word)
+            if count:
+                counts[word] = count + 1
+            else:
+                counts[word] = 1
+                bisect.insort(self._keys, (word.lower(), word))
+    
+    def _remove_words(self, words):
+        counts = self.counts
+        for word in words:
+            count = counts[word] - 1
+            if count:
+                counts[word] = count
+            else:
+                del counts[word]
+                keys = self._keys
+                del keys[bisect.bisect_left(keys, (word.lower(), word))]
+    
+    # Extra sources
+    def add_source(self, name, words, weight=1.0):
+        """Add words from the application (iterable, or dict of word -> weight)"""
+        if not isinstance(words, dict):
+            words = dict.fromkeys(words, weight)
+        keys = sorted((word.lower(), word) for word in words)
+        self.sources[name] = (keys, words)
+    
+    def remove_source(self, name):
+        """Remove an extra word source"""
+        self.sources.pop(name, None)
+    
+    # Queries
+    def complete(self, prefix, limit=12):
+        """Get up to limit words for a prefix, best first
+        
+        Prefix matches (case-insensitive, exact case first) rank above fuzzy
+        matches, which contain the prefix's characters in order and start
+        with its first character. Within each group, words are ranked by
+        buffer frequency plus source weights, then by length.
+        """
+        if not prefix:
+            return []
+        lower = prefix.lower()
+        counts = self.counts
+        
+        # Buffer words first, then add source weights to the same scores
+        scores = {word: counts[word] for _, word in self._prefix_range(self._keys, lower)}
+        for keys, weights in self.sources.values():
+            for _, word in self._prefix_range(keys, lower):
+                scores[word] = scores.get(word, 0) + weights[word]
+        scores.pop(prefix, None)
+        
+        exact = [word for word in scores if word.startswith(prefix)]
+        ranked = heapq.nsmallest(limit, exact, key=lambda word: (-scores[word], len(word), word))
+        if len(ranked) < limit and len(exact) < len(scores):
+            others = [word for word in scores if not word.startswith(prefix)]
+            ranked += heapq.nsmallest(limit - len(ranked), others,
+                                      key=lambda word: (-scores[word], len(word), word))
+        
+        if len(ranked) < limit and len(prefix) > 1:
+            ranked += self._fuzzy(prefix, lower, scores, limit - len(ranked))
+        return ranked
+    
+    @staticmethod
+    def _prefix_range(keys, lower):
+        """Get the (lowercase, word) keys starting with a lowercase prefix"""
+        start = bisect.bisect_left(keys, (lower,))
+        return keys[start:bisect.bisect_left(keys, (lower + "\uffff",), start)]
+    
+    def _fuzzy(self, prefix, lower, exclude, limit):
+        """Get words containing the prefix's characters in order, tightest first"""
+        fuzzy = re.compile(".*?".join(map(re.escape, lower)), re.IGNORECASE)
+        counts = self.counts
+        matches = {}
+        for keys, weights in [(self._keys, None)] + list(self.sources.values()):
+            for _, word in self._prefix_range(keys, lower[0]):
+                if word in exclude:
+                    continue
+                match = fuzzy.match(word)
+                if match is not None:
+                    score = -(counts.get(word, 0) if weights is None else weights[word])
+                    previous = matches.get(word)
+                    if previous is not None:
+                        score += previous[1]
+                    matches[word] = (match.end(), score, len(word), word)
+        return [key[-1] for key in heapq.nsmallest(limit, matches.values())]
+
+# Benchmark
+if __name__ == "__main__":
+    import time
+    
+    lines = [f"    result_{i % 5000} = compute_value(item_{i % 997}, offset={i}) + helper_{i % 13}()"
+             for i in range(100000)]
+    index = BTkCompletionIndex()
+    index.reset(len(lines))
+    
+    start = time.perf_counter()
+    index.index_lines(1, lines)
+    print(f"indexed {len(lines)} lines ({len(index.counts)} words) "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+    
+    index.add_source("keywords", ["return", "raise", "range"], weight=5)
+    for prefix in ("re", "res", "result_4", "cmpv", "hlp"):
+        start = time.perf_counter()
+        words = index.complete(prefix)
+        print(f"{prefix!r}: {(time.perf_counter() - start) * 1000:.2f} ms {words[:4]}")
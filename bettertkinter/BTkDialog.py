@@ -1,6 +1,14 @@
 import tkinter as tk
 from tkinter import messagebox
 import math
+from .BTkTheme import get_theme
+
+# Optional screen grabbing for the overlay backdrop
+try:
+    from PIL import Image, ImageGrab, ImageTk
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
 
 class BTkDialog:
     """Modern BetterTkinter dialog component"""
@@ -118,14 +126,8 @@ class BTkDialog:
         if not hasattr(self, 'button_frame') or not self.buttons:
             return
             
-        # Button colors by style
-        styles = {
-            "default": {"bg": "#E9ECEF", "fg": "#333333", "active_bg": "#DEE2E6"},
-            "primary": {"bg": "#007BFF", "fg": "#FFFFFF", "active_bg": "#0056B3"},
-            "success": {"bg": "#28A745", "fg": "#FFFFFF", "active_bg": "#1E7E34"},
-            "warning": {"bg": "#FFC107", "fg": "#212529", "active_bg": "#E0A800"},
-            "danger": {"bg": "#DC3545", "fg": "#FFFFFF", "active_bg": "#C82333"}
-        }
+        # Button colors by style, from the current theme
+        theme = get_theme()
         
         for i, button_config in enumerate(self.buttons):
             text = button_config['text']
@@ -133,7 +135,7 @@ class BTkDialog:
             style = button_config['style']
             kwargs = button_config['kwargs']
             
-            style_config = styles.get(style, styles["default"])
+            style_config = theme.dialog_button_palette(style)
             
             def button_command(result=text, cmd=command):
                 self.result = result
@@ -175,52 +177,196 @@ class BTkDialog:
         
         return self.result
 
-    @staticmethod
-    def show_info(title="Information", message="", parent=None):
+    @classmethod
+    def show_info(cls, title="Information", message="", parent=None):
         """Show information dialog"""
-        dialog = BTkDialog(parent, title, message,
-                          bg_color="#E8F4FD",
-                          title_bg="#D1ECFF")
+        dialog = cls(parent, title, message,
+                     bg_color="#E8F4FD",
+                     title_bg="#D1ECFF")
         dialog.add_button("OK", style="primary")
         return dialog.show()
     
-    @staticmethod
-    def show_warning(title="Warning", message="", parent=None):
+    @classmethod
+    def show_warning(cls, title="Warning", message="", parent=None):
         """Show warning dialog"""
-        dialog = BTkDialog(parent, title, message,
-                          bg_color="#FFF3CD",
-                          title_bg="#FFEAA7")
+        dialog = cls(parent, title, message,
+                     bg_color="#FFF3CD",
+                     title_bg="#FFEAA7")
         dialog.add_button("OK", style="warning")
         return dialog.show()
     
-    @staticmethod
-    def show_error(title="Error", message="", parent=None):
+    @classmethod
+    def show_error(cls, title="Error", message="", parent=None):
         """Show error dialog"""
-        dialog = BTkDialog(parent, title, message,
-                          bg_color="#F8D7DA",
-                          title_bg="#F5C6CB")
+        dialog = cls(parent, title, message,
+                     bg_color="#F8D7DA",
+                     title_bg="#F5C6CB")
         dialog.add_button("OK", style="danger")
         return dialog.show()
     
-    @staticmethod
-    def show_success(title="Success", message="", parent=None):
+    @classmethod
+    def show_success(cls, title="Success", message="", parent=None):
         """Show success dialog"""
-        dialog = BTkDialog(parent, title, message,
-                          bg_color="#D4F8E8", 
-                          title_bg="#C3F7DB")
+        dialog = cls(parent, title, message,
+                     bg_color="#D4F8E8", 
+                     title_bg="#C3F7DB")
         dialog.add_button("OK", style="success")
         return dialog.show()
     
-    @staticmethod
-    def ask_yes_no(title="Question", message="", parent=None):
+    @classmethod
+    def ask_yes_no(cls, title="Question", message="", parent=None):
         """Show yes/no question dialog"""
-        dialog = BTkDialog(parent, title, message,
-                          bg_color="#FFF8DC",
-                          title_bg="#FFE4B5")
+        dialog = cls(parent, title, message,
+                     bg_color="#FFF8DC",
+                     title_bg="#FFE4B5")
         dialog.add_button("Yes", style="success")
         dialog.add_button("No", style="secondary")
         return dialog.show()
 
+class BTkOverlayDialog(BTkDialog):
+    """In-window BetterTkinter dialog drawn on a canvas layer over the host window
+
+    Same API as BTkDialog, but no Toplevel is created: a canvas placed over
+    the host window holds a dimmed backdrop and the dialog card, and input
+    is grabbed locally by that canvas. Tk has no per-widget alpha, so the
+    backdrop is a snapshot of the host darkened by backdrop_alpha where
+    Pillow can grab the screen, and otherwise the host's background color
+    pre-shaded the same way (stipple is ignored on macOS).
+    """
+
+    BACKDROP_COLOR = "#000000"
+    BACKDROP_ALPHA = 0.4
+
+    def __init__(self, parent=None, title="Dialog", message="", **kwargs):
+        super().__init__(parent, title, message, **kwargs)
+
+        # Backdrop
+        self.backdrop_color = kwargs.get('backdrop_color', self.BACKDROP_COLOR)
+        self.backdrop_alpha = kwargs.get('backdrop_alpha', self.BACKDROP_ALPHA)
+        self.close_on_escape = kwargs.get('close_on_escape', True)
+
+        # Overlay state
+        self.overlay = None
+        self._card_item = None
+        self._backdrop_image = None
+        self._previous_focus = None
+
+    def _get_host(self):
+        """Get the window the overlay is drawn in"""
+        if self.parent is not None:
+            return self.parent.winfo_toplevel()
+        if tk._default_root is None:
+            raise RuntimeError("BTkOverlayDialog requires a parent or an existing root window")
+        return tk._default_root
+
+    def _shaded_color(self, host):
+        """Mix the host's background with the backdrop color by backdrop_alpha"""
+        alpha = self.backdrop_alpha
+        background = host.winfo_rgb(host.cget('bg'))
+        backdrop = host.winfo_rgb(self.backdrop_color)
+        return "#%02X%02X%02X" % tuple(round((b * (1 - alpha) + d * alpha) / 257)
+                                       for b, d in zip(background, backdrop))
+    
+    def _snapshot(self, host, width, height):
+        """Get a dimmed PhotoImage of the host window, or None without screen grabbing"""
+        if not PIL_AVAILABLE or width <= 1 or height <= 1:
+            return None
+        try:
+            x, y = host.winfo_rootx(), host.winfo_rooty()
+            image = ImageGrab.grab(bbox=(x, y, x + width, y + height)).convert("RGB")
+            if image.size != (width, height):
+                image = image.resize((width, height))    # HiDPI screens grab more pixels
+            image = Image.blend(image, Image.new("RGB", image.size, self.backdrop_color), self.backdrop_alpha)
+            return ImageTk.PhotoImage(image, master=host)
+        except Exception:
+            # No grabbing on this platform (e.g. X11 without XCB support), or no permission
+            return None
+    
+    def _create_dialog(self):
+        """Create the overlay layer and dialog card inside the host window"""
+        host = self._get_host()
+        self._previous_focus = host.focus_get()
+        host.update_idletasks()
+        width, height = host.winfo_width(), host.winfo_height()
+
+        # Canvas layer covering the whole host window, in the pre-shaded color
+        self._backdrop_image = self._snapshot(host, width, height)
+        self.overlay = tk.Canvas(host,
+                                 bg=self._shaded_color(host),
+                                 highlightthickness=0,
+                                 bd=0)
+        self.overlay.place(x=0, y=0, relwidth=1, relheight=1)
+        tk.Misc.tkraise(self.overlay)
+
+        # Dimmed snapshot of the host
+        if self._backdrop_image is not None:
+            self.overlay.create_image(0, 0, image=self._backdrop_image, anchor="nw")
+        
+        # Dialog card (the title/message/button builders pack into self.dialog)
+        self.dialog = tk.Frame(self.overlay,
+                               bg=self.bg_color,
+                               width=self.width,
+                               height=self.height,
+                               highlightthickness=1,
+                               highlightbackground=self.border_color)
+        self.dialog.pack_propagate(False)
+        self._card_item = self.overlay.create_window(width // 2, height // 2,
+                                                     window=self.dialog,
+                                                     anchor="center",
+                                                     width=self.width,
+                                                     height=self.height)
+
+        # Create UI elements
+        self._create_title_bar()
+        self._create_message_area()
+        self._create_button_area()
+        self._create_buttons()
+
+        # Local input grab
+        self._bind_overlay_events()
+        self.overlay.grab_set()
+        self.overlay.focus_set()
+
+    def _center_dialog(self, event=None):
+        """Keep the dialog card centered when the host window resizes"""
+        if event is not None:
+            self.overlay.coords(self._card_item, event.width // 2, event.height // 2)
+
+    def _bind_overlay_events(self):
+        """Bind overlay events"""
+        self.overlay.bind("<Configure>", self._center_dialog)
+        if self.close_on_escape:
+            self.overlay.bind("<Escape>", lambda event: self.close())
+
+    def close(self):
+        """Close dialog"""
+        if self.overlay:
+            try:
+                self.overlay.grab_release()
+                self.overlay.place_forget()
+                self.overlay.destroy()
+            except tk.TclError:
+                pass
+            self.overlay = None
+            self.dialog = None
+            self._backdrop_image = None
+
+            # Restore focus to where it was before the dialog opened
+            if self._previous_focus is not None:
+                try:
+                    self._previous_focus.focus_set()
+                except tk.TclError:
+                    pass
+
+    def show(self):
+        """Show dialog and wait for result"""
+        self._create_dialog()
+
+        # Wait for overlay to close
+        self.overlay.wait_window()
+
+        return self.result
+
 # Compatibility aliases
 class BTkMessageBox:
     """Message box dialogs for compatibility"""
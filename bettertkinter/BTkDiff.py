@@ -0,0 +1,238 @@
+import bisect
+import difflib
+
+# Inputs up to this many lines (after trimming common ends) use SequenceMatcher
+SEQUENCE_MATCHER_LINES = 4000
+# Edit distance after which Myers' algorithm gives up for a faster, coarser diff
+MAX_EDITS = 2000
+
+def _snake(a, b, x, y):
+    """Follow a diagonal of equal lines from (x, y), comparing slices in growing steps"""
+    n, m = len(a), len(b)
+    step = 8
+    while x < n and y < m and a[x] == b[y]:
+        size = min(step, n - x, m - y)
+        if a[x:x + size] == b[y:y + size]:
+            x += size
+            y += size
+            step *= 2
+        else:
+            x += 1
+            y += 1
+            while a[x] == b[y]:
+                x += 1
+                y += 1
+            break
+    return x, y
+
+def _myers(a, b, max_edits):
+    """Get (a1, a2, b1, b2) hunks with Myers' O(ND) algorithm, None past max_edits"""
+    n, m = len(a), len(b)
+    offset = max_edits + 1
+    v = [0] * (2 * offset + 1)
+    trace = []
+    for d in range(max_edits + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            x, y = _snake(a, b, x, x - k)
+            v[offset + k] = x
+            if x >= n and y >= m:
+                trace.append(v[offset - d:offset + d + 1])
+                return _backtrack(trace, n, m)
+        trace.append(v[offset - d:offset + d + 1])
+    return None
+
+def _backtrack(trace, n, m):
+    """Turn the furthest-reaching paths of each round into hunks"""
+    edits = []
+    x, y = n, m
+    for d in range(len(trace) - 1, 0, -1):
+        previous = trace[d - 1]
+        k = x - y
+        if k == -d or (k != d and previous[k - 1 + d - 1] < previous[k + 1 + d - 1]):
+            k_before = k + 1
+        else:
+            k_before = k - 1
+        x_before = previous[k_before + d - 1]
+        y_before = x_before - k_before
+        edits.append((x_before, y_before, k_before == k + 1))
+        x, y = x_before, y_before
+    
+    hunks = []
+    for x, y, inserted in reversed(edits):
+        if hunks and hunks[-1][1] == x and hunks[-1][3] == y:
+            a1, a2, b1, b2 = hunks[-1]
+            hunks[-1] = (a1, a2, b1, b2 + 1) if inserted else (a1, a2 + 1, b1, b2)
+        else:
+            hunks.append((x, x, y, y + 1) if inserted else (x, x + 1, y, y))
+    return hunks
+
+def diff_ids(a, b, max_edits=MAX_EDITS):
+    """Get the (a1, a2, b1, b2) hunks turning sequence a into b
+    
+    Hunks are half-open, 0-based index ranges of differing items, in order.
+    Common ends are trimmed first; small inputs use difflib.SequenceMatcher,
+    larger ones Myers' O(ND) algorithm, and inputs that differ in more than
+    max_edits places fall back to SequenceMatcher with its junk heuristic.
+    """
+    start = 0
+    end_a, end_b = len(a), len(b)
+    while start < end_a and start < end_b and a[start] == b[start]:
+        start += 1
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    if start == end_a and start == end_b:
+        return []
+    if start == end_a or start == end_b:
+        return [(start, end_a, start, end_b)]
+    
+    a = a[start:end_a]
+    b = b[start:end_b]
+    hunks = None
+    if len(a) + len(b) > SEQUENCE_MATCHER_LINES:
+        hunks = _myers(a, b, max_edits)
+    if hunks is None:
+        matcher = difflib.SequenceMatcher(None, a, b, autojunk=len(a) + len(b) > SEQUENCE_MATCHER_LINES)
+        hunks = [(a1, a2, b1, b2) for tag, a1, a2, b1, b2 in matcher.get_opcodes() if tag != "equal"]
+    return [(a1 + start, a2 + start, b1 + start, b2 + start) for a1, a2, b1, b2 in hunks]
+
+class BTkLineDiff:
+    """Line diff of two texts that follows edits of either side
+    
+    Lines are interned to integer ids, so comparisons are integer compares.
+    Hunks are (a1, a2, b1, b2) tuples as returned by diff_ids; side 0 is a
+    (left), side 1 is b (right). apply_change() re-diffs only a window
+    around an edit (grown to the hunks it touches) and splices the result
+    in, so typing does not re-diff the whole file.
+    """
+    
+    CONTEXT_LINES = 3      # Equal lines around an edit included in its re-diff
+    REDIFF_LIMIT = 20000   # Lines in a re-diff window above which a full diff is needed
+    
+    def __init__(self, lines_a=(), lines_b=()):
+        self._ids = {}
+        self.sides = (self._intern(lines_a), self._intern(lines_b))
+        self.hunks = diff_ids(self.sides[0], self.sides[1])
+        self._bounds = None
+    
+    def _intern(self, lines):
+        ids = self._ids
+        return [ids.setdefault(line, len(ids)) for line in lines]
+    
+    # Lookups
+    def _side_bounds(self, side):
+        """Get (starts, ends) of the hunks on one side, for bisecting"""
+        if self._bounds is None:
+            hunks = self.hunks
+            self._bounds = (([h[0] for h in hunks], [h[1] for h in hunks]),
+                            ([h[2] for h in hunks], [h[3] for h in hunks]))
+        return self._bounds[side]
+    
+    def hunks_between(self, side, first, last):
+        """Get the hunks touching 1-based lines first..last of one side"""
+        starts, ends = self._side_bounds(side)
+        index = bisect.bisect_left(ends, first - 1)
+        stop = bisect.bisect_right(starts, last, index)
+        return self.hunks[index:stop]
+    
+    def map_line(self, side, line):
+        """Get the line of the other side shown alongside a 1-based line"""
+        starts, ends = self._side_bounds(side)
+        index = bisect.bisect_right(starts, line - 1) - 1
+        if index < 0:
+            return line
+        hunk = self.hunks[index]
+        start, end = hunk[2 * side], hunk[2 * side + 1]
+        other_start, other_end = hunk[2 - 2 * side], hunk[3 - 2 * side]
+        if line - 1 >= end:
+            return other_end + line - end
+        return other_start + 1 + min(line - 1 - start, max(other_end - other_start - 1, 0))
+    
+    def _map_boundary(self, side, position, index):
+        """Map a 0-based line boundary to the other side, given the number of hunks before it"""
+        if index == 0:
+            return position
+        hunk = self.hunks[index - 1]
+        return hunk[3 - 2 * side] + position - hunk[2 * side + 1]
+    
+    # Edits
+    def apply_change(self, side, first, removed_lines, lines):
+        """Replace lines first..first+removed_lines of a side and re-diff around them
+        
+        Returns False when the re-diff window is too large; the line ids are
+        updated either way, and the caller should then run a full diff.
+        """
+        own = self.sides[side]
+        other = self.sides[1 - side]
+        low, high = first - 1, min(first + removed_lines, len(own))
+        delta = len(lines) - (high - low)
+        
+        # Window: context around the edit, grown to cover the hunks it touches
+        starts, ends = self._side_bounds(side)
+        window_start = max(low - self.CONTEXT_LINES, 0)
+        window_end = min(high + self.CONTEXT_LINES, len(own))
+        index = bisect.bisect_left(ends, window_start)
+        stop = bisect.bisect_right(starts, window_end, index)
+        if index < stop:
+            window_start = min(window_start, starts[index])
+            window_end = max(window_end, ends[stop - 1])
+        other_start = self._map_boundary(side, window_start, index)
+        other_end = self._map_boundary(side, window_end, stop)
+        
+        own[low:high] = self._intern(lines)
+        window_end += delta
+        if window_end - window_start + other_end - other_start > self.REDIFF_LIMIT:
+            self.hunks = []
+            self._bounds = None
+            return False
+        
+        if side == 0:
+            local = diff_ids(own[window_start:window_end], other[other_start:other_end])
+            new = [(a1 + window_start, a2 + window_start, b1 + other_start, b2 + other_start)
+                   for a1, a2, b1, b2 in local]
+            moved = [(a1 + delta, a2 + delta, b1, b2) for a1, a2, b1, b2 in self.hunks[stop:]]
+        else:
+            local = diff_ids(other[other_start:other_end], own[window_start:window_end])
+            new = [(a1 + other_start, a2 + other_start, b1 + window_start, b2 + window_start)
+                   for a1, a2, b1, b2 in local]
+            moved = [(a1, a2, b1 + delta, b2 + delta) for a1, a2, b1, b2 in self.hunks[stop:]]
+        self.hunks[index:] = new + moved
+        self._bounds = None
+        return True
+
+# Benchmark
+if __name__ == "__main__":
+    import time
+    import random
+    
+    random.seed(3)
+    left = [f"option_{i} = {random.randint(0, 100)}" for i in range(50000)]
+    right = list(left)
+    for _ in range(300):
+        position = random.randrange(len(right))
+        choice = random.random()
+        if choice < 0.4:
+            right[position] = right[position] + "  # changed"
+        elif choice < 0.7:
+            del right[position]
+        else:
+            right.insert(position, f"added = {position}")
+    
+    start = time.perf_counter()
+    diff = BTkLineDiff(left, right)
+    print(f"{len(left)} lines, {len(diff.hunks)} hunks in {(time.perf_counter() - start) * 1000:.0f} ms")
+    
+    matcher = difflib.SequenceMatcher(None, left, right, autojunk=False)
+    expected = sum(a2 - a1 + b2 - b1 for tag, a1, a2, b1, b2 in matcher.get_opcodes() if tag != "equal")
+    found = sum(a2 - a1 + b2 - b1 for a1, a2, b1, b2 in diff.hunks)
+    print(f"changed lines: {found} (SequenceMatcher: {expected})")
+    
+    start = time.perf_counter()
+    for line in range(1000, 1100):
+        diff.apply_change(0, line, 0, [left[line - 1] + " edited"])
+    print(f"100 incremental edits in {(time.perf_counter() - start) * 1000:.1f} ms, "
+          f"{len(diff.hunks)} hunks, line 25000 maps to {diff.map_line(0, 25000)}")
@@ -0,0 +1,211 @@
+import queue
+import threading
+import tkinter as tk
+from .BTkTextEditor import BTkTextEditor
+from .BTkDiff import BTkLineDiff
+
+class BTkDiffView(tk.Frame):
+    """Side-by-side diff of two texts in BTkTextEditor panes
+    
+    The diff is computed on a worker thread from snapshots of both panes
+    (see BTkLineDiff). Only the hunks in view are tagged, again whenever a
+    pane scrolls, so painting cost does not grow with the file. Edits in
+    either pane re-diff the lines around them; edits too large for that
+    schedule a new full diff. Scrolling one pane scrolls the other to the
+    matching line.
+    """
+    
+    # Constants
+    DIFF_DELAY_MS = 300   # Pause after large edits before the full diff is recomputed
+    DIFF_POLL_MS = 20     # Poll interval for diff results
+    DIFF_TAGS = {"diff_delete": "#FFE0E0", "diff_insert": "#DDF4DD", "diff_change": "#FFF2C6"}
+    GAP_COLOR = "#A0A0A0"
+    MARKER_COLOR = "#E0A000"
+    
+    def __init__(self, parent, left_text="", right_text="", **editor_kwargs):
+        super().__init__(parent, bg=parent.cget('bg'))
+        
+        self.diff = None
+        self._diff_results = None
+        self._diff_stale = False
+        self._diff_job = None
+        self._marker_job = None
+        self._paint_jobs = [None, None]
+        self._sync_target = None
+        self._loading = False
+        
+        self.panes = (BTkTextEditor(self, **editor_kwargs), BTkTextEditor(self, **editor_kwargs))
+        self.left, self.right = self.panes
+        for side, pane in enumerate(self.panes):
+            pane.grid(row=0, column=side, sticky="nsew")
+            self.columnconfigure(side, weight=1, uniform="panes")
+            
+            # Diff backgrounds sit below syntax and selection tags
+            widget = pane.text_widget
+            for tag, color in self.DIFF_TAGS.items():
+                widget.tag_configure(tag, background=color)
+                widget.tag_lower(tag)
+            widget.tag_configure("diff_gap", underline=True)
+            try:
+                widget.tag_configure("diff_gap", underlinefg=self.GAP_COLOR)
+            except tk.TclError:
+                pass
+            
+            pane.add_edit_listener(lambda change, side=side: self._on_edit(side, change))
+            pane.add_scroll_listener(lambda first, last, side=side: self._on_scroll(side))
+        self.rowconfigure(0, weight=1)
+        
+        if left_text or right_text:
+            self.set_texts(left_text, right_text)
+    
+    @property
+    def hunks(self):
+        """Current (left_start, left_end, right_start, right_end) hunks, 0-based and half-open"""
+        return self.diff.hunks if self.diff is not None else []
+    
+    def set_texts(self, left_text, right_text):
+        """Show two new texts and diff them in the background"""
+        self._loading = True
+        try:
+            self.left.set_text(left_text)
+            self.right.set_text(right_text)
+        finally:
+            self._loading = False
+        self.diff = None
+        for pane in self.panes:
+            for tag in list(self.DIFF_TAGS) + ["diff_gap"]:
+                pane.text_widget.tag_remove(tag, "1.0", tk.END)
+        self._start_diff()
+    
+    # Diffing
+    def _start_diff(self):
+        """Diff snapshots of both panes on a worker thread"""
+        self._diff_job = None
+        self._diff_stale = False
+        texts = [pane.get_text() for pane in self.panes]
+        results = queue.Queue()
+        
+        def work():
+            try:
+                results.put(BTkLineDiff(texts[0].split("\n"), texts[1].split("\n")))
+            except Exception as e:
+                print(f"Diff view error: {e}")
+                results.put(None)
+        
+        self._diff_results = results
+        threading.Thread(target=work, daemon=True).start()
+        self.after(self.DIFF_POLL_MS, self._poll_diff)
+    
+    def _poll_diff(self):
+        """Install a finished diff, or start again if the panes changed meanwhile"""
+        results = self._diff_results
+        if results is None:
+            return
+        try:
+            diff = results.get_nowait()
+        except queue.Empty:
+            self.after(self.DIFF_POLL_MS, self._poll_diff)
+            return
+        
+        self._diff_results = None
+        if self._diff_stale:
+            self._start_diff()
+            return
+        self.diff = diff
+        for side in (0, 1):
+            self._paint(side)
+        self._update_markers()
+    
+    def _schedule_diff(self):
+        """Drop the current diff and run a full one once edits pause"""
+        self.diff = None
+        if self._diff_results is not None:
+            self._diff_stale = True
+            return
+        if self._diff_job is not None:
+            self.after_cancel(self._diff_job)
+        self._diff_job = self.after(self.DIFF_DELAY_MS, self._start_diff)
+    
+    def _on_edit(self, side, change):
+        """Re-diff the lines around an edit of one pane"""
+        if self._loading:
+            return
+        if self.diff is None or change.is_full:
+            self._schedule_diff()
+            return
+        
+        first = change.start_line
+        lines = self.panes[side].text_widget.get(
+            f"{first}.0", f"{first + change.added_lines}.end").split("\n")
+        if not self.diff.apply_change(side, first, change.removed_lines, lines):
+            self._schedule_diff()
+            return
+        self._schedule_paint(0)
+        self._schedule_paint(1)
+        if self._marker_job is not None:
+            self.after_cancel(self._marker_job)
+        self._marker_job = self.after(self.DIFF_DELAY_MS, self._update_markers)
+    
+    # Painting
+    def _schedule_paint(self, side):
+        if self._paint_jobs[side] is None:
+            self._paint_jobs[side] = self.after_idle(self._paint, side)
+    
+    def _paint(self, side):
+        """Tag the hunks in view on one side"""
+        self._paint_jobs[side] = None
+        if self.diff is None:
+            return
+        pane = self.panes[side]
+        widget = pane.text_widget
+        try:
+            first, last = pane.get_visible_lines()
+        except tk.TclError:
+            return
+        
+        # Lines only on this side are deletions on the left and insertions on the right
+        own_tag = "diff_delete" if side == 0 else "diff_insert"
+        ranges = {tag: [] for tag in list(self.DIFF_TAGS) + ["diff_gap"]}
+        for hunk in self.diff.hunks_between(side, first, last):
+            start, end = hunk[2 * side], hunk[2 * side + 1]
+            if start == end:
+                # Lines only on the other side: underline the line above the gap
+                line = max(start, 1)
+                ranges["diff_gap"].extend((f"{line}.0", f"{line}.end"))
+            else:
+                tag = "diff_change" if hunk[2 - 2 * side] != hunk[3 - 2 * side] else own_tag
+                ranges[tag].extend((f"{max(start + 1, first)}.0", f"{min(end, last) + 1}.0"))
+        
+        for tag, tag_ranges in ranges.items():
+            widget.tag_remove(tag, f"{first}.0", f"{last + 1}.0")
+            if tag_ranges:
+                widget.tag_add(tag, *tag_ranges)
+    
+    def _update_markers(self):
+        """Mark the first line of every hunk in the panes' overviews"""
+        self._marker_job = None
+        for side, pane in enumerate(self.panes):
+            pane.clear_markers("diff")
+            pane.add_markers("diff", [hunk[2 * side] + 1 for hunk in self.hunks],
+                             self.MARKER_COLOR)
+    
+    # Synchronized scrolling
+    def _on_scroll(self, side):
+        """Repaint a scrolled pane and bring the other one to the matching line"""
+        self._schedule_paint(side)
+        if self.diff is None:
+            return
+        try:
+            top = self.panes[side].get_visible_lines()[0]
+        except tk.TclError:
+            return
+        
+        # Ignore the echo of our own scrolling of this pane
+        if self._sync_target == (side, top):
+            self._sync_target = None
+            return
+        other = self.panes[1 - side]
+        line = self.diff.map_line(side, top)
+        if other.get_visible_lines()[0] != line:
+            self._sync_target = (1 - side, line)
+            other.text_widget.yview(f"{line}.0")
@@ -1,13 +1,17 @@
 import tkinter as tk
 import math
+from .BTkCanvasWidget import BTkCanvasWidget
+from .BTkTheme import get_theme, subscribe, set_background, parent_background
 
-class BTkEntry(tk.Canvas):
+class BTkEntry(BTkCanvasWidget):
     """Modern BetterTkinter entry component"""
     
     # Constants
     DEFAULT_FONT = "Segoe UI"
     DEFAULT_WIDTH = 200
     DEFAULT_HEIGHT = 32
+    COLOR_OPTIONS = ('bg_color', 'border_color', 'focus_border_color', 'text_color',
+                     'placeholder_color', 'selection_bg')
     
     def __init__(self, parent, **kwargs):
         # Configuration
@@ -18,13 +22,9 @@ class BTkEntry(tk.Canvas):
         self.command = kwargs.get('command', None)  # Called on Enter key
         self.validate_command = kwargs.get('validate_command', None)
         
-        # Colors
-        self.bg_color = kwargs.get('bg_color', "#FFFFFF")
-        self.border_color = kwargs.get('border_color', "#CED4DA")
-        self.focus_border_color = kwargs.get('focus_border_color', "#007BFF")
-        self.text_color = kwargs.get('text_color', "#333333")
-        self.placeholder_color = kwargs.get('placeholder_color', "#6C757D")
-        self.selection_bg = kwargs.get('selection_bg', "#007BFF")
+        # Colors from the current theme, keeping given colors
+        self._color_overrides = {key: kwargs[key] for key in self.COLOR_OPTIONS if key in kwargs}
+        self._apply_palette(get_theme().widget_palette("entry"))
         
         # Initialize canvas
         super().__init__(parent,
@@ -49,8 +49,28 @@ class BTkEntry(tk.Canvas):
         self._create_entry()
         
         # Render and bind events
-        self._render()
+        self.redraw()
         self._bind_events()
+        
+        # Follow theme changes
+        subscribe(self)
+    
+    def _apply_palette(self, palette):
+        """Take colors from a theme palette except the overridden ones"""
+        for key, value in palette.items():
+            setattr(self, key, self._color_overrides.get(key, value))
+    
+    def apply_theme(self, theme, batch=None):
+        """Recolor for a new theme in place, without a redraw"""
+        self._apply_palette(theme.widget_palette("entry"))
+        set_background(self, parent_background(self), batch)
+        command = (self.entry._w, "configure", "-bg", self.bg_color, "-fg", self.text_color,
+                   "-insertbackground", self.text_color, "-selectbackground", self.selection_bg)
+        if batch is not None:
+            batch.extend((command,))
+        else:
+            self.tk.call(command)
+        self.refresh_options(batch)
     
     def _get_parent_bg(self, parent):
         """Get parent background color"""
@@ -94,64 +114,36 @@ class BTkEntry(tk.Canvas):
                           width=entry_width,
                           height=entry_height)
     
-    def _render(self):
-        """Render entry border and placeholder"""
-        self.delete("border")
-        
-        # Determine border color
-        border_color = self.focus_border_color if self._focused else self.border_color
-        
-        # Draw rounded border
-        self._draw_rounded_border(border_color)
-        
-        # Handle placeholder text
-        self._update_placeholder()
-    
-    def _draw_rounded_border(self, color):
-        """Draw rounded border"""
-        # Simple rounded rectangle simulation
+    def describe_items(self):
+        """Describe the rounded border and placeholder for the current state"""
+        color = self.focus_border_color if self._focused else self.border_color
         border_width = 2
         radius = 4
-        
-        # Main rectangle
-        self.create_rectangle(1, 1, self.width-1, self.height-1,
-                            outline=color,
-                            width=border_width,
-                            fill="",
-                            tags="border")
-        
-        # Corner arcs for rounded appearance
-        self.create_arc(1, 1, radius*2, radius*2,
-                       outline=color, width=border_width,
-                       start=90, extent=90, style="arc", tags="border")
-        
-        self.create_arc(self.width-radius*2-1, 1, self.width-1, radius*2,
-                       outline=color, width=border_width,
-                       start=0, extent=90, style="arc", tags="border")
-        
-        self.create_arc(1, self.height-radius*2-1, radius*2, self.height-1,
-                       outline=color, width=border_width,
-                       start=180, extent=90, style="arc", tags="border")
-        
-        self.create_arc(self.width-radius*2-1, self.height-radius*2-1,
-                       self.width-1, self.height-1,
-                       outline=color, width=border_width,
-                       start=270, extent=90, style="arc", tags="border")
-    
-    def _update_placeholder(self):
-        """Update placeholder text display"""
-        self.delete("placeholder")
-        
-        current_text = self._text_var.get()
-        
-        if not current_text and self.placeholder_text and not self._focused:
-            # Show placeholder
-            self.create_text(12, self.height // 2,
-                           text=self.placeholder_text,
-                           fill=self.placeholder_color,
-                           font=(self.DEFAULT_FONT, 10, "normal"),
-                           anchor="w",
-                           tags="placeholder")
+        border = {"outline": color, "width": border_width, "style": "arc", "tags": "border"}
+        
+        # Placeholder shows while the entry is empty and unfocused
+        show_placeholder = not self._text_var.get() and self.placeholder_text and not self._focused
+        
+        return {
+            # Main rectangle
+            "border": ("rectangle", (1, 1, self.width-1, self.height-1),
+                       {"outline": color, "width": border_width, "fill": "", "tags": "border"}),
+        
+            # Corner arcs for rounded appearance
+            "corner_nw": ("arc", (1, 1, radius*2, radius*2),
+                          dict(border, start=90, extent=90)),
+            "corner_ne": ("arc", (self.width-radius*2-1, 1, self.width-1, radius*2),
+                          dict(border, start=0, extent=90)),
+            "corner_sw": ("arc", (1, self.height-radius*2-1, radius*2, self.height-1),
+                          dict(border, start=180, extent=90)),
+            "corner_se": ("arc", (self.width-radius*2-1, self.height-radius*2-1, self.width-1, self.height-1),
+                          dict(border, start=270, extent=90)),
+        
+            "placeholder": ("text", (12, self.height // 2),
+                            {"text": self.placeholder_text, "fill": self.placeholder_color,
+                             "font": (self.DEFAULT_FONT, 10, "normal"), "anchor": "w", "tags": "placeholder",
+                             "state": "normal" if show_placeholder else "hidden"}),
+        }
     
     def _bind_events(self):
         """Bind events"""
@@ -166,12 +158,12 @@ class BTkEntry(tk.Canvas):
     def _on_focus_in(self, event=None):
         """Handle focus in"""
         self._focused = True
-        self._render()
+        self.invalidate()
     
     def _on_focus_out(self, event=None):
         """Handle focus out"""
         self._focused = False
-        self._render()
+        self.invalidate()
     
     def _on_return(self, event=None):
         """Handle Return key"""
@@ -195,7 +187,7 @@ class BTkEntry(tk.Canvas):
     
     def _on_text_change(self, *args):
         """Handle text variable change"""
-        self._update_placeholder()
+        self.invalidate()
     
     # Public methods
     def get(self):
@@ -221,13 +213,13 @@ class BTkEntry(tk.Canvas):
         if 'state' in kwargs:
             self.entry.config(state=kwargs['state'])
         if 'bg_color' in kwargs:
-            self.bg_color = kwargs['bg_color']
+            self.bg_color = self._color_overrides['bg_color'] = kwargs['bg_color']
             self.entry.config(bg=self.bg_color)
         if 'text_color' in kwargs:
-            self.text_color = kwargs['text_color']
+            self.text_color = self._color_overrides['text_color'] = kwargs['text_color']
             self.entry.config(fg=self.text_color)
         
-        self._render()
+        self.invalidate()
     
     def bind_var(self, variable):
         """Bind to a StringVar"""
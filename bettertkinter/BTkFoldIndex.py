@@ -0,0 +1,128 @@
+import re
+
+# Quoted strings are skipped when counting brackets
+_STRINGS = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'')
+_BRACKETS = re.compile(r"[()\[\]{}]")
+
+class BTkFoldIndex:
+    """Per-line indentation and bracket balance of a buffer, for code folding
+    
+    Each line is stored as its indentation width (-1 for blank lines) and
+    the net number of brackets it opens. Edits replace only the entries of
+    the lines they touch (update), so the index stays current at the cost of
+    rescanning edited lines. Fold regions are derived on demand: a line
+    starts a region when the next non-blank line is indented deeper, or when
+    it leaves brackets open; the region extends to the last line before the
+    indentation returns, or up to the line closing the brackets.
+    """
+    
+    def __init__(self, tab_size=4):
+        self.tab_size = tab_size
+        self.indents = []
+        self.brackets = []
+    
+    def __len__(self):
+        return len(self.indents)
+    
+    # Index maintenance
+    def scan_line(self, line):
+        """Get (indent, bracket balance) of one line"""
+        stripped = line.lstrip()
+        if not stripped:
+            return -1, 0
+        indent = len(line) - len(stripped)
+        if "\t" in line[:indent]:
+            indent = len(line[:indent].expandtabs(self.tab_size))
+        if _BRACKETS.search(stripped) is None:
+            return indent, 0
+        code = _STRINGS.sub("", stripped) if ('"' in stripped or "'" in stripped) else stripped
+        balance = (code.count("(") + code.count("[") + code.count("{")
+                   - code.count(")") - code.count("]") - code.count("}"))
+        return indent, balance
+    
+    def reset(self, lines):
+        """Index a whole buffer given as a list of lines"""
+        self.indents = []
+        self.brackets = []
+        self._scan_into(0, 0, lines)
+    
+    def update(self, first, removed_lines, lines):
+        """Replace lines first..first+removed_lines with a rescan of lines"""
+        self._scan_into(first - 1, first + removed_lines, lines)
+    
+    def _scan_into(self, start, stop, lines):
+        scanned = [self.scan_line(line) for line in lines]
+        self.indents[start:stop] = [indent for indent, _ in scanned]
+        self.brackets[start:stop] = [balance for _, balance in scanned]
+    
+    # Fold regions
+    def _next_code_line(self, line):
+        """Get the first non-blank line after line, or None"""
+        indents = self.indents
+        for index in range(line, len(indents)):
+            if indents[index] >= 0:
+                return index + 1
+        return None
+    
+    def is_foldable(self, line):
+        """Whether a fold region starts at a 1-based line"""
+        if not 1 <= line <= len(self.indents):
+            return False
+        indent = self.indents[line - 1]
+        if indent < 0:
+            return False
+        if self.brackets[line - 1] > 0:
+            return True
+        following = self._next_code_line(line)
+        return following is not None and self.indents[following - 1] > indent
+    
+    def fold_end(self, line):
+        """Get the last line of the region starting at line, or None"""
+        if not self.is_foldable(line):
+            return None
+        indents = self.indents
+        indent = indents[line - 1]
+        end = line
+        
+        # Indentation: up to the last code line indented deeper
+        for index in range(line, len(indents)):
+            if indents[index] < 0:
+                continue
+            if indents[index] <= indent:
+                break
+            end = index + 1
+        
+        # Brackets: up to the line before the closing line (or the closing line
+        # itself when more code follows the bracket on it)
+        depth = self.brackets[line - 1]
+        if depth > 0:
+            brackets = self.brackets
+            for index in range(line, len(indents)):
+                depth += brackets[index]
+                if depth <= 0:
+                    closing = index + 1
+                    end = max(end, closing - 1 if indents[index] <= indent else closing)
+                    break
+            else:
+                end = len(indents)
+        
+        return end if end > line else None
+
+# Benchmark
+if __name__ == "__main__":
+    import time
+    
+    source = "\n".join(
+        f"def function_{i}(value):\n    if value:\n        return {{'key': [value, {i}]}}\n    return None\n"
+        for i in range(50000))
+    lines = source.split("\n")
+    
+    index = BTkFoldIndex()
+    start = time.perf_counter()
+    index.reset(lines)
+    print(f"indexed {len(index)} lines in {(time.perf_counter() - start) * 1000:.1f} ms")
+    
+    start = time.perf_counter()
+    index.update(100, 0, ["    if other:", "        pass"])
+    print(f"edit rescan: {(time.perf_counter() - start) * 1000:.3f} ms, "
+          f"fold at 1 ends at {index.fold_end(1)}, at 2 ends at {index.fold_end(2)}")
@@ -1,5 +1,7 @@
 import tkinter as tk
 import math
+from .BTkCanvasWidget import BTkCanvasWidget
+from .BTkTheme import get_theme, subscribe, set_background, parent_background
 
 class BTkFrame(tk.Frame):
     """Modern, high-performance BetterTkinter frame component"""
@@ -9,6 +11,7 @@ class BTkFrame(tk.Frame):
     DEFAULT_WIDTH = 200
     DEFAULT_HEIGHT = 150
     DEFAULT_RADIUS = 8
+    COLOR_OPTIONS = ('bg_color', 'border_color', 'shadow_color')
     
     def __init__(self, parent, style="default", **kwargs):
         # Configuration
@@ -27,77 +30,56 @@ class BTkFrame(tk.Frame):
                         relief='flat')
         
         # Create optimized canvas for custom drawing
-        self.canvas = tk.Canvas(self,
-                               width=self.width,
-                               height=self.height,
-                               bg=self._get_parent_bg(parent),
-                               highlightthickness=0,
-                               bd=0,
-                               relief='flat')
+        self.canvas = BTkCanvasWidget(self,
+                                      describe=self.describe_items,
+                                      width=self.width,
+                                      height=self.height,
+                                      bg=self._get_parent_bg(parent),
+                                      highlightthickness=0,
+                                      bd=0,
+                                      relief='flat')
         self.canvas.pack(fill='both', expand=True)
         
         # Render frame
         self._render()
         
+        # Follow theme changes
+        subscribe(self)
+        
         # Store original place method for content positioning
         self._original_place = super().place
     
     def _load_style(self, style, kwargs):
-        """Load optimized style configuration"""
-        # Modern style presets
-        style_presets = {
-            "default": {
-                "bg": "#FFFFFF", 
-                "border": "#E0E0E0", 
-                "radius": 8,
-                "shadow": False
-            },
-            "card": {
-                "bg": "#FFFFFF", 
-                "border": "#D0D0D0", 
-                "radius": 12,
-                "shadow": True
-            },
-            "modern": {
-                "bg": "#F8F9FA", 
-                "border": "#DEE2E6", 
-                "radius": 10,
-                "shadow": False
-            },
-            "dark": {
-                "bg": "#343A40", 
-                "border": "#495057", 
-                "radius": 8,
-                "shadow": True
-            },
-            "light": {
-                "bg": "#F8F9FA",
-                "border": "#E9ECEF",
-                "radius": 6,
-                "shadow": False
-            },
-            "primary": {
-                "bg": "#E3F2FD",
-                "border": "#2196F3",
-                "radius": 8,
-                "shadow": False
-            },
-            "success": {
-                "bg": "#E8F5E8",
-                "border": "#4CAF50",
-                "radius": 8,
-                "shadow": False
-            }
-        }
-        
-        preset = style_presets.get(style, style_presets["default"])
-        
-        # Apply configuration
-        self.bg_color = kwargs.get('bg_color', preset["bg"])
-        self.border_color = kwargs.get('border_color', preset["border"])
+        """Load the style preset from the current theme, keeping given values"""
+        preset = get_theme().frame_palette(style)
+        self.style = style
+        self._color_overrides = {key: kwargs[key] for key in self.COLOR_OPTIONS if key in kwargs}
+        self._apply_palette(preset)
+        
+        # Geometry is set once; themes only change colors
         self.rounded_radius = kwargs.get('rounded_radius', preset["radius"])
         self.border_width = kwargs.get('border_width', 1)
-        self.shadow = kwargs.get('shadow', preset.get("shadow", False))
+        self.shadow = kwargs.get('shadow', preset["shadow"])
+    
+    def _apply_palette(self, palette):
+        """Take colors from a theme palette except the overridden ones"""
+        overrides = self._color_overrides
+        self.bg_color = overrides.get('bg_color', palette["bg"])
+        self.border_color = overrides.get('border_color', palette["border"])
+        self.shadow_color = overrides.get('shadow_color', palette["shadow_color"])
+    
+    def apply_theme(self, theme, batch=None):
+        """Recolor for a new theme in place, without a redraw"""
+        self._apply_palette(theme.frame_palette(self.style))
+        background = parent_background(self)
+        set_background(self, background, batch)
+        set_background(self.canvas, background, batch)
+        frame = {"fill": self.bg_color}
+        if self.rounded_radius <= 0:
+            frame["outline"] = self.border_color if self.border_width > 0 else ""
+        self.canvas.recolor({"shadow": {"fill": self.shadow_color},
+                             "frame": frame,
+                             "border": {"outline": self.border_color}}, batch)
     
     def _get_parent_bg(self, parent):
         """Get parent background with fallback"""
@@ -108,65 +90,45 @@ class BTkFrame(tk.Frame):
     
     def _render(self):
         """Optimized frame rendering"""
-        self.canvas.delete("all")
+        self.canvas.redraw()
         
-        # Draw shadow if enabled
+    def describe_items(self):
+        """Describe the shadow, frame shape and border"""
+        items = {}
+        
+        # Subtle shadow effect
         if self.shadow:
-            self._draw_shadow()
+            shadow_offset = 2
+            shadow_color = self.shadow_color
+            if self.rounded_radius > 0:
+                points = self._calculate_rounded_points(
+                    shadow_offset, shadow_offset,
+                    self.width + shadow_offset, self.height + shadow_offset,
+                    self.rounded_radius
+                )
+                items["shadow"] = ("polygon", points,
+                                   {"fill": shadow_color, "outline": "", "smooth": True})
+            else:
+                items["shadow"] = ("rectangle", (shadow_offset, shadow_offset,
+                                                 self.width + shadow_offset, self.height + shadow_offset),
+                                   {"fill": shadow_color, "outline": ""})
         
-        # Draw main frame
-        self._draw_frame_shape()
-    
-    def _draw_shadow(self):
-        """Draw subtle shadow effect"""
-        shadow_offset = 2
-        shadow_color = "#E0E0E0"  # Light gray shadow
-        
-        if self.rounded_radius > 0:
-            points = self._calculate_rounded_points(
-                shadow_offset, shadow_offset,
-                self.width + shadow_offset, self.height + shadow_offset,
-                self.rounded_radius
-            )
-            self.canvas.create_polygon(points, fill=shadow_color, outline="", smooth=True)
-        else:
-            self.canvas.create_rectangle(
-                shadow_offset, shadow_offset,
-                self.width + shadow_offset, self.height + shadow_offset,
-                fill=shadow_color, outline=""
-            )
-    
-    def _draw_frame_shape(self):
-        """Draw the main frame shape"""
         if self.rounded_radius <= 0:
             # Simple rectangle
-            if self.border_width > 0:
-                self.canvas.create_rectangle(
-                    0, 0, self.width, self.height,
-                    fill=self.bg_color,
-                    outline=self.border_color,
-                    width=self.border_width
-                )
-            else:
-                self.canvas.create_rectangle(
-                    0, 0, self.width, self.height,
-                    fill=self.bg_color, outline=""
-                )
+            items["frame"] = ("rectangle", (0, 0, self.width, self.height),
+                              {"fill": self.bg_color,
+                               "outline": self.border_color if self.border_width > 0 else "",
+                               "width": max(self.border_width, 1)})
         else:
-            # Rounded rectangle
-            self._draw_rounded_frame()
-    
-    def _draw_rounded_frame(self):
-        """Draw optimized rounded frame"""
-        points = self._calculate_rounded_points(0, 0, self.width, self.height, self.rounded_radius)
-        
-        # Draw filled shape
-        self.canvas.create_polygon(points, fill=self.bg_color, outline="", smooth=True)
-        
-        # Draw border if needed
-        if self.border_width > 0:
-            self.canvas.create_polygon(points, fill="", outline=self.border_color, 
-                                     width=self.border_width, smooth=True)
+            # Rounded frame, with the border drawn over the filled shape
+            points = self._calculate_rounded_points(0, 0, self.width, self.height, self.rounded_radius)
+            items["frame"] = ("polygon", points,
+                              {"fill": self.bg_color, "outline": "", "smooth": True})
+            if self.border_width > 0:
+                items["border"] = ("polygon", points,
+                                   {"fill": "", "outline": self.border_color,
+                                    "width": self.border_width, "smooth": True})
+        return items
     
     def _calculate_rounded_points(self, x1, y1, x2, y2, radius):
         """Calculate points for rounded rectangle efficiently"""
@@ -215,13 +177,13 @@ class BTkFrame(tk.Frame):
     def configure(self, **kwargs):
         """Configure frame properties"""
         if 'bg_color' in kwargs:
-            self.bg_color = kwargs['bg_color']
+            self.bg_color = self._color_overrides['bg_color'] = kwargs['bg_color']
         if 'border_color' in kwargs:
-            self.border_color = kwargs['border_color']
+            self.border_color = self._color_overrides['border_color'] = kwargs['border_color']
         if 'rounded_radius' in kwargs:
             self.rounded_radius = kwargs['rounded_radius']
         
-        self._render()
+        self.canvas.invalidate()
     
     def place_content(self, widget, relx=0.5, rely=0.5, anchor="center", **kwargs):
         """Place content inside the frame with proper positioning"""
@@ -1,13 +1,16 @@
 import tkinter as tk
 import math
+from .BTkCanvasWidget import BTkCanvasWidget
+from .BTkTheme import get_theme, subscribe, set_background, parent_background
 
-class BTkLabel(tk.Canvas):
+class BTkLabel(BTkCanvasWidget):
     """Modern BetterTkinter label component"""
     
     # Constants
     DEFAULT_FONT = "Segoe UI"
     DEFAULT_WIDTH = 200
     DEFAULT_HEIGHT = 32
+    COLOR_OPTIONS = ('text_color', 'hover_color')
     
     def __init__(self, parent, text="Label", **kwargs):
         # Store parent reference
@@ -25,10 +28,11 @@ class BTkLabel(tk.Canvas):
         self.font_weight = kwargs.get('font_weight', "normal")
         self.font_tuple = (self.font_family, self.font_size, self.font_weight)
         
-        # Colors
+        # Colors from the current theme, keeping given colors
         self.bg_color = kwargs.get('bg_color', None)  # Transparent by default
-        self.text_color = kwargs.get('text_color', "#333333")
         self.border_color = kwargs.get('border_color', None)
+        self._color_overrides = {key: kwargs[key] for key in self.COLOR_OPTIONS if key in kwargs}
+        self._apply_palette(get_theme().widget_palette("label"))
         
         # Alignment
         self.text_anchor = kwargs.get('anchor', "center")  # "w", "center", "e"
@@ -39,7 +43,8 @@ class BTkLabel(tk.Canvas):
             self.width = self._calculate_text_width() + 20
         
         # Get parent background if no bg_color specified
-        if self.bg_color is None:
+        self._inherit_bg = self.bg_color is None
+        if self._inherit_bg:
             self.bg_color = self._get_parent_bg(parent)
         
         # Initialize canvas
@@ -52,15 +57,30 @@ class BTkLabel(tk.Canvas):
         
         # State
         self._hover_enabled = kwargs.get('hover_enabled', False)
-        self._hover_color = kwargs.get('hover_color', "#F8F9FA")
         self._hovered = False
         self._clickable = kwargs.get('clickable', False)
         self._command = kwargs.get('command', None)
         
         # Render and bind events
-        self._render()
+        self.redraw()
         if self._hover_enabled or self._clickable:
             self._bind_events()
+        
+        # Follow theme changes
+        subscribe(self)
+    
+    def _apply_palette(self, palette):
+        """Take colors from a theme palette except the overridden ones"""
+        for key, value in palette.items():
+            setattr(self, key, self._color_overrides.get(key, value))
+    
+    def apply_theme(self, theme, batch=None):
+        """Recolor for a new theme in place, without a redraw"""
+        self._apply_palette(theme.widget_palette("label"))
+        if self._inherit_bg:
+            self.bg_color = parent_background(self)
+            set_background(self, self.bg_color, batch)
+        self.refresh_options(batch)
     
     def _get_parent_bg(self, parent):
         """Get parent background color"""
@@ -78,41 +98,21 @@ class BTkLabel(tk.Canvas):
         temp.destroy()
         return max(width, 50)  # Minimum width
     
-    def _render(self):
-        """Render label"""
-        self.delete("all")
+    def describe_items(self):
+        """Describe the hover background, border and text lines for the current state"""
+        items = {}
         
-        # Draw background if hovered
-        if self._hovered and self._hover_enabled:
-            self._draw_background()
+        # Background for hover effect
+        if self._hover_enabled:
+            items["background"] = ("rectangle", (2, 2, self.width-2, self.height-2),
+                                   {"fill": self.hover_color, "outline": "", "tags": "background",
+                                    "state": "normal" if self._hovered else "hidden"})
         
-        # Draw border if specified
+        # Border if specified
         if self.border_color:
-            self._draw_border()
+            items["border"] = ("rectangle", (1, 1, self.width-1, self.height-1),
+                               {"outline": self.border_color, "width": 1, "fill": "", "tags": "border"})
         
-        # Draw text
-        self._draw_text()
-    
-    def _draw_background(self):
-        """Draw background for hover effect"""
-        radius = 4
-        
-        # Simple rounded rectangle
-        self.create_rectangle(2, 2, self.width-2, self.height-2,
-                            fill=self._hover_color,
-                            outline="",
-                            tags="background")
-    
-    def _draw_border(self):
-        """Draw border around label"""
-        self.create_rectangle(1, 1, self.width-1, self.height-1,
-                            outline=self.border_color,
-                            width=1,
-                            fill="",
-                            tags="border")
-    
-    def _draw_text(self):
-        """Draw text content"""
         # Calculate text position based on anchor
         if self.text_anchor == "w":
             x = 10
@@ -124,33 +124,19 @@ class BTkLabel(tk.Canvas):
             x = self.width // 2
             anchor = "center"
         
-        y = self.height // 2
-        
-        # Handle multiline text
+        # One text item per line
         lines = self.text.split('\n')
-        
+        line_height = self.font_size + 4
         if len(lines) == 1:
-            # Single line
-            self.create_text(x, y,
-                           text=self.text,
-                           fill=self.text_color,
-                           font=self.font_tuple,
-                           anchor=anchor,
-                           tags="text")
+            start_y = self.height // 2
         else:
-            # Multiple lines
-            line_height = self.font_size + 4
-            total_height = len(lines) * line_height
-            start_y = (self.height - total_height) // 2 + line_height // 2
-            
-            for i, line in enumerate(lines):
-                line_y = start_y + (i * line_height)
-                self.create_text(x, line_y,
-                               text=line,
-                               fill=self.text_color,
-                               font=self.font_tuple,
-                               anchor=anchor,
-                               tags="text")
+            start_y = (self.height - len(lines) * line_height) // 2 + line_height // 2
+        
+        for i, line in enumerate(lines):
+            items[f"text_{i}"] = ("text", (x, start_y + i * line_height),
+                                  {"text": line, "fill": self.text_color, "font": self.font_tuple,
+                                   "anchor": anchor, "tags": "text"})
+        return items
     
     def _bind_events(self):
         """Bind mouse events"""
@@ -166,13 +152,13 @@ class BTkLabel(tk.Canvas):
         """Handle mouse enter"""
         if self._hover_enabled:
             self._hovered = True
-            self._render()
+            self.invalidate()
     
     def _on_leave(self, event=None):
         """Handle mouse leave"""
         if self._hover_enabled:
             self._hovered = False
-            self._render()
+            self.invalidate()
     
     def _on_click(self, event=None):
         """Handle click event"""
@@ -197,11 +183,12 @@ class BTkLabel(tk.Canvas):
             redraw_needed = True
         
         if 'text_color' in kwargs:
-            self.text_color = kwargs['text_color']
+            self.text_color = self._color_overrides['text_color'] = kwargs['text_color']
             redraw_needed = True
         
         if 'bg_color' in kwargs:
             self.bg_color = kwargs['bg_color']
+            self._inherit_bg = False
             self.config(bg=self.bg_color)
             redraw_needed = True
         
@@ -221,7 +208,7 @@ class BTkLabel(tk.Canvas):
             redraw_needed = True
         
         if redraw_needed:
-            self._render()
+            self.invalidate()
     
     def set_text(self, text):
         """Set label text"""
@@ -0,0 +1,193 @@
+import os
+import mmap
+import bisect
+import threading
+from array import array
+
+class BTkMappedFile:
+    """Read-only, memory-mapped text file with a lazily built line index
+    
+    The index stores the cumulative newline count of each fixed-size block,
+    so building it is a byte count per block and takes a few bytes per
+    megabyte. Lines are located by bisecting the blocks and scanning inside
+    one block. Indexing runs on a background thread (start_indexing) and is
+    also done on demand when a line beyond the indexed part is requested.
+    """
+    
+    BLOCK_SIZE = 1 << 20
+    
+    def __init__(self, path, encoding="utf-8", block_size=None):
+        self.path = path
+        self.encoding = encoding
+        self.block_size = block_size or self.BLOCK_SIZE
+        
+        self._file = open(path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        if self.size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._map = b""  # Empty files cannot be mapped
+        
+        # Cumulative newline count at the end of each indexed block
+        self._block_lines = array("Q")
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+    
+    # Index
+    @property
+    def complete(self):
+        """Whether the whole file has been indexed"""
+        return len(self._block_lines) * self.block_size >= self.size
+    
+    @property
+    def indexed_bytes(self):
+        """Number of bytes covered by the line index"""
+        return min(len(self._block_lines) * self.block_size, self.size)
+    
+    @property
+    def line_count(self):
+        """Number of lines indexed so far (the total once complete)"""
+        return (self._block_lines[-1] if self._block_lines else 0) + 1
+    
+    def _index_block(self):
+        """Index the next block; returns False when there is nothing left"""
+        with self._lock:
+            if self._closed:
+                return False
+            blocks = self._block_lines
+            start = len(blocks) * self.block_size
+            if start >= self.size:
+                return False
+            count = self._map[start:start + self.block_size].count(b"\n")
+            blocks.append((blocks[-1] if blocks else 0) + count)
+            return True
+    
+    def start_indexing(self):
+        """Build the rest of the index on a background thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._index_all, daemon=True)
+            self._thread.start()
+    
+    def _index_all(self):
+        while self._index_block():
+            pass
+    
+    # Lookups
+    def line_offset(self, line):
+        """Get the byte offset where a 1-based line starts (clamped to the last line)"""
+        newlines = max(line, 1) - 1
+        blocks = self._block_lines
+        while (not blocks or blocks[-1] < newlines) and self._index_block():
+            pass
+        
+        index = bisect.bisect_left(blocks, newlines)
+        if index == len(blocks):
+            # Past the end: start of the last line
+            return self.line_start(self.size)
+        
+        before = blocks[index - 1] if index else 0
+        position = index * self.block_size
+        for _ in range(newlines - before):
+            position = self._map.find(b"\n", position) + 1
+        return position
+    
+    def line_number(self, offset, wait=True):
+        """Get the 1-based line containing a byte offset
+        
+        With wait=False, None is returned when the index does not reach the
+        offset yet instead of indexing up to it.
+        """
+        offset = min(max(offset, 0), self.size)
+        index = offset // self.block_size
+        blocks = self._block_lines
+        while len(blocks) < index:
+            if not wait or not self._index_block():
+                return None
+        before = blocks[index - 1] if index else 0
+        return before + self._map[index * self.block_size:offset].count(b"\n") + 1
+    
+    def line_start(self, offset):
+        """Get the start of the line containing a byte offset"""
+        offset = min(max(offset, 0), self.size)
+        return self._map.rfind(b"\n", 0, offset) + 1
+    
+    def lines_before(self, offset, count):
+        """Get the start of the line count lines above the one containing offset"""
+        position = self.line_start(offset)
+        for _ in range(count):
+            if position == 0:
+                break
+            position = self._map.rfind(b"\n", 0, position - 1) + 1
+        return position
+    
+    def read_lines(self, offset, count):
+        """Read up to count lines starting at a line start
+        
+        Returns (offsets, text): offsets holds the start of every line read
+        plus the end of the last one; text is decoded and joined with "\\n".
+        """
+        offsets = [offset]
+        position = offset
+        for _ in range(count):
+            newline = self._map.find(b"\n", position)
+            if newline < 0:
+                position = self.size
+                break
+            position = newline + 1
+            offsets.append(position)
+        if offsets[-1] != position or position == offset:
+            offsets.append(position)
+        
+        end = offsets[-1]
+        data = self._map[offset:end].decode(self.encoding, errors="replace")
+        if data.endswith("\n"):
+            data = data[:-1]
+        return offsets, data.replace("\r\n", "\n")
+    
+    def finditer(self, pattern, start=0):
+        """Iterate over matches of a bytes regex in the file"""
+        return pattern.finditer(self._map, start)
+    
+    def decode(self, start, end):
+        """Decode the bytes between two offsets"""
+        return self._map[start:end].decode(self.encoding, errors="replace")
+    
+    def close(self):
+        """Stop indexing and unmap the file"""
+        with self._lock:
+            self._closed = True
+            if self.size:
+                self._map.close()
+            self._file.close()
+
+# Benchmark
+if __name__ == "__main__":
+    import tempfile
+    import time
+    
+    path = os.path.join(tempfile.gettempdir(), "btk_mapped_file_benchmark.log")
+    with open(path, "wb") as handle:
+        line = b"2024-01-01 12:00:00 INFO worker-7 processed request id=123456 in 12ms\n"
+        chunk = line * 100000
+        for _ in range(70):  # ~500 MB
+            handle.write(chunk)
+    
+    start = time.perf_counter()
+    mapped = BTkMappedFile(path)
+    offsets, text = mapped.read_lines(0, 2000)
+    print(f"open + first window: {(time.perf_counter() - start) * 1000:.1f} ms")
+    
+    start = time.perf_counter()
+    offset = mapped.line_offset(6000000)
+    offsets, text = mapped.read_lines(offset, 2000)
+    print(f"jump to line 6,000,000: {(time.perf_counter() - start) * 1000:.1f} ms "
+          f"(line {mapped.line_number(offset)})")
+    
+    start = time.perf_counter()
+    mapped.start_indexing()
+    mapped._thread.join()
+    print(f"full index: {mapped.line_count} lines in {(time.perf_counter() - start) * 1000:.1f} ms")
+    
+    mapped.close()
+    os.remove(path)
@@ -0,0 +1,249 @@
+import re
+import time
+import tkinter as tk
+from .BTkTextChange import BTkLineRanges
+
+_WORD_RUNS = re.compile(r"\S+")
+
+class BTkMinimap(tk.Canvas):
+    """Downsampled overview of a BTkTextEditor buffer
+    
+    The document is drawn into a PhotoImage with one pixel row per
+    lines_per_row lines; each row shows the non-blank runs of a few sampled
+    lines, colored by token class. Edits only re-render the edited rows:
+    added and removed lines are summed into a running offset, and the rows
+    below an edit are moved with an image copy each time that offset makes
+    up a whole row, so the rows below are never more than a row out of
+    place. Clicking or dragging scrolls the editor. Markers (search hits,
+    diagnostics) are drawn on top as canvas items.
+    """
+    
+    # Constants
+    WIDTH = 80
+    CHARS_PER_PIXEL = 2
+    SAMPLE_LINES = 3      # Lines sampled per pixel row
+    SLICE_MS = 6          # Render budget per idle slice
+    TEXT_COLOR = "#A0A0A0"
+    VIEWPORT_COLOR = "#0078D7"
+    
+    def __init__(self, parent, editor, **kwargs):
+        super().__init__(parent, width=self.WIDTH, bg=editor.bg_color,
+                         highlightthickness=0, **kwargs)
+        self.editor = editor
+        self.lines_per_row = 1
+        self.image = tk.PhotoImage(master=self, width=self.WIDTH, height=1)
+        self._scratch = tk.PhotoImage(master=self, width=self.WIDTH, height=1)
+        self.create_image(0, 0, image=self.image, anchor="nw")
+        self.viewport = self.create_rectangle(0, 0, self.WIDTH - 1, 0,
+                                              outline=self.VIEWPORT_COLOR)
+        
+        # Rows needing a render, and lines added or removed but not yet shifted
+        self._dirty = BTkLineRanges()
+        self._line_offset = 0
+        self._job = None
+        self._colors = {}
+        self._markers = {}
+        
+        editor.add_edit_listener(self._on_edit)
+        self.bind("<Configure>", self._on_configure)
+        self.bind("<Button-1>", self._on_click)
+        self.bind("<B1-Motion>", self._on_click)
+    
+    # Layout
+    @property
+    def height(self):
+        return max(self.winfo_height(), 1)
+    
+    def _rows_for(self, line_count):
+        """Get lines per row needed to fit line_count lines"""
+        return max(1, -(-line_count // self.height))
+    
+    def _on_configure(self, event=None):
+        """Resize the image and redraw everything for the new height"""
+        self.image.configure(width=self.WIDTH, height=self.height)
+        self._scratch.configure(width=self.WIDTH, height=self.height)
+        self.invalidate()
+    
+    def invalidate(self):
+        """Re-render the whole minimap (size, colors or line-to-row mapping changed)"""
+        self.lines_per_row = self._rows_for(self.editor._line_count())
+        self._colors = {}
+        self._dirty.clear()
+        self._line_offset = 0
+        self._dirty.add(0, self.height - 1)
+        self._redraw_markers()
+        self.update_viewport()
+        self._schedule()
+    
+    # Edits
+    def _on_edit(self, change):
+        """Mark the rows an edit touches; move the rows below it"""
+        if self.editor.large_file is not None:
+            return
+        per_row = self.lines_per_row
+        if change.is_full or self._rows_for(self.editor._line_count()) != per_row:
+            self.invalidate()
+            return
+        
+        first_row = (change.start_line - 1) // per_row
+        if change.line_delta:
+            # Shift the rows below by the whole rows the running offset makes up
+            self._line_offset += change.line_delta
+            shift = int(self._line_offset / per_row)
+            if shift:
+                self._line_offset -= shift * per_row
+                old_end_row = (change.start_line + change.removed_lines - 1) // per_row + 1
+                self._shift_rows(old_end_row, shift)
+                self._shift_dirty(old_end_row, shift)
+                if shift < 0:
+                    self._dirty.add(self.height + shift, self.height - 1)
+        
+        # Edited rows, in post-edit rows (added after the shift so they are not moved)
+        self._dirty.add(first_row, (change.start_line + change.added_lines - 1) // per_row)
+        
+        # Markers are placed by line and re-added by their owners (search,
+        # diagnostics) once they catch up with the edit, so they stay put here
+        self._schedule()
+    
+    def _shift_dirty(self, start_row, shift):
+        """Move dirty rows start_row.. along with the image rows"""
+        last_row = self.height - 1
+        shifted = BTkLineRanges()
+        for start, end in self._dirty:
+            if start < start_row:
+                shifted.add(start, min(end, start_row - 1))
+            if end >= start_row:
+                shifted.add(max(start, start_row) + shift, min(end + shift, last_row))
+        self._dirty = shifted
+    
+    def _shift_rows(self, start_row, shift):
+        """Move image rows start_row.. by shift rows (through a scratch image)"""
+        height = self.height
+        source_end = height - max(shift, 0)
+        if start_row >= source_end:
+            return
+        call = self.tk.call
+        call(self._scratch, "copy", self.image, "-from", 0, start_row, self.WIDTH, source_end,
+             "-to", 0, 0)
+        call(self.image, "copy", self._scratch, "-from", 0, 0, self.WIDTH, source_end - start_row,
+             "-to", 0, max(start_row + shift, 0))
+    
+    # Rendering
+    def _schedule(self, delay=None):
+        if self._job is None:
+            if delay is None:
+                self._job = self.after_idle(self._render_step)
+            else:
+                self._job = self.after(delay, self._render_step)
+    
+    def _render_step(self):
+        """Render dirty rows within the time slice"""
+        self._job = None
+        deadline = time.perf_counter() + self.SLICE_MS / 1000.0
+        while self._dirty and time.perf_counter() < deadline:
+            first, last = self._dirty.first()
+            last = min(last, first + 31)
+            self._render_rows(first, last)
+            self._dirty.remove(first, last)
+        
+        if self._dirty:
+            self._schedule(1)
+    
+    def _tag_colors(self):
+        """Get (and cache) the foreground color of each syntax tag"""
+        if not self._colors:
+            widget = self.editor.text_widget
+            for tag in self.editor.SYNTAX_TAGS:
+                self._colors[tag] = widget.tag_cget(tag, "foreground") or self.TEXT_COLOR
+        return self._colors
+    
+    def _render_rows(self, first_row, last_row):
+        """Render rows first_row..last_row with a single PhotoImage put"""
+        editor = self.editor
+        per_row = self.lines_per_row
+        line_count = editor._line_count()
+        first_line = first_row * per_row + 1
+        last_line = min((last_row + 1) * per_row, line_count)
+        background = editor.bg_color
+        width = self.WIDTH
+        blank = [background] * width
+        
+        lines = []
+        if first_line <= last_line:
+            lines = editor.text_widget.get(f"{first_line}.0", f"{last_line}.end").split("\n")
+        
+        colors = self._tag_colors() if editor.syntax_highlight else None
+        step = max(1, per_row // self.SAMPLE_LINES)
+        rows = []
+        for row in range(first_row, last_row + 1):
+            pixels = list(blank)
+            offset = row * per_row - first_row * per_row
+            for index in range(offset, min(offset + per_row, len(lines)), step):
+                self._render_line(pixels, lines[index], first_line + index, colors)
+            rows.append("{" + " ".join(pixels) + "}")
+        
+        self.tk.call(self.image, "put", " ".join(rows), "-to", 0, first_row)
+    
+    def _render_line(self, pixels, line, line_num, colors):
+        """Paint one line's non-blank runs, then its token colors, into a pixel row"""
+        scale = self.CHARS_PER_PIXEL
+        width = len(pixels)
+        line = line.expandtabs(4)
+        for run in _WORD_RUNS.finditer(line):
+            start = run.start() // scale
+            if start >= width:
+                break
+            end = min((run.end() - 1) // scale + 1, width)
+            pixels[start:end] = [self.TEXT_COLOR] * (end - start)
+        
+        if colors is None:
+            return
+        tokens, _ = self.editor.lexer.tokenize_line(line, self.editor._start_state(line_num))
+        for tag, start, end in tokens:
+            start //= scale
+            end = min((end - 1) // scale + 1, width)
+            if start < end:
+                pixels[start:end] = [colors.get(tag, self.TEXT_COLOR)] * (end - start)
+    
+    # Viewport and navigation
+    def update_viewport(self):
+        """Move the viewport frame to the lines shown in the editor"""
+        try:
+            first, last = self.editor.get_visible_lines()
+        except tk.TclError:
+            return
+        per_row = self.lines_per_row
+        self.coords(self.viewport, 0, (first - 1) // per_row,
+                    self.WIDTH - 1, max((last - 1) // per_row, (first - 1) // per_row + 2))
+    
+    def _on_click(self, event):
+        """Center the editor on the clicked row"""
+        first, last = self.editor.get_visible_lines()
+        line = max(event.y, 0) * self.lines_per_row + 1
+        top = max(line - (last - first) // 2, 1)
+        self.editor.text_widget.yview(f"{top}.0")
+    
+    # Markers (owned by the editor, see BTkTextEditor.add_markers)
+    def add_markers(self, kind, lines, color):
+        """Draw markers of one kind; one canvas item per pixel row"""
+        rows = self._markers.setdefault(kind, set())
+        per_row = self.lines_per_row
+        for line in lines:
+            row = (line - 1) // per_row
+            if row not in rows:
+                rows.add(row)
+                self.create_rectangle(self.WIDTH - 6, row, self.WIDTH, row + 2, fill=color,
+                                      outline="", tags=("marker", f"marker-{kind}"))
+        self.tag_raise(self.viewport)
+    
+    def clear_markers(self, kind):
+        """Remove all markers of one kind"""
+        self._markers.pop(kind, None)
+        self.delete(f"marker-{kind}")
+    
+    def _redraw_markers(self):
+        """Place all markers again after the line-to-row mapping changed"""
+        self._markers = {}
+        self.delete("marker")
+        for kind, (lines, color) in self.editor.markers.items():
+            self.add_markers(kind, lines, color)
@@ -0,0 +1,255 @@
+import sys
+import time
+import logging
+import threading
+from collections import deque
+
+class BTkNotificationBackend:
+    """Interface for delivering notifications to the user"""
+    
+    def send(self, title, message):
+        """Deliver one notification"""
+        raise NotImplementedError
+    
+    def close(self):
+        """Release backend resources"""
+        pass
+
+class BTkTrayNotificationBackend(BTkNotificationBackend):
+    """Delivers notifications through a BTkSystemTray icon (Windows only)"""
+    
+    def __init__(self, tray):
+        self.tray = tray
+        self.logger = logging.getLogger("BTkNotificationCenter.tray")
+    
+    def send(self, title, message):
+        """Deliver one notification via pystray"""
+        icon = self.tray.icon
+        if icon and sys.platform == 'win32':
+            icon.notify(message, title)
+            self.logger.info(f"Notification sent: {title} - {message}")
+        else:
+            self.logger.warning("Notifications not supported on this platform")
+
+class BTkMemoryNotificationBackend(BTkNotificationBackend):
+    """In-process stand-in backend that records notifications instead of showing them"""
+    
+    def __init__(self, max_history=None, clock=time.monotonic):
+        self.clock = clock
+        self.sent = deque(maxlen=max_history)
+        self.count = 0
+    
+    def send(self, title, message):
+        """Record one notification"""
+        self.sent.append({'title': title, 'message': message, 'time': self.clock()})
+        self.count += 1
+    
+    def clear(self):
+        """Forget recorded notifications"""
+        self.sent.clear()
+        self.count = 0
+
+class BTkNotificationCenter:
+    """Notification pipeline with per-key rate limiting, batching and priorities
+    
+    Notifications sharing a key are grouped. A group is delivered once it is
+    batch_interval old and its key has not been delivered for rate_limit
+    seconds; a group holding several notifications is delivered as one
+    summary. Ready groups go out highest priority first, at most
+    max_per_flush at a time.
+    """
+    
+    # Priorities
+    PRIORITY_LOW = -1
+    PRIORITY_NORMAL = 0
+    PRIORITY_HIGH = 1
+    
+    def __init__(self, backend=None, **kwargs):
+        """
+        Initialize notification center
+        
+        Args:
+            backend (BTkNotificationBackend, optional): Delivery backend,
+                defaults to an in-memory backend
+            rate_limit (float, optional): Minimum seconds between deliveries per key
+            batch_interval (float, optional): Seconds a group collects notifications
+            max_per_flush (int, optional): Maximum deliveries per flush
+            auto_flush (bool, optional): Flush from a timer thread; when False
+                the owner calls flush() itself
+            clock (callable, optional): Monotonic time source in seconds
+        """
+        self.logger = logging.getLogger("BTkNotificationCenter")
+        self.backend = backend or BTkMemoryNotificationBackend()
+        self.rate_limit = kwargs.get('rate_limit', 5.0)
+        self.batch_interval = kwargs.get('batch_interval', 0.5)
+        self.max_per_flush = kwargs.get('max_per_flush', 3)
+        self.auto_flush = kwargs.get('auto_flush', True)
+        self.clock = kwargs.get('clock', time.monotonic)
+        
+        # State
+        self._lock = threading.Lock()
+        self._groups = {}
+        self._last_sent = {}
+        self._sequence = 0
+        self._timer = None
+        
+        # Statistics
+        self.received = 0
+        self.delivered = 0
+        self.coalesced = 0
+    
+    def notify(self, title, message, key=None, priority=PRIORITY_NORMAL, summary=None):
+        """Queue a notification
+        
+        Args:
+            title (str): Notification title
+            message (str): Notification message
+            key (hashable, optional): Grouping and rate-limit key, defaults to title
+            priority (int, optional): Higher priorities are delivered first
+            summary (str, optional): Message used when notifications are batched,
+                formatted with {count}, {title} and {message}
+                (e.g. "{count} jobs finished")
+        """
+        if key is None:
+            key = title
+        
+        with self._lock:
+            now = self.clock()
+            self.received += 1
+            group = self._groups.get(key)
+            if group is None:
+                self._sequence += 1
+                self._groups[key] = {
+                    'title': title,
+                    'message': message,
+                    'summary': summary,
+                    'priority': priority,
+                    'count': 1,
+                    'created': now,
+                    'sequence': self._sequence,
+                }
+            else:
+                group['title'] = title
+                group['message'] = message
+                group['summary'] = summary or group['summary']
+                group['priority'] = max(group['priority'], priority)
+                group['count'] += 1
+                self.coalesced += 1
+            
+            self._schedule_flush(now)
+    
+    def _ready_time(self, key, group):
+        """Get the time a group may be delivered"""
+        return max(group['created'] + self.batch_interval,
+                   self._last_sent.get(key, float('-inf')) + self.rate_limit)
+    
+    def _compose(self, group):
+        """Get (title, message) for a group"""
+        if group['count'] == 1:
+            return group['title'], group['message']
+        
+        summary = group['summary'] or "{count} new notifications"
+        return group['title'], summary.format(count=group['count'],
+                                              title=group['title'],
+                                              message=group['message'])
+    
+    def flush(self, now=None):
+        """Deliver ready groups and return the number of notifications sent"""
+        with self._lock:
+            if now is None:
+                now = self.clock()
+            
+            # A manual flush replaces the pending timer (cancel is a no-op
+            # when this flush is that timer firing)
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            
+            ready = [(key, group) for key, group in self._groups.items()
+                     if self._ready_time(key, group) <= now]
+            ready.sort(key=lambda entry: (-entry[1]['priority'], entry[1]['sequence']))
+            ready = ready[:self.max_per_flush]
+            
+            outgoing = []
+            for key, group in ready:
+                del self._groups[key]
+                self._last_sent[key] = now
+                outgoing.append(self._compose(group))
+            
+            # Forget keys whose rate limit has expired
+            if len(self._last_sent) > len(self._groups) + self.max_per_flush:
+                expired = now - self.rate_limit
+                self._last_sent = {key: sent for key, sent in self._last_sent.items()
+                                   if sent > expired or key in self._groups}
+            
+            if self._groups:
+                self._schedule_flush(now)
+        
+        # Deliver outside the lock so a slow backend never blocks notify()
+        for title, message in outgoing:
+            try:
+                self.backend.send(title, message)
+                self.delivered += 1
+            except Exception as e:
+                self.logger.error(f"Error delivering notification: {e}")
+        
+        return len(outgoing)
+    
+    def _schedule_flush(self, now):
+        """Start the flush timer for the earliest ready group (lock held)"""
+        if not self.auto_flush or self._timer is not None or not self._groups:
+            return
+        
+        ready_at = min(self._ready_time(key, group) for key, group in self._groups.items())
+        delay = max(ready_at - now, 0.0)
+        if len(self._groups) > self.max_per_flush:
+            delay = max(delay, self.batch_interval)
+        
+        self._timer = threading.Timer(delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+    
+    @property
+    def pending(self):
+        """Number of notification groups waiting for delivery"""
+        return len(self._groups)
+    
+    def close(self):
+        """Stop the flush timer and close the backend"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self.backend.close()
+
+# Benchmark with the in-process backend
+if __name__ == "__main__":
+    def benchmark():
+        """Simulate a job farm finishing hundreds of jobs at once"""
+        backend = BTkMemoryNotificationBackend()
+        clock = [0.0]
+        center = BTkNotificationCenter(backend, auto_flush=False,
+                                       clock=lambda: clock[0])
+        
+        start = time.perf_counter()
+        for i in range(100000):
+            clock[0] = i * 0.0001
+            center.notify("Jobs", f"Job {i} finished", key="jobs",
+                          summary="{count} jobs finished")
+            if i % 300 == 0:
+                center.notify("Error", f"Job {i} failed",
+                              priority=BTkNotificationCenter.PRIORITY_HIGH)
+            if i % 1000 == 0:
+                center.flush()
+        
+        clock[0] += 60
+        while center.pending:
+            center.flush()
+        elapsed = time.perf_counter() - start
+        
+        print(f"{center.received} notifications -> {backend.count} delivered "
+              f"in {elapsed * 1000:.1f} ms")
+        for entry in list(backend.sent)[:5]:
+            print(f"  {entry['title']}: {entry['message']}")
+    
+    benchmark()
@@ -1,13 +1,17 @@
 import tkinter as tk
 import math
+from .BTkAnimator import BTkAnimator
+from .BTkCanvasWidget import BTkCanvasWidget
+from .BTkTheme import get_theme, subscribe, set_background, parent_background
 
-class BTkProgressBar(tk.Canvas):
+class BTkProgressBar(BTkCanvasWidget):
     """Modern BetterTkinter progress bar component"""
     
     # Constants
     DEFAULT_FONT = "Segoe UI"
     DEFAULT_WIDTH = 300
     DEFAULT_HEIGHT = 20
+    COLOR_OPTIONS = ('bg_color', 'progress_color', 'text_color', 'border_color')
     
     def __init__(self, parent, **kwargs):
         # Configuration
@@ -19,11 +23,9 @@ class BTkProgressBar(tk.Canvas):
         self.show_percentage = kwargs.get('show_percentage', True)
         self.show_text = kwargs.get('show_text', True)
         
-        # Colors
-        self.bg_color = kwargs.get('bg_color', "#E9ECEF")
-        self.progress_color = kwargs.get('progress_color', "#007BFF")
-        self.text_color = kwargs.get('text_color', "#333333")
-        self.border_color = kwargs.get('border_color', "#CED4DA")
+        # Colors from the current theme, keeping given colors
+        self._color_overrides = {key: kwargs[key] for key in self.COLOR_OPTIONS if key in kwargs}
+        self._apply_palette(get_theme().widget_palette("progress"))
         self.fg_color = kwargs.get('fg_color', "#007BFF")  # Alias for progress_color
         
         # Styling
@@ -33,7 +35,8 @@ class BTkProgressBar(tk.Canvas):
         
         # Animation
         self.animate_enabled = kwargs.get('animate', True)
-        self.animation_speed = kwargs.get('animation_speed', 10)  # ms
+        self.animation_speed = kwargs.get('animation_speed', 10)  # ms (unused: BTkAnimator sets the frame rate)
+        self.animation_duration = kwargs.get('animation_duration', 0.4)  # seconds
         
         # Initialize canvas
         super().__init__(parent,
@@ -46,11 +49,24 @@ class BTkProgressBar(tk.Canvas):
         # Animation state
         self._current_visual_value = self.value
         self._target_value = self.value
-        self._animation_id = None
         self.animation_offset = 0  # For gradient animation
         
         # Render initial state
-        self._render()
+        self.redraw()
+        
+        # Follow theme changes
+        subscribe(self)
+    
+    def _apply_palette(self, palette):
+        """Take colors from a theme palette except the overridden ones"""
+        for key, value in palette.items():
+            setattr(self, key, self._color_overrides.get(key, value))
+    
+    def apply_theme(self, theme, batch=None):
+        """Recolor for a new theme in place, without a redraw"""
+        self._apply_palette(theme.widget_palette("progress"))
+        set_background(self, parent_background(self), batch)
+        self.refresh_options(batch)
     
     def _get_parent_bg(self, parent):
         """Get parent background color"""
@@ -59,67 +75,36 @@ class BTkProgressBar(tk.Canvas):
         except (AttributeError, tk.TclError):
             return "#FFFFFF"
     
-    def _render(self):
-        """Render progress bar"""
-        self.delete("all")
-        
-        # Draw background
-        self._draw_background()
-        
-        # Draw progress
-        self._draw_progress()
-        
-        # Draw text if enabled
-        if self.show_text or self.show_percentage:
-            self._draw_text()
-    
-    def _draw_background(self):
-        """Draw progress bar background"""
-        # Simple rounded rectangle for background
-        self.create_rectangle(0, 0, self.width, self.height,
-                            fill=self.bg_color, outline=self.border_color, width=1)
-    
-    def _draw_progress(self):
-        """Draw progress fill"""
-        if self.value <= self.minimum:
-            return
-        
-        # Calculate progress width
+    def describe_items(self):
+        """Describe the background, progress fill and text for the current state"""
         progress_range = self.maximum - self.minimum
-        if progress_range <= 0:
-            return
-        
-        progress_ratio = (self.value - self.minimum) / progress_range
-        progress_width = max(0, min(self.width - 2, (self.width - 2) * progress_ratio))
         
-        if progress_width > 0:
-            # Draw progress fill
-            self.create_rectangle(1, 1, progress_width + 1, self.height - 1,
-                                fill=self.progress_color, outline="", width=0)
-    
-    def _draw_text(self):
-        """Draw progress text if enabled"""
-        if not (self.show_percentage or self.show_text):
-            return
-            
-        # Calculate percentage
-        progress_range = self.maximum - self.minimum
-        if progress_range <= 0:
-            percentage = 0
-        else:
-            percentage = ((self.value - self.minimum) / progress_range) * 100
-        
-        # Draw percentage text
-        if self.show_percentage:
-            text = f"{percentage:.0f}%"
-        else:
-            text = str(self.value)
-            
-        x = self.width // 2
-        y = self.height // 2
-        
-        self.create_text(x, y, text=text, font=(self.DEFAULT_FONT, 9, "normal"),
-                        fill=self.text_color, anchor="center")
+        # Progress fill width from the animated value
+        value = self._current_visual_value
+        progress_width = 0
+        if value > self.minimum and progress_range > 0:
+            progress_ratio = (value - self.minimum) / progress_range
+            progress_width = max(0, min(self.width - 2, (self.width - 2) * progress_ratio))
+        
+        items = {
+            "background": ("rectangle", (0, 0, self.width, self.height),
+                           {"fill": self.bg_color, "outline": self.border_color, "width": 1}),
+            "progress": ("rectangle", (1, 1, progress_width + 1, self.height - 1),
+                         {"fill": self.progress_color, "outline": "", "width": 0,
+                          "state": "normal" if progress_width > 0 else "hidden"}),
+        }
+        
+        # Progress text from the target value
+        if self.show_percentage or self.show_text:
+            if self.show_percentage:
+                percentage = ((self.value - self.minimum) / progress_range) * 100 if progress_range > 0 else 0
+                text = f"{percentage:.0f}%"
+            else:
+                text = str(self.value)
+            items["text"] = ("text", (self.width // 2, self.height // 2),
+                             {"text": text, "font": (self.DEFAULT_FONT, 9, "normal"),
+                              "fill": self.text_color, "anchor": "center"})
+        return items
     
     def set_value(self, value):
         """Set progress bar value"""
@@ -129,25 +114,20 @@ class BTkProgressBar(tk.Canvas):
         if self.animate_enabled:
             self._animate_to_value()
         else:
+            BTkAnimator.of(self).cancel(self, "value")
             self._current_visual_value = self.value
-            self._render()
+            self.invalidate()
     
     def _animate_to_value(self):
-        """Animate progress bar to target value"""
-        if abs(self._current_visual_value - self._target_value) < 0.5:
-            self._current_visual_value = self._target_value
-            self._render()
-            return
-        
-        # Calculate animation step
-        diff = self._target_value - self._current_visual_value
-        step = diff * 0.1  # 10% of remaining distance
+        """Animate progress bar to target value on the root's shared frame clock"""
+        start = self._current_visual_value
+        distance = self._target_value - start
         
-        self._current_visual_value += step
-        self._render()
+        def step(progress):
+            self._current_visual_value = start + distance * progress
+            self.redraw()
         
-        # Schedule next animation frame
-        self._animation_id = self.after(self.animation_speed, self._animate_to_value)
+        BTkAnimator.of(self).animate(self, self.animation_duration, step, key="value")
     
     def get_value(self):
         """Get current progress bar value"""
@@ -162,8 +142,10 @@ class BTkProgressBar(tk.Canvas):
         for key, value in kwargs.items():
             if hasattr(self, key):
                 setattr(self, key, value)
+                if key in self.COLOR_OPTIONS:
+                    self._color_overrides[key] = value
         
-        self._render()
+        self.invalidate()
 
 # Performance test
 if __name__ == "__main__":
@@ -1,11 +1,13 @@
 import tkinter as tk
 import math
+from .BTkCanvasWidget import BTkCanvasWidget
+from .BTkTheme import get_theme, subscribe, set_background, parent_background
 
-class BTkSlider(tk.Canvas):
+class BTkSlider(BTkCanvasWidget):
     def __init__(self, parent, from_=0, to=100, orientation="horizontal", command=None, 
-                 width=300, height=20, bg_color="#E0E0E0", fg_color="#0078D7", 
-                 handle_color="#FFFFFF", handle_size=20, border_radius=10, 
-                 handle_border_width=2, handle_border_color="#0078D7", **kwargs):
+                 width=300, height=20, bg_color=None, fg_color=None, 
+                 handle_color=None, handle_size=20, border_radius=10, 
+                 handle_border_width=2, handle_border_color=None, **kwargs):
         
         if orientation == "horizontal":
             super().__init__(parent, width=width, height=height, bg=parent.cget('bg'), 
@@ -18,13 +20,15 @@ class BTkSlider(tk.Canvas):
         self.to = to
         self.orientation = orientation
         self.command = command
-        self.bg_color = bg_color
-        self.fg_color = fg_color
-        self.handle_color = handle_color
         self.handle_size = handle_size
         self.border_radius = border_radius
         self.handle_border_width = handle_border_width
-        self.handle_border_color = handle_border_color
+        
+        # Colors from the current theme, keeping given colors
+        colors = {"bg_color": bg_color, "fg_color": fg_color,
+                  "handle_color": handle_color, "handle_border_color": handle_border_color}
+        self._color_overrides = {key: value for key, value in colors.items() if value is not None}
+        self._apply_palette(get_theme().widget_palette("slider"))
         
         self.value = from_
         self.dragging = False
@@ -34,37 +38,62 @@ class BTkSlider(tk.Canvas):
         self.bind("<Button-1>", self.on_click)
         self.bind("<B1-Motion>", self.on_drag)
         self.bind("<ButtonRelease-1>", self.on_release)
+        
+        # Follow theme changes
+        subscribe(self)
+    
+    def _apply_palette(self, palette):
+        """Take colors from a theme palette except the overridden ones"""
+        for key, value in palette.items():
+            setattr(self, key, self._color_overrides.get(key, value))
+    
+    def apply_theme(self, theme, batch=None):
+        """Recolor for a new theme in place, without a redraw"""
+        self._apply_palette(theme.widget_palette("slider"))
+        set_background(self, parent_background(self), batch)
+        self.refresh_options(batch)
     
     def draw_slider(self):
-        self.delete("all")
+        self.redraw()
         
-        if self.orientation == "horizontal":
-            # Draw track
-            track_y = self.winfo_reqheight() // 2
-            self.create_rounded_rect(0, track_y - 3, self.winfo_reqwidth(), track_y + 3, 
-                                   self.border_radius // 2, fill=self.bg_color, outline="")
+    def describe_items(self):
+        if self.orientation != "horizontal":
+            return {}
             
-            # Draw progress
-            progress_width = ((self.value - self.from_) / (self.to - self.from_)) * self.winfo_reqwidth()
-            self.create_rounded_rect(0, track_y - 3, progress_width, track_y + 3, 
-                                   self.border_radius // 2, fill=self.fg_color, outline="")
+        # Track
+        track_y = self.winfo_reqheight() // 2
+        track_width = self.winfo_reqwidth()
+        radius = self.border_radius // 2
             
-            # Draw handle
-            handle_x = progress_width
-            handle_y = track_y
-            self.create_oval(handle_x - self.handle_size//2, handle_y - self.handle_size//2,
-                           handle_x + self.handle_size//2, handle_y + self.handle_size//2,
-                           fill=self.handle_color, outline=self.handle_border_color, 
-                           width=self.handle_border_width, tags="handle")
+        # Progress
+        progress_width = ((self.value - self.from_) / (self.to - self.from_)) * track_width
         
-    def create_rounded_rect(self, x1, y1, x2, y2, radius, **kwargs):
+        # Handle
+        handle_x = progress_width
+        handle_y = track_y
+        half = self.handle_size // 2
+        
+        return {
+            "track": ("polygon", self.rounded_rect_points(0, track_y - 3, track_width, track_y + 3, radius),
+                      {"fill": self.bg_color, "outline": "", "smooth": True}),
+            "progress": ("polygon", self.rounded_rect_points(0, track_y - 3, progress_width, track_y + 3, radius),
+                         {"fill": self.fg_color, "outline": "", "smooth": True}),
+            "handle": ("oval", (handle_x - half, handle_y - half, handle_x + half, handle_y + half),
+                       {"fill": self.handle_color, "outline": self.handle_border_color,
+                        "width": self.handle_border_width, "tags": "handle"}),
+        }
+    
+    def rounded_rect_points(self, x1, y1, x2, y2, radius):
         points = []
         for x, y in [(x1, y1 + radius), (x1, y1), (x1 + radius, y1), 
                      (x2 - radius, y1), (x2, y1), (x2, y1 + radius),
                      (x2, y2 - radius), (x2, y2), (x2 - radius, y2),
                      (x1 + radius, y2), (x1, y2), (x1, y2 - radius)]:
             points.extend([x, y])
-        return self.create_polygon(points, smooth=True, **kwargs)
+        return points
+    
+    def create_rounded_rect(self, x1, y1, x2, y2, radius, **kwargs):
+        return self.create_polygon(self.rounded_rect_points(x1, y1, x2, y2, radius), smooth=True, **kwargs)
     
     def on_click(self, event):
         self.dragging = True
@@ -86,7 +115,7 @@ class BTkSlider(tk.Canvas):
         ratio = max(0, min(1, ratio))
         self.value = self.from_ + ratio * (self.to - self.from_)
         
-        self.draw_slider()
+        self.invalidate()
         
         if self.command:
             self.command(self.value)
@@ -96,7 +125,7 @@ class BTkSlider(tk.Canvas):
     
     def set(self, value):
         self.value = max(self.from_, min(self.to, value))
-        self.draw_slider()
+        self.invalidate()
     
     def set_value(self, value):
         """Alternative method name for setting value"""
@@ -0,0 +1,305 @@
+import os
+import re
+import mmap
+import hashlib
+import tempfile
+import threading
+
+class BTkSpellDictionary:
+    """Word list for spell checking: a memory-mapped sorted file plus a Bloom filter
+    
+    The word list (one word per line, any order) is lowercased, sorted and
+    written once to a cache file in the temp directory, which is then
+    memory-mapped and binary searched, so the words themselves stay out of
+    the Python heap. A Bloom filter (about 10 bits per word) rejects most
+    unknown words without touching the file. Loading runs on a background
+    thread (start_loading); check() treats every word as correct until the
+    dictionary is ready.
+    """
+    
+    DEFAULT_PATHS = ("/usr/share/dict/words", "/usr/dict/words")
+    # Letters with an optional apostrophe part; identifiers with "_" or digits are skipped
+    WORD_PATTERN = re.compile(r"\b[^\W\d_]{2,}(?:'[^\W\d_]+)?\b")
+    BLOOM_BITS_PER_WORD = 10
+    BLOOM_HASHES = 7
+    CACHE_SIZE = 20000     # Recently checked words remembered
+    SCAN_LIMIT = 50000     # Dictionary words compared per suggestion search
+    
+    def __init__(self, path=None):
+        if path is None:
+            path = next((candidate for candidate in self.DEFAULT_PATHS if os.path.exists(candidate)), None)
+        self.path = path
+        self.ready = False
+        self.word_count = 0
+        self.user_words = set()
+        
+        self._map = b""
+        self._file = None
+        self._bloom = None
+        self._bloom_bits = 0
+        self._cache = {}
+        self._thread = None
+    
+    # Loading
+    def start_loading(self):
+        """Load the dictionary on a background thread"""
+        if self._thread is None and self.path is not None:
+            self._thread = threading.Thread(target=self._load_safely, daemon=True)
+            self._thread.start()
+    
+    def _load_safely(self):
+        try:
+            self.load()
+        except OSError as e:
+            print(f"Spell checker error: could not load {self.path}: {e}")
+    
+    def _cache_path(self):
+        """Get the sorted cache file for the current version of the word list"""
+        stat = os.stat(self.path)
+        key = f"{os.path.abspath(self.path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        digest = hashlib.sha1(key.encode("utf-8", "surrogateescape")).hexdigest()[:16]
+        return os.path.join(tempfile.gettempdir(), f"btk_spell_{digest}.words")
+    
+    def load(self):
+        """Build (or reuse) the sorted cache file, map it and fill the Bloom filter"""
+        sorted_path = self._cache_path()
+        if not os.path.exists(sorted_path):
+            with open(self.path, "r", encoding="utf-8", errors="replace") as handle:
+                words = sorted({line.strip().lower() for line in handle if line.strip()})
+            data = "\n".join(words).encode("utf-8")
+            words = None
+            handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(sorted_path))
+            with os.fdopen(handle, "wb") as output:
+                output.write(data)
+            os.replace(temp_path, sorted_path)
+        
+        self._file = open(sorted_path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        
+        words = self._map[:].split(b"\n") if size else []
+        count = len(words)
+        bits = max(count * self.BLOOM_BITS_PER_WORD, 8192)
+        bloom = bytearray(bits // 8 + 1)
+        for word in words:
+            for position in self._bloom_positions(word, bits):
+                bloom[position >> 3] |= 1 << (position & 7)
+        self._bloom = bloom
+        self._bloom_bits = bits
+        self.word_count = count
+        self.ready = True
+    
+    def _bloom_positions(self, key, bits):
+        """Get the filter bit positions of a key (double hashing of one 64-bit hash)"""
+        value = hash(key) & 0xFFFFFFFFFFFFFFFF
+        low = value & 0xFFFFFFFF
+        high = (value >> 32) | 1
+        return [(low + i * high) % bits for i in range(self.BLOOM_HASHES)]
+    
+    # Lookups
+    def _in_file(self, key):
+        """Binary search the sorted file for a lowercase UTF-8 key"""
+        data = self._map
+        low, high = 0, len(data)
+        while low < high:
+            middle = (low + high) // 2
+            start = data.rfind(b"\n", 0, middle) + 1
+            end = data.find(b"\n", start)
+            if end < 0:
+                end = len(data)
+            word = data[start:end]
+            if word == key:
+                return True
+            if word < key:
+                low = end + 1
+            else:
+                high = start
+        return False
+    
+    def _known(self, word):
+        """Whether a lowercase word is in the dictionary"""
+        key = word.encode("utf-8", "surrogatepass")
+        bloom = self._bloom
+        for position in self._bloom_positions(key, self._bloom_bits):
+            if not bloom[position >> 3] & (1 << (position & 7)):
+                return False
+        return self._in_file(key)
+    
+    def check(self, word):
+        """Whether a word is spelled correctly (always True until loaded)"""
+        if not self.ready:
+            return True
+        lower = word.lower()
+        known = self._cache.get(lower)
+        if known is None:
+            known = lower in self.user_words or self._known(lower)
+            if len(self._cache) >= self.CACHE_SIZE:
+                self._cache.clear()
+            self._cache[lower] = known
+        return known
+    
+    def misspelled(self, text, start=0, end=None):
+        """Get (start, end) spans of misspelled words in text[start:end]
+        
+        camelCase words are treated as identifiers and not checked.
+        """
+        spans = []
+        check = self.check
+        for match in self.WORD_PATTERN.finditer(text, start, len(text) if end is None else end):
+            word = match.group()
+            if word[1:].islower() or word.isupper():
+                if not check(word):
+                    spans.append(match.span())
+        return spans
+    
+    def add_word(self, word):
+        """Accept a word for this session"""
+        lower = word.lower()
+        self.user_words.add(lower)
+        self._cache[lower] = True
+    
+    # Suggestions
+    def suggest(self, word, limit=8, max_distance=2):
+        """Get up to limit dictionary words within max_distance edits of word
+        
+        Single edits anywhere in the word are generated and looked up; the
+        words sharing its first letter (first two for longer words) are also
+        scanned, up to SCAN_LIMIT of them, with a bounded edit distance.
+        """
+        if not self.ready or not word:
+            return []
+        lower = word.lower()
+        found = {}
+        
+        for candidate in self._single_edits(lower):
+            if candidate not in found and self._known(candidate):
+                found[candidate] = 1
+        
+        data = self._map
+        initial = lower[:2 if len(lower) > 3 else 1].encode("utf-8", "surrogatepass")
+        position = self._lower_bound(initial)
+        for _ in range(self.SCAN_LIMIT):
+            if position >= len(data):
+                break
+            end = data.find(b"\n", position)
+            if end < 0:
+                end = len(data)
+            entry = data[position:end]
+            position = end + 1
+            if not entry.startswith(initial):
+                break
+            candidate = entry.decode("utf-8", "replace")
+            if abs(len(candidate) - len(lower)) > max_distance or candidate in found:
+                continue
+            distance = self._distance(lower, candidate, max_distance)
+            if distance <= max_distance:
+                found[candidate] = distance
+        found.pop(lower, None)
+        
+        ranked = sorted(found, key=lambda candidate: (found[candidate],
+                                                      -self._common_prefix(lower, candidate),
+                                                      candidate))
+        if word[:1].isupper():
+            ranked = [candidate.capitalize() for candidate in ranked]
+        return ranked[:limit]
+    
+    def _lower_bound(self, key):
+        """Get the offset of the first word in the file not less than key"""
+        data = self._map
+        low, high = 0, len(data)
+        result = len(data)
+        while low < high:
+            middle = (low + high) // 2
+            start = data.rfind(b"\n", 0, middle) + 1
+            end = data.find(b"\n", start)
+            if end < 0:
+                end = len(data)
+            if data[start:end] < key:
+                low = end + 1
+            else:
+                result = start
+                high = start
+        return result
+    
+    @staticmethod
+    def _single_edits(word):
+        letters = "abcdefghijklmnopqrstuvwxyz" + "".join(sorted(set(word) - set("abcdefghijklmnopqrstuvwxyz")))
+        splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+        for left, right in splits:
+            if right:
+                yield left + right[1:]
+                if len(right) > 1:
+                    yield left + right[1] + right[0] + right[2:]
+                for letter in letters:
+                    yield left + letter + right[1:]
+            for letter in letters:
+                yield left + letter + right
+    
+    @staticmethod
+    def _distance(first, second, limit):
+        """Edit distance with transpositions, or limit + 1 once it exceeds limit"""
+        previous2 = None
+        previous = list(range(len(second) + 1))
+        for i, char in enumerate(first, 1):
+            current = [i] + [0] * len(second)
+            for j, other in enumerate(second, 1):
+                cost = 0 if char == other else 1
+                value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+                if (previous2 is not None and i > 1 and j > 1
+                        and char == second[j - 2] and first[i - 2] == other):
+                    value = min(value, previous2[j - 2] + 1)
+                current[j] = value
+            if min(current) > limit:
+                return limit + 1
+            previous2, previous = previous, current
+        return previous[-1]
+    
+    @staticmethod
+    def _common_prefix(first, second):
+        length = 0
+        for a, b in zip(first, second):
+            if a != b:
+                break
+            length += 1
+        return length
+    
+    def close(self):
+        """Unmap the dictionary"""
+        self.ready = False
+        if self._file is not None:
+            if self._map:
+                self._map.close()
+            self._file.close()
+            self._file = None
+
+# Benchmark
+if __name__ == "__main__":
+    import time
+    import random
+    
+    random.seed(7)
+    path = os.path.join(tempfile.gettempdir(), "btk_spell_benchmark.txt")
+    syllables = ["ka", "lo", "mi", "ne", "ra", "to", "su", "vi", "de", "pa", "con", "ter", "ing", "ed"]
+    words = {"".join(random.choice(syllables) for _ in range(random.randint(2, 5))) for _ in range(400000)}
+    words.update(["spelling", "checker", "dictionary", "the", "quick", "brown", "fox"])
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write("\n".join(words))
+    
+    dictionary = BTkSpellDictionary(path)
+    start = time.perf_counter()
+    dictionary.load()
+    print(f"{dictionary.word_count} words loaded in {(time.perf_counter() - start) * 1000:.0f} ms, "
+          f"Bloom filter {len(dictionary._bloom) // 1024} KB")
+    
+    start = time.perf_counter()
+    sample = ["spelling", "speling", "dictionary", "dictionnary", "the", "teh"] * 1000
+    wrong = sum(not dictionary.check(word) for word in sample)
+    print(f"{len(sample)} checks in {(time.perf_counter() - start) * 1000:.1f} ms ({wrong} misspelled)")
+    
+    for word in ("speling", "dictionnary", "teh", "Chekcer"):
+        start = time.perf_counter()
+        print(f"{word}: {dictionary.suggest(word)[:4]} in {(time.perf_counter() - start) * 1000:.1f} ms")
+    cache_path = dictionary._cache_path()
+    dictionary.close()
+    os.remove(cache_path)
+    os.remove(path)
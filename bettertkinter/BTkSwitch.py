@@ -1,9 +1,14 @@
 import tkinter as tk
+from .BTkAnimator import BTkAnimator, ease_in_out
+from .BTkCanvasWidget import BTkCanvasWidget
+from .BTkTheme import get_theme, subscribe, set_background, parent_background
 
 class BTkSwitch(tk.Frame):
+    ANIMATION_SECONDS = 0.2
+    
     def __init__(self, parent, variable=None, command=None, width=50, height=25,
-                 bg_color_off="#CCCCCC", bg_color_on="#0078D7", 
-                 handle_color="#FFFFFF", border_width=1, border_color="#999999",
+                 bg_color_off=None, bg_color_on=None, 
+                 handle_color=None, border_width=1, border_color=None,
                  animated=True, **kwargs):
         super().__init__(parent, bg=parent.cget('bg'), **kwargs)
         
@@ -11,35 +16,53 @@ class BTkSwitch(tk.Frame):
         self.command = command
         self.width = width
         self.height = height
-        self.bg_color_off = bg_color_off
-        self.bg_color_on = bg_color_on
-        self.handle_color = handle_color
         self.border_width = border_width
-        self.border_color = border_color
+        
+        # Colors from the current theme, keeping given colors
+        colors = {"bg_color_off": bg_color_off, "bg_color_on": bg_color_on,
+                  "handle_color": handle_color, "border_color": border_color}
+        self._color_overrides = {key: value for key, value in colors.items() if value is not None}
+        self._apply_palette(get_theme().widget_palette("switch"))
         self.animated = animated
         
-        self.animation_steps = 0
-        self.animation_target = 0
+        self.animation_progress = None  # 0..1 while the handle moves
         
-        self.canvas = tk.Canvas(self, width=width, height=height, 
-                              bg=parent.cget('bg'), highlightthickness=0)
+        self.canvas = BTkCanvasWidget(self, describe=self.describe_items, width=width, height=height, 
+                                      bg=parent.cget('bg'), highlightthickness=0)
         self.canvas.pack()
         
         self.canvas.bind("<Button-1>", self.toggle)
         self.variable.trace_add("write", self.on_variable_change)
         
         self.draw_switch()
+        
+        # Follow theme changes
+        subscribe(self)
+    
+    def _apply_palette(self, palette):
+        """Take colors from a theme palette except the overridden ones"""
+        for key, value in palette.items():
+            setattr(self, key, self._color_overrides.get(key, value))
+    
+    def apply_theme(self, theme, batch=None):
+        """Recolor for a new theme in place, without a redraw"""
+        self._apply_palette(theme.widget_palette("switch"))
+        background = parent_background(self)
+        set_background(self, background, batch)
+        set_background(self.canvas, background, batch)
+        self.canvas.refresh_options(batch)
     
     def draw_switch(self):
-        self.canvas.delete("all")
+        self.canvas.redraw()
         
+    def describe_items(self):
         radius = self.height // 2
         
         # Get current state and position
         is_on = self.variable.get()
-        if self.animated and self.animation_steps > 0:
+        if self.animated and self.animation_progress is not None:
             # Animate between positions
-            progress = 1 - (self.animation_steps / 10)
+            progress = self.animation_progress
             if is_on:
                 handle_x = radius + progress * (self.width - 2 * radius)
                 bg_color = self.interpolate_color(self.bg_color_off, self.bg_color_on, progress)
@@ -55,22 +78,19 @@ class BTkSwitch(tk.Frame):
                 handle_x = radius
                 bg_color = self.bg_color_off
         
-        # Draw background track
-        self.canvas.create_oval(0, 0, self.height, self.height, 
-                              fill=bg_color, outline=self.border_color, 
-                              width=self.border_width)
-        self.canvas.create_oval(self.width - self.height, 0, self.width, self.height,
-                              fill=bg_color, outline=self.border_color, 
-                              width=self.border_width)
-        self.canvas.create_rectangle(radius, self.border_width, 
-                                   self.width - radius, self.height - self.border_width,
-                                   fill=bg_color, outline="")
-        
-        # Draw handle
+        # Background track
+        track = {"fill": bg_color, "outline": self.border_color, "width": self.border_width}
         handle_radius = radius - 3
-        self.canvas.create_oval(handle_x - handle_radius, radius - handle_radius,
-                              handle_x + handle_radius, radius + handle_radius,
-                              fill=self.handle_color, outline="#DDDDDD", width=1)
+        return {
+            "track_left": ("oval", (0, 0, self.height, self.height), track),
+            "track_right": ("oval", (self.width - self.height, 0, self.width, self.height), track),
+            "track_middle": ("rectangle", (radius, self.border_width,
+                                           self.width - radius, self.height - self.border_width),
+                             {"fill": bg_color, "outline": ""}),
+            "handle": ("oval", (handle_x - handle_radius, radius - handle_radius,
+                                handle_x + handle_radius, radius + handle_radius),
+                       {"fill": self.handle_color, "outline": "#DDDDDD", "width": 1}),
+        }
     
     def interpolate_color(self, color1, color2, factor):
         """Interpolate between two hex colors"""
@@ -95,13 +115,19 @@ class BTkSwitch(tk.Frame):
     
     def on_variable_change(self, *args):
         if self.animated:
-            self.animation_steps = 10
             self.animate_switch()
         else:
-            self.draw_switch()
+            self.canvas.invalidate()
     
     def animate_switch(self):
-        if self.animation_steps > 0:
-            self.animation_steps -= 1
-            self.draw_switch()
-            self.after(20, self.animate_switch)
+        """Slide the handle to the current state on the root's shared frame clock"""
+        BTkAnimator.of(self).animate(self, self.ANIMATION_SECONDS, self._animation_step,
+                                     easing=ease_in_out, on_done=self._animation_done,
+                                     key="switch")
+
+    def _animation_step(self, progress):
+        self.animation_progress = progress
+        self.draw_switch()
+    
+    def _animation_done(self):
+        self.animation_progress = None
@@ -2,7 +2,11 @@ import tkinter as tk
 import sys
 import os
 import logging
+import threading
+import time
+from collections import deque, OrderedDict
 from tkinter import messagebox
+from .BTkNotificationCenter import BTkNotificationCenter, BTkTrayNotificationBackend
 
 # Windows-specific imports
 try:
@@ -14,9 +18,19 @@ except ImportError:
     PYSTRAY_AVAILABLE = False
     logging.warning("pystray not available - system tray functionality disabled")
 
+# Marker for "no icon update waiting to be pushed"
+_NO_PENDING_STATE = object()
+
 class BTkSystemTray:
     """Windows system tray icon component for BetterTkinter applications"""
     
+    # Constants
+    ICON_SIZE = (64, 64)
+    BADGE_COLOR = "#DC3545"
+    MENU_DEFAULTS = {'text': 'Item', 'checked': None, 'enabled': True, 'visible': True}
+    MENU_EVAL_TIMEOUT = 0.2     # Seconds a tray menu read waits for the Tk thread
+    MENU_SNAPSHOT_REUSE = 0.1   # Seconds one evaluation serves the reads of a menu opening
+    
     def __init__(self, app_name="BetterTkinter App", **kwargs):
         """
         Initialize system tray icon
@@ -26,7 +40,28 @@ class BTkSystemTray:
             icon_path (str, optional): Path to custom icon file
             on_quit (callable, optional): Callback when quit is selected
             on_show (callable, optional): Callback when show is selected
-            menu_items (list, optional): Additional menu items
+            menu_items (list, optional): Additional menu items. Each item is
+                'SEPARATOR' or a dict with 'text', 'command', 'enabled',
+                'checked', 'visible' and 'submenu'. Any of 'text', 'enabled',
+                'checked' and 'visible' may be zero-argument callables, and
+                'submenu' may be a list of items or a callable returning one.
+                Callables are evaluated on the Tk thread whenever the tray
+                reads the menu (e.g. when it is opened), falling back to the
+                last values if the Tk thread does not answer within
+                MENU_EVAL_TIMEOUT. Without a Tk loop they are evaluated on
+                the thread calling update_menu() or invalidate_menu().
+            root_window (tk.Tk, optional): Window shown/hidden from the tray
+            dispatch_interval (int, optional): Poll interval in ms for tray callbacks
+            icon_renderer (callable, optional): Renders an icon variant as
+                icon_renderer(base_image, state) -> PIL.Image
+            icon_cache_size (int, optional): Number of rendered icon variants kept
+            max_icon_updates (float, optional): Maximum icon pushes per second
+            menu_refresh_interval (float, optional): Minimum seconds between
+                native menu refreshes requested with invalidate_menu()
+            notification_backend (BTkNotificationBackend, optional): Backend
+                for show_notification, defaults to the tray icon
+            notification_options (dict, optional): Options for the
+                BTkNotificationCenter (rate_limit, batch_interval, ...)
         """
         self.logger = logging.getLogger(f"BTkSystemTray.{app_name}")
         self.logger.info(f"Initializing system tray for {app_name}")
@@ -45,12 +80,43 @@ class BTkSystemTray:
         self.on_hide = kwargs.get('on_hide', self._default_hide)
         self.root_window = kwargs.get('root_window', None)
         self.custom_menu_items = kwargs.get('menu_items', [])
+        self.dispatch_interval = kwargs.get('dispatch_interval', 16)  # ms, ~one frame
+        self.icon_renderer = kwargs.get('icon_renderer', None)
+        self.icon_cache_size = kwargs.get('icon_cache_size', 32)
+        self.max_icon_updates = kwargs.get('max_icon_updates', 4)
+        self.menu_refresh_interval = kwargs.get('menu_refresh_interval', 1.0)
         
         # State
         self.icon = None
         self.is_visible = True
         self.is_running = False
         
+        # Tray callbacks posted from the pystray thread, drained by the Tk loop
+        self._dispatch_queue = deque()
+        self._dispatch_id = None
+        self._marshal_callbacks = False
+        
+        # Icon variants: base image loaded once, variants cached LRU by state key
+        self.icon_state = None
+        self._base_image = None
+        self._icon_cache = OrderedDict()
+        self._icon_lock = threading.Lock()
+        self._pending_icon_state = _NO_PENDING_STATE
+        self._last_icon_push = 0.0
+        self._icon_timer = None
+        
+        # Coalesced native menu refreshes
+        self._menu_lock = threading.Lock()
+        self._menu_refresh_timer = None
+        self._last_menu_refresh = 0.0
+        self._menu_snapshot = {}    # item path -> evaluated texts, states and submenus
+        self._snapshot_checked = 0.0
+        self._tk_thread = threading.current_thread()
+        
+        # Notification pipeline
+        backend = kwargs.get('notification_backend') or BTkTrayNotificationBackend(self)
+        self.notifications = BTkNotificationCenter(backend, **kwargs.get('notification_options', {}))
+        
         # Create icon
         try:
             self._create_icon()
@@ -62,16 +128,8 @@ class BTkSystemTray:
     def _create_icon(self):
         """Create the system tray icon"""
         try:
-            # Load or create icon image
-            if self.icon_path and os.path.exists(self.icon_path):
-                self.logger.info(f"Loading custom icon from {self.icon_path}")
-                image = Image.open(self.icon_path)
-            else:
-                self.logger.info("Creating default icon")
-                image = self._create_default_icon()
-            
-            # Resize to standard tray icon size
-            image = image.resize((64, 64), Image.Resampling.LANCZOS)
+            # Base icon variant (loaded and resized once, then cached)
+            image = self._get_icon_variant(self.icon_state)
             
             # Create menu
             menu = self._create_menu()
@@ -90,6 +148,141 @@ class BTkSystemTray:
             self.logger.error(f"Error creating system tray icon: {e}")
             raise
     
+    def _load_base_image(self):
+        """Load or create the base icon image, resized once to the tray size"""
+        if self._base_image is None:
+            if self.icon_path and os.path.exists(self.icon_path):
+                self.logger.info(f"Loading custom icon from {self.icon_path}")
+                image = Image.open(self.icon_path)
+            else:
+                self.logger.info("Creating default icon")
+                image = self._create_default_icon()
+            
+            # Resize to standard tray icon size
+            self._base_image = image.convert('RGBA').resize(self.ICON_SIZE, Image.Resampling.LANCZOS)
+        
+        return self._base_image
+    
+    @staticmethod
+    def _icon_state_key(state):
+        """Get a hashable cache key for an icon state"""
+        if isinstance(state, dict):
+            return tuple(sorted(state.items()))
+        if isinstance(state, list):
+            return tuple(state)
+        return state
+    
+    def _get_icon_variant(self, state):
+        """Get the rendered icon for a state, rendering it only on a cache miss"""
+        key = self._icon_state_key(state)
+        cache = self._icon_cache
+        
+        image = cache.get(key)
+        if image is not None:
+            cache.move_to_end(key)
+            return image
+        
+        base = self._load_base_image()
+        if self.icon_renderer:
+            image = self.icon_renderer(base.copy(), state)
+        else:
+            image = self._render_icon_state(base, state)
+        
+        cache[key] = image
+        while len(cache) > max(1, self.icon_cache_size):
+            cache.popitem(last=False)
+        
+        self.logger.debug(f"Rendered icon variant for state {state!r}")
+        return image
+    
+    def _render_icon_state(self, base, state):
+        """Default variant renderer
+        
+        None draws the plain icon, an int draws a count badge, a str draws a
+        status dot in that color, and a dict may combine 'badge' and 'color'.
+        """
+        if state is None:
+            return base
+        
+        if isinstance(state, dict):
+            badge = state.get('badge')
+            color = state.get('color')
+        elif isinstance(state, str):
+            badge, color = None, state
+        else:
+            badge, color = state, None
+        
+        image = base.copy()
+        draw = ImageDraw.Draw(image)
+        width, height = image.size
+        
+        # Status dot (bottom right)
+        if color:
+            size = width // 3
+            draw.ellipse([width - size - 2, height - size - 2, width - 2, height - 2],
+                        fill=color, outline='white', width=2)
+        
+        # Count badge (top right)
+        if badge:
+            text = "99+" if badge > 99 else str(badge)
+            size = width // 2 if len(text) > 1 else width * 2 // 5
+            draw.ellipse([width - size, 0, width - 1, size - 1],
+                        fill=self.BADGE_COLOR, outline='white', width=2)
+            try:
+                from PIL import ImageFont
+                font = ImageFont.load_default()
+                bbox = draw.textbbox((0, 0), text, font=font)
+                text_width = bbox[2] - bbox[0]
+                text_height = bbox[3] - bbox[1]
+                x = width - size + (size - text_width) // 2 - bbox[0]
+                y = (size - text_height) // 2 - bbox[1]
+                draw.text((x, y), text, fill='white', font=font)
+            except (ImportError, AttributeError):
+                draw.text((width - size + 4, size // 4), text, fill='white')
+        
+        return image
+    
+    def update_icon(self, state=None):
+        """Show a new icon state (badge count, status color, or custom renderer state)
+        
+        Each state is rendered once and cached. Pushes to the tray are limited to
+        max_icon_updates per second; states arriving in between replace each other
+        and the latest one is pushed when the interval elapses.
+        """
+        with self._icon_lock:
+            self._pending_icon_state = state
+            if self._icon_timer is not None:
+                # A trailing push is already scheduled and will pick up this state
+                return
+            
+            interval = 1.0 / self.max_icon_updates if self.max_icon_updates else 0
+            delay = self._last_icon_push + interval - time.monotonic()
+            if delay > 0:
+                self._icon_timer = threading.Timer(delay, self._push_icon_update)
+                self._icon_timer.daemon = True
+                self._icon_timer.start()
+                return
+        
+        self._push_icon_update()
+    
+    def _push_icon_update(self):
+        """Push the latest pending icon state to pystray"""
+        with self._icon_lock:
+            self._icon_timer = None
+            state = self._pending_icon_state
+            if state is _NO_PENDING_STATE:
+                return
+            self._pending_icon_state = _NO_PENDING_STATE
+            self._last_icon_push = time.monotonic()
+            
+            try:
+                image = self._get_icon_variant(state)
+                self.icon_state = state
+                if self.icon:
+                    self.icon.icon = image
+            except Exception as e:
+                self.logger.error(f"Error updating icon: {e}")
+    
     def _create_default_icon(self):
         """Create a default icon if no custom icon provided"""
         self.logger.debug("Creating default BTk system tray icon")
@@ -140,34 +333,237 @@ class BTkSystemTray:
         # Show/Hide option
         if self.root_window:
             menu_items.extend([
-                item('Show', self._show_window, default=True),
-                item('Hide', self._hide_window),
+                item('Show', self._tk_callback(self._show_window), default=True),
+                item('Hide', self._tk_callback(self._hide_window)),
                 pystray.Menu.SEPARATOR,
             ])
         
-        # Custom menu items
-        for menu_item in self.custom_menu_items:
-            if isinstance(menu_item, dict):
-                menu_items.append(
-                    item(menu_item.get('text', 'Item'), 
-                        menu_item.get('command', lambda: None),
-                        enabled=menu_item.get('enabled', True))
-                )
-            elif menu_item == 'SEPARATOR':
-                menu_items.append(pystray.Menu.SEPARATOR)
+        # Custom menu items (properties are read from the menu snapshot when the
+        # menu is built, so same-shaped updates only need a refresh)
+        self._snapshot_menu()
+        for index, menu_item in enumerate(self.custom_menu_items):
+            entry = self._build_menu_entry(menu_item, (index,))
+            if entry is not None:
+                menu_items.append(entry)
         
         # Standard items
         if self.custom_menu_items:
             menu_items.append(pystray.Menu.SEPARATOR)
         
         menu_items.extend([
-            item('About', self._show_about),
-            item('Quit', self._quit_application)
+            item('About', self._tk_callback(self._show_about)),
+            item('Quit', self._tk_callback(self._quit_application))
         ])
         
         self.logger.debug(f"Created menu with {len(menu_items)} items")
         return pystray.Menu(*menu_items)
     
+    def _snapshot_menu(self):
+        """Evaluate callable menu texts, states and submenus on the calling (Tk) thread
+    
+        pystray reads menu properties on the tray thread; its getters have
+        this run on the Tk thread and return values from the snapshot, so
+        user callables such as lambda: var.get() never run off the Tk thread.
+        """
+        snapshot = {}
+        
+        def visit(specs, path):
+            for index, spec in enumerate(specs or ()):
+                if not isinstance(spec, dict):
+                    continue
+                key = path + (index,)
+                values = {}
+                for name, default in self.MENU_DEFAULTS.items():
+                    value = spec.get(name, default)
+                    try:
+                        values[name] = value() if callable(value) else value
+                    except Exception as e:
+                        self.logger.error(f"Error evaluating menu item {name}: {e}")
+                        values[name] = default
+                
+                submenu = spec.get('submenu')
+                if callable(submenu):
+                    try:
+                        submenu = list(submenu() or ())
+                    except Exception as e:
+                        self.logger.error(f"Error generating submenu: {e}")
+                        submenu = []
+                    values['submenu'] = submenu
+                visit(submenu, key)
+                snapshot[key] = values
+        
+        visit(self.custom_menu_items, ())
+        self._menu_snapshot = snapshot
+        self._snapshot_checked = time.monotonic()
+    
+    def _current_snapshot(self):
+        """Get the menu snapshot, re-evaluated on the Tk thread when the tray reads it
+        
+        The reads of one menu opening share one evaluation. If the Tk thread
+        is busy past MENU_EVAL_TIMEOUT, the last snapshot is used.
+        """
+        if (not self._marshal_callbacks or threading.current_thread() is self._tk_thread
+                or time.monotonic() - self._snapshot_checked < self.MENU_SNAPSHOT_REUSE):
+            return self._menu_snapshot
+        
+        evaluated = threading.Event()
+        def evaluate():
+            self._snapshot_menu()
+            evaluated.set()
+        self._post(evaluate)
+        if not evaluated.wait(self.MENU_EVAL_TIMEOUT):
+            self.logger.debug("Tk thread busy, tray menu shows the last evaluated values")
+            self._snapshot_checked = time.monotonic()
+        return self._menu_snapshot
+    
+    def _menu_value(self, path, key):
+        """Get the current value of the custom menu item at a path"""
+        values = self._current_snapshot().get(path)
+        return values.get(key) if values is not None else self.MENU_DEFAULTS.get(key)
+    
+    def _menu_command(self, path):
+        """Get the command of the custom menu item at a path from the current items
+        
+        Generated submenus are taken from the snapshot, which is what the
+        tray showed.
+        """
+        specs = self.custom_menu_items
+        spec = None
+        for depth, index in enumerate(path):
+            if depth:
+                submenu = spec.get('submenu')
+                specs = self._menu_snapshot.get(path[:depth], {}).get('submenu') if callable(submenu) else submenu
+            if not specs or index >= len(specs) or not isinstance(specs[index], dict):
+                return None
+            spec = specs[index]
+        return spec.get('command') if spec is not None else None
+    
+    def _run_menu_command(self, path, icon, menu_item):
+        """Run the current command of a clicked custom menu item (on the Tk thread)"""
+        command = self._menu_command(path)
+        if command is not None:
+            self._call_action(command, icon, menu_item)
+    
+    def _build_menu_entry(self, spec, path):
+        """Build a pystray menu entry whose properties are read from the menu snapshot"""
+        if spec == 'SEPARATOR':
+            return pystray.Menu.SEPARATOR
+        if not isinstance(spec, dict):
+            return None
+        
+        def prop(key):
+            return lambda menu_item: self._menu_value(path, key)
+        
+        submenu = spec.get('submenu')
+        if callable(submenu):
+            # Entries follow the submenu generated at the last snapshot
+            action = pystray.Menu(lambda: self._build_lazy_entries(path))
+        elif submenu is not None:
+            action = pystray.Menu(*[
+                entry for entry in (
+                    self._build_menu_entry(child, path + (i,))
+                    for i, child in enumerate(submenu))
+                if entry is not None
+            ])
+        else:
+            def action(icon, menu_item):
+                self._post(self._run_menu_command, path, icon, menu_item)
+        
+        return item(prop('text'), action,
+                    checked=prop('checked'),
+                    enabled=prop('enabled'),
+                    visible=prop('visible'))
+    
+    def _build_lazy_entries(self, path):
+        """Build entries for a generated submenu from the menu snapshot"""
+        entries = []
+        for index, spec in enumerate(self._menu_value(path, 'submenu') or ()):
+            entry = self._build_menu_entry(spec, path + (index,))
+            if entry is not None:
+                entries.append(entry)
+        return entries
+    
+    @classmethod
+    def _menu_shape(cls, specs):
+        """Get the structure of a custom menu, ignoring texts, states and commands"""
+        shape = []
+        for spec in specs or ():
+            if spec == 'SEPARATOR':
+                shape.append('separator')
+            elif isinstance(spec, dict):
+                submenu = spec.get('submenu')
+                if submenu is None:
+                    shape.append('item')
+                elif callable(submenu):
+                    shape.append('lazy')
+                else:
+                    shape.append(('submenu', cls._menu_shape(submenu)))
+        return tuple(shape)
+    
+    def _tk_callback(self, action):
+        """Wrap a menu action so it runs on the Tk thread instead of the tray thread"""
+        def handler(icon, menu_item):
+            self._post(self._call_action, action, icon, menu_item)
+        return handler
+    
+    @staticmethod
+    def _call_action(action, icon, menu_item):
+        """Call a menu action with the (icon, item) arguments it requires"""
+        code = getattr(action, '__code__', None)
+        if code is None:
+            return action()
+        # Defaulted parameters (e.g. lambda j=j: ...) are not filled in
+        argcount = (code.co_argcount - len(getattr(action, '__defaults__', None) or ())
+                    - (1 if hasattr(action, '__self__') else 0))
+        if argcount == 0:
+            return action()
+        elif argcount == 1:
+            return action(icon)
+        return action(icon, menu_item)
+    
+    def _post(self, callback, *args):
+        """Queue a callback for the Tk loop, or run it directly when no loop is attached"""
+        if not self._marshal_callbacks:
+            try:
+                callback(*args)
+            except Exception as e:
+                self.logger.error(f"Error in system tray callback: {e}")
+            return
+        
+        # deque.append is atomic, so the tray thread never takes a lock or touches Tk
+        self._dispatch_queue.append((callback, args))
+    
+    def _start_dispatcher(self):
+        """Start draining tray callbacks on the Tk thread (must be called from it)"""
+        if not self.root_window or self._dispatch_id is not None:
+            return
+        
+        self._marshal_callbacks = True
+        self._dispatch_id = self.root_window.after(self.dispatch_interval, self._dispatch_pending)
+        self.logger.debug(f"Tray callback dispatcher polling every {self.dispatch_interval} ms")
+    
+    def _dispatch_pending(self):
+        """Run all queued tray callbacks on the Tk thread"""
+        self._dispatch_id = None
+        queue = self._dispatch_queue
+        
+        while queue:
+            callback, args = queue.popleft()
+            try:
+                callback(*args)
+            except Exception as e:
+                self.logger.error(f"Error in system tray callback: {e}")
+        
+        # Keep polling while the tray can still post callbacks
+        if self.is_running or queue:
+            try:
+                self._dispatch_id = self.root_window.after(self.dispatch_interval, self._dispatch_pending)
+            except tk.TclError:
+                # Root window destroyed
+                self._marshal_callbacks = False
+        else:
+            self._marshal_callbacks = False
+    
     def _show_window(self, icon=None, item=None):
         """Show the main window"""
         try:
@@ -247,15 +643,19 @@ class BTkSystemTray:
             raise
     
     def run_detached(self):
-        """Start the system tray icon in a separate thread (non-blocking)"""
+        """Start the system tray icon in a separate thread (non-blocking)
+        
+        Must be called from the Tk thread: menu callbacks are then queued by the
+        tray thread and executed by the Tk loop, so no Tk call ever crosses threads.
+        """
         if not self.icon:
             self.logger.error("Cannot run detached - icon not created")
             raise RuntimeError("System tray icon not properly initialized")
         
         try:
-            import threading
             self.logger.info("Starting system tray icon in separate thread")
             self.is_running = True
+            self._start_dispatcher()
             
             def run_icon():
                 try:
@@ -273,6 +673,18 @@ class BTkSystemTray:
     
     def stop(self):
         """Stop the system tray icon"""
+        with self._icon_lock:
+            if self._icon_timer is not None:
+                self._icon_timer.cancel()
+                self._icon_timer = None
+        
+        with self._menu_lock:
+            if self._menu_refresh_timer is not None:
+                self._menu_refresh_timer.cancel()
+                self._menu_refresh_timer = None
+        
+        self.notifications.close()
+        
         if self.icon and self.is_running:
             try:
                 self.logger.info("Stopping system tray icon")
@@ -292,8 +704,21 @@ class BTkSystemTray:
                 self.logger.error(f"Error updating tooltip: {e}")
     
     def update_menu(self, menu_items):
-        """Update the context menu"""
+        """Update the context menu
+        
+        If the new items have the same structure as the current ones, the
+        changed texts, states and commands are picked up by the existing menu
+        and only a refresh is requested; otherwise the menu is rebuilt.
+        """
         try:
+            if self.icon and self._menu_shape(menu_items) == self._menu_shape(self.custom_menu_items):
+                if menu_items is not self.custom_menu_items and menu_items == self.custom_menu_items:
+                    self.logger.debug("System tray menu unchanged")
+                    return
+                self.custom_menu_items = menu_items
+                self.invalidate_menu()
+                return
+            
             self.custom_menu_items = menu_items
             menu = self._create_menu()
             if self.icon:
@@ -302,14 +727,64 @@ class BTkSystemTray:
         except Exception as e:
             self.logger.error(f"Error updating menu: {e}")
     
-    def show_notification(self, title, message):
-        """Show a system notification (Windows only)"""
+    def invalidate_menu(self):
+        """Mark dynamic menu contents as changed
+        
+        Cheap to call on every change: the native menu is refreshed at most once
+        per menu_refresh_interval, re-evaluating callable texts and states on
+        the Tk thread. Without a Tk loop they are evaluated right away on the
+        calling thread, and the delayed refresh only pushes those values.
+        """
+        if not self._marshal_callbacks:
+            self._snapshot_menu()
+        
+        with self._menu_lock:
+            if self._menu_refresh_timer is not None:
+                return
+            
+            delay = self._last_menu_refresh + self.menu_refresh_interval - time.monotonic()
+            if delay > 0:
+                self._menu_refresh_timer = threading.Timer(delay, self._refresh_menu_later)
+                self._menu_refresh_timer.daemon = True
+                self._menu_refresh_timer.start()
+                return
+        
+        self._refresh_menu(evaluate=self._marshal_callbacks)
+    
+    def _refresh_menu_later(self):
+        """Timer thread: refresh on the Tk thread, or push the last values without a Tk loop"""
+        if self._marshal_callbacks:
+            self._post(self._refresh_menu)
+        else:
+            self._refresh_menu(evaluate=False)
+    
+    def _refresh_menu(self, evaluate=True):
+        """Rebuild the native menu from the existing menu description"""
+        with self._menu_lock:
+            self._menu_refresh_timer = None
+            self._last_menu_refresh = time.monotonic()
+        
+        if self.icon:
+            try:
+                if evaluate:
+                    self._snapshot_menu()
+                self.icon.update_menu()
+                self.logger.debug("System tray menu refreshed")
+            except Exception as e:
+                self.logger.error(f"Error refreshing menu: {e}")
+    
+    def show_notification(self, title, message, key=None,
+                          priority=BTkNotificationCenter.PRIORITY_NORMAL, summary=None):
+        """Queue a system notification
+        
+        Notifications are rate limited per key (defaults to the title) and
+        batched, e.g. summary="{count} jobs finished" for a burst of job
+        notifications. The default backend delivers through the tray icon
+        (Windows only).
+        """
         try:
-            if self.icon and sys.platform == 'win32':
-                self.icon.notify(message, title)
-                self.logger.info(f"Notification sent: {title} - {message}")
-            else:
-                self.logger.warning("Notifications not supported on this platform")
+            self.notifications.notify(title, message, key=key,
+                                      priority=priority, summary=summary)
         except Exception as e:
             self.logger.error(f"Error showing notification: {e}")
     
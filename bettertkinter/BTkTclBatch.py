@@ -0,0 +1,217 @@
+import tkinter as tk
+
+# Runs a list of commands and returns the list of their results
+BATCH_PROC = "::btk_batch"
+BATCH_PROC_BODY = """
+    set results {}
+    foreach command $commands {
+        lappend results [{*}$command]
+    }
+    return $results
+"""
+
+# The same, but a failing command gives an empty result instead of an error
+LENIENT_PROC = "::btk_batch_lenient"
+LENIENT_PROC_BODY = """
+    set results {}
+    foreach command $commands {
+        if {[catch {{*}$command} result]} {
+            set result {}
+        }
+        lappend results $result
+    }
+    return $results
+"""
+
+class BTkTclItem:
+    """A canvas item created in a BTkTclBatch; id is set once the batch runs"""
+    
+    __slots__ = ('id',)
+    
+    def __init__(self):
+        self.id = None
+
+class BTkTclBatch:
+    """Canvas item commands collected and sent to Tcl in one call
+    
+    Each tkinter canvas method is a separate Python to Tcl round trip that
+    processes its options in Python first. A batch records create_item(),
+    coords(), itemconfigure(), delete(), tag_raise() and tag_lower() as a
+    list of commands, and run() hands the whole list to a small Tcl proc in
+    a single tk.call(). Arguments travel as Tcl objects, so nothing is
+    quoted or parsed from strings and numbers stay numbers. create_item()
+    returns a BTkTclItem, which later commands of the same batch accept as
+    an item; run() fills in the created ids (a command using an item not
+    created yet makes run() send the commands before it first). extend()
+    records other ready-made commands, such as ones for other canvases of
+    the same interpreter. With ignore_errors a failing command, for instance
+    on a destroyed widget, is skipped instead of stopping the batch.
+    """
+    
+    def __init__(self, canvas, ignore_errors=False):
+        self.canvas = canvas
+        self.ignore_errors = ignore_errors
+        self._path = str(canvas)
+        self._commands = []
+        self._created = []    # (command index, BTkTclItem)
+        self._waiting = []    # Indexes of commands using items of this batch
+    
+    def __len__(self):
+        return len(self._commands)
+    
+    def _add(self, command, items=()):
+        for item in items:
+            if isinstance(item, BTkTclItem) and item.id is None:
+                self._waiting.append(len(self._commands))
+                break
+        self._commands.append(command)
+    
+    @staticmethod
+    def _options(options):
+        # Skip None like tkinter does, and strip the "_" of names such as class_
+        words = []
+        for key, value in options.items():
+            if value is not None:
+                words.append("-" + (key[:-1] if key[-1] == "_" else key))
+                words.append(value)
+        return words
+    
+    @staticmethod
+    def _item(item):
+        return item.id if isinstance(item, BTkTclItem) and item.id is not None else item
+    
+    # Commands
+    def create_item(self, kind, *coords, **options):
+        """Record creating a canvas item of a type such as "rectangle" or "text" """
+        item = BTkTclItem()
+        self._created.append((len(self._commands), item))
+        self._commands.append((self._path, "create", kind) + tk._flatten(coords) + tuple(self._options(options)))
+        return item
+    
+    def coords(self, item, *coords):
+        self._add((self._path, "coords", self._item(item)) + tk._flatten(coords), (item,))
+    
+    def itemconfigure(self, item, **options):
+        self._add((self._path, "itemconfigure", self._item(item), *self._options(options)), (item,))
+    
+    def delete(self, *items):
+        self._add((self._path, "delete") + tuple(map(self._item, items)), items)
+    
+    def tag_raise(self, item, above=None):
+        items = (item,) if above is None else (item, above)
+        self._add((self._path, "raise") + tuple(map(self._item, items)), items)
+    
+    def tag_lower(self, item, below=None):
+        items = (item,) if below is None else (item, below)
+        self._add((self._path, "lower") + tuple(map(self._item, items)), items)
+    
+    def extend(self, commands):
+        """Record ready-made commands, tuples of words not using items of this batch"""
+        self._commands.extend(commands)
+    
+    def _call(self, commands):
+        """Run commands in one call and return their results"""
+        interpreter = self.canvas.tk
+        proc, body = (LENIENT_PROC, LENIENT_PROC_BODY) if self.ignore_errors else (BATCH_PROC, BATCH_PROC_BODY)
+        try:
+            results = interpreter.call(proc, commands)
+        except tk.TclError as e:
+            if not str(e).startswith(f'invalid command name "{proc}"'):
+                raise
+            interpreter.call("proc", proc, "commands", body)
+            results = interpreter.call(proc, commands)
+        return interpreter.splitlist(results) if isinstance(results, str) else results
+    
+    def run(self):
+        """Send the recorded commands and return the ids of the items created"""
+        commands, created, waiting = self._commands, self._created, self._waiting
+        self._commands, self._created, self._waiting = [], [], []
+        
+        start = 0
+        pending = iter(created)
+        next_created = next(pending, None)
+        for stop in waiting + [len(commands)]:
+            if stop > start:
+                results = self._call(commands[start:stop])
+                while next_created is not None and next_created[0] < stop:
+                    next_created[1].id = int(results[next_created[0] - start])
+                    next_created = next(pending, None)
+            if stop < len(commands):
+                commands[stop] = tuple(map(self._item, commands[stop]))
+            start = stop
+        return [item.id for _, item in created]
+
+# Benchmark
+if __name__ == "__main__":
+    import time
+    import random
+    
+    root = tk.Tk()
+    root.withdraw()
+    canvas = tk.Canvas(root, width=800, height=600)
+    
+    class Direct:
+        """The same commands as separate tkinter calls"""
+        def create_item(self, kind, *coords, **options):
+            return getattr(canvas, "create_" + kind)(*coords, **options)
+        
+        def run(self):
+            pass
+    
+    Direct.coords = staticmethod(canvas.coords)
+    Direct.itemconfigure = staticmethod(canvas.itemconfigure)
+    
+    # Inputs are prepared up front so only the canvas commands are timed
+    random.seed(1)
+    cells = [(x, y) for x in range(0, 200, 4) for y in range(0, 160, 4)]
+    colors = [[f"#{(x + hue) % 256:02x}{y % 256:02x}{(x * y + hue) % 256:02x}" for x, y in cells]
+              for hue in (0, 90)]
+    values = [f"{random.random():.4f}" for _ in range(600)]
+    series = [[[value for x in range(200) for value in (x * 4, random.uniform(0, 600))] for _ in range(20)]
+              for frame in range(11)]
+    
+    def gradient(target):
+        """Color area of 2,000 cells, created and then recolored for a new hue"""
+        items = [target.create_item("rectangle", x, y, x + 4, y + 4, fill=color, outline="")
+                 for (x, y), color in zip(cells, colors[0])]
+        target.run()
+        for item, color in zip(items, colors[1]):
+            target.itemconfigure(item, fill=color)
+        target.run()
+        return 2 * len(cells)
+    
+    def table(target):
+        """Table of 100 rows by 6 columns of rectangles and texts, then new values"""
+        texts = []
+        for row in range(100):
+            for column in range(6):
+                x, y = column * 100, row * 20
+                target.create_item("rectangle", x, y, x + 100, y + 20, fill="#FFFFFF", outline="#DEE2E6")
+                texts.append(target.create_item("text", x + 4, y + 10, text=values[len(texts)],
+                                                anchor="w", font=("Segoe UI", 9, "normal")))
+        target.run()
+        for text, value in zip(texts, reversed(values)):
+            target.itemconfigure(text, text=value)
+        target.run()
+        return 3 * len(texts)
+    
+    def chart(target):
+        """Line chart of 20 series by 200 points, created and then given new data 10 times"""
+        lines = [target.create_item("line", *data, fill="#007BFF", width=1) for data in series[0]]
+        target.run()
+        for frame in series[1:]:
+            for line, data in zip(lines, frame):
+                target.coords(line, *data)
+            target.run()
+        return len(series) * len(lines)
+    
+    for render in (gradient, table, chart):
+        timings = []
+        for target in (Direct(), BTkTclBatch(canvas)):
+            canvas.delete("all")
+            start = time.perf_counter()
+            count = render(target)
+            timings.append((time.perf_counter() - start) * 1e6 / count)
+        print(f"{render.__name__:9} direct {timings[0]:6.2f} us/command, batched {timings[1]:6.2f} us/command")
+    
+    root.destroy()
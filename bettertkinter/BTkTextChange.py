@@ -0,0 +1,139 @@
+class BTkTextChange:
+    """A single edit of a text widget, reported by BTkTextEditor to edit listeners
+    
+    Lines are 1-based buffer lines. The edit replaced lines start_line through
+    start_line + removed_lines with lines start_line through
+    start_line + added_lines. deleted and inserted hold the exact text when it
+    is known; both are None for edits Tk performs internally (undo/redo),
+    which are reported as a change of the whole buffer.
+    """
+    
+    __slots__ = ('start', 'start_line', 'removed_lines', 'added_lines', 'deleted', 'inserted')
+    
+    def __init__(self, start, removed_lines, added_lines, deleted=None, inserted=None):
+        self.start = start
+        self.start_line = int(start.split('.')[0])
+        self.removed_lines = removed_lines
+        self.added_lines = added_lines
+        self.deleted = deleted
+        self.inserted = inserted
+    
+    @property
+    def line_delta(self):
+        """Change in the number of buffer lines"""
+        return self.added_lines - self.removed_lines
+    
+    @property
+    def is_full(self):
+        """Whether the exact edit is unknown and the whole buffer should be rescanned"""
+        return self.deleted is None and self.inserted is None
+    
+    def __repr__(self):
+        return (f"BTkTextChange({self.start!r}, removed_lines={self.removed_lines}, "
+                f"added_lines={self.added_lines})")
+
+class BTkLineRanges:
+    """Sorted set of disjoint, inclusive line ranges (e.g. lines needing rework)
+    
+    Ranges follow buffer edits through shift(), so work queued before an edit
+    still points at the right lines afterwards.
+    """
+    
+    def __init__(self):
+        self.ranges = []
+    
+    def __bool__(self):
+        return bool(self.ranges)
+    
+    def __iter__(self):
+        return iter(self.ranges)
+    
+    def clear(self):
+        """Remove all ranges"""
+        self.ranges = []
+    
+    def add(self, first, last):
+        """Add lines first..last, merging with touching ranges"""
+        if last < first:
+            return
+        
+        merged = []
+        placed = False
+        for start, end in self.ranges:
+            if end + 1 < first:
+                merged.append((start, end))
+            elif last + 1 < start:
+                if not placed:
+                    merged.append((first, last))
+                    placed = True
+                merged.append((start, end))
+            else:
+                first = min(first, start)
+                last = max(last, end)
+        if not placed:
+            merged.append((first, last))
+        
+        self.ranges = merged
+    
+    def remove(self, first, last):
+        """Remove lines first..last"""
+        if last < first:
+            return
+        
+        remaining = []
+        for start, end in self.ranges:
+            if end < first or start > last:
+                remaining.append((start, end))
+                continue
+            if start < first:
+                remaining.append((start, first - 1))
+            if end > last:
+                remaining.append((last + 1, end))
+        
+        self.ranges = remaining
+    
+    def shift(self, change):
+        """Move ranges to follow a BTkTextChange
+        
+        Lines inside the edited block collapse onto the block's new extent;
+        lines after it move by the change's line delta.
+        """
+        if change.is_full:
+            return
+        
+        first = change.start_line
+        old_last = first + change.removed_lines
+        new_last = first + change.added_lines
+        delta = change.line_delta
+        
+        shifted = BTkLineRanges()
+        for start, end in self.ranges:
+            if end < first:
+                shifted.ranges.append((start, end))
+                continue
+            if start > old_last:
+                shifted.add(start + delta, end + delta)
+                continue
+            # Overlaps the edited block
+            shifted.add(min(start, first), new_last if end <= old_last else end + delta)
+        
+        self.ranges = shifted.ranges
+    
+    def first(self):
+        """Get the first range or None"""
+        return self.ranges[0] if self.ranges else None
+    
+    def intersect(self, first, last):
+        """Get the parts of the ranges inside lines first..last"""
+        return [(max(start, first), min(end, last))
+                for start, end in self.ranges
+                if end >= first and start <= last]
+    
+    def contains(self, line):
+        """Check whether a line is in any range"""
+        for start, end in self.ranges:
+            if start <= line <= end:
+                return True
+            if start > line:
+                break
+        return False
@@ -1,10 +1,59 @@
+import io
+import os
+import re
+import time
+import codecs
+import tempfile
+import queue
+import bisect
+import threading
 import tkinter as tk
 from tkinter import scrolledtext, font
+from .BTkTextChange import BTkTextChange, BTkLineRanges
+from .BTkLexers import BTkLexer, TOKEN_TAGS, get_lexer, get_lexer_for_filename
+from .BTkMappedFile import BTkMappedFile
+from .BTkTextSearch import BTkTextSearch
+from .BTkMinimap import BTkMinimap
+from .BTkUndoJournal import BTkUndoJournal, BTkUndoEdit
+from .BTkLineFollower import BTkLineFollower
+from .BTkFoldIndex import BTkFoldIndex
+from .BTkAnalysis import BTkAnalysisService, analyze_python
+from .BTkCompletionIndex import BTkCompletionIndex
+from .BTkSpellDictionary import BTkSpellDictionary
+from .BTkAutosaveJournal import BTkAutosaveJournal
+
+# Marker for lines whose tokenizer state has not been computed yet
+_UNKNOWN_STATE = object()
 
 class BTkTextEditor(tk.Frame):
+    # Constants
+    SYNTAX_TAGS = TOKEN_TAGS
+    HIGHLIGHT_SLICE_MS = 8       # Idle-time budget per highlighting slice
+    HIGHLIGHT_CHUNK_LINES = 200  # Lines fetched from the widget at a time
+    HIGHLIGHT_POLL_MS = 20       # Poll interval for background highlighting results
+    LARGE_FILE_WINDOW = 2000     # Lines kept in the widget when viewing a large file
+    SEARCH_RESTART_MS = 200      # Delay before re-running a search after edits
+    FILE_CHUNK_BYTES = 1 << 20   # Bytes read and decoded per chunk when loading
+    FILE_SLICE_MS = 12           # UI time per frame spent inserting or snapshotting
+    SAVE_CHUNK_LINES = 20000     # Lines copied from the widget per chunk when saving
+    FOLLOW_FRAME_MS = 16         # Interval between batched appends in follow mode
+    ANALYSIS_DELAY_MS = 500      # Typing pause before the buffer is analyzed
+    ANALYSIS_POLL_MS = 50        # Poll interval for analysis results
+    DIAGNOSTIC_COLOR = "#E04040"
+    COMPLETION_MIN_PREFIX = 2    # Typed characters before completions pop up by themselves
+    COMPLETION_ROWS = 10         # Completions shown at once
+    COMPLETION_CHUNK_LINES = 500 # Lines indexed at a time for completion
+    SPELL_POLL_MS = 200          # Poll interval while the spelling dictionary loads
+    SPELL_CHUNK_LINES = 50       # Lines spell checked at a time
+    SPELL_COLOR = "#E0A000"
+    
     def __init__(self, parent, width=600, height=400, bg_color="#FFFFFF", 
                  fg_color="#333333", font_family="Consolas", font_size=11,
-                 line_numbers=True, syntax_highlight=False, **kwargs):
+                 line_numbers=True, syntax_highlight=False, language="python",
+                 background_highlight_lines=5000, minimap=False,
+                 undo_bytes=32 * 1024 * 1024, code_folding=False,
+                 analysis=False, analyzer=None, completion=False,
+                 spell_check=False, spell_dictionary=None, **kwargs):
         super().__init__(parent, bg=parent.cget('bg'), **kwargs)
         
         self.width = width
@@ -14,7 +63,113 @@ class BTkTextEditor(tk.Frame):
         self.font_family = font_family
         self.font_size = font_size
         self.line_numbers = line_numbers
+        self.minimap = minimap
         self.syntax_highlight = syntax_highlight
+        self.background_highlight_lines = background_highlight_lines
+        self.lexer = self._resolve_lexer(language)
+        
+        # Edit tracking
+        self._edit_listeners = []
+        self._scroll_listeners = []
+        self._text_orig = None
+        
+        # Incremental highlighting state
+        self._line_states = []
+        self._highlight_dirty = BTkLineRanges()
+        self._highlight_job = None
+        self._highlight_viewport_pending = False
+        self._highlight_generation = 0
+        self._highlight_worker = None
+        self._highlight_poll_job = None
+        
+        # Line number gutter (pooled canvas items, redrawn on view changes)
+        self._gutter_items = []
+        self._gutter_digits = 0
+        self._gutter_job = None
+        
+        # Large file view (sliding window over a memory-mapped file)
+        self.large_file = None
+        self._window_offsets = []
+        self._window_first_line = None
+        self._window_job = None
+        
+        # Search (worker thread, only visible matches are tagged)
+        self.search = BTkTextSearch()
+        self._search_snapshot = None
+        self._search_total = 1
+        self._search_index = None
+        self._search_resume = None    # Offset to select the next match from once it streams in
+        self._match_lines = []
+        self._marker_rows = set()
+        self._search_job = None
+        self._search_tag_job = None
+        self._search_restart_job = None
+        
+        # Minimap and markers (search hits, diagnostics: kind -> (lines, color))
+        self.minimap_view = None
+        self.markers = {}
+        
+        # Files (streamed on worker threads)
+        self.file_path = None
+        self.file_encoding = "utf-8"
+        self.file_newline = "\n"
+        self._load_generation = 0
+        self._save_generation = 0
+        self._loading = False
+        
+        # Undo history (coalesced edits within a memory budget)
+        self.undo_journal = BTkUndoJournal(max_bytes=undo_bytes)
+        self._undoing = False
+        
+        # Follow mode (batched appends, oldest lines trimmed)
+        self.follower = None
+        self.follow_lines = 10000
+        self._follow_trimmed = 0
+        self._follow_job = None
+        
+        # Code folding (indentation/bracket index, folds are elided tags)
+        self.code_folding = code_folding
+        self.fold_index = BTkFoldIndex()
+        self._folds = set()
+        self._fold_count = 0
+        self._folded_cache = None
+        
+        # Background analysis (worker process, stale results dropped by buffer version)
+        self.analysis = analysis
+        self.analyzer = analyzer or analyze_python
+        self.analysis_service = None
+        self.buffer_version = 0
+        self.diagnostics = []
+        self.symbols = []
+        self._diagnostic_lines = []
+        self._analysis_job = None
+        self._analysis_poll_job = None
+        self._diagnostic_tag_job = None
+        self._outline_listeners = []
+        self.outline_panel = None
+        
+        # Word completion (index updated from edited lines at idle time)
+        self.completion = completion
+        self.completion_index = BTkCompletionIndex()
+        self.completion_popup = None
+        self._completion_list = None
+        self._completion_prefix = ""
+        self._completion_shown = False
+        self._completion_job = None
+        
+        # Spell checking (visible lines only, in idle slices; edits uncheck their lines)
+        self.spell_check = spell_check
+        self.spell_dictionary = spell_dictionary if isinstance(spell_dictionary, BTkSpellDictionary) else None
+        self._spell_source = spell_dictionary
+        self._owns_spell_dictionary = False    # Only a dictionary created here is closed on destroy
+        self._spell_checked = BTkLineRanges()
+        self._spell_state = None               # (lexer, line, start state) after the last checked chunk
+        self._spell_job = None
+        
+        # Autosave (edits appended to a crash-safe journal, see enable_autosave)
+        self.autosave = None
+        self._autosave_follows_file = False
+        self._autosave_temp_path = None    # Unique journal path reserved for an untitled buffer
         
         self.create_editor()
         
@@ -26,14 +181,16 @@ class BTkTextEditor(tk.Frame):
         # Create font
         self.editor_font = font.Font(family=self.font_family, size=self.font_size)
         
-        # Line numbers frame (if enabled)
+        self.gutter_font = font.Font(family=self.font_family, size=self.font_size - 1)
+        
+        # Line numbers frame (shown if enabled)
+        self.line_frame = tk.Frame(self.editor_frame, bg="#F0F0F0", width=50)
         if self.line_numbers:
-            self.line_frame = tk.Frame(self.editor_frame, bg="#F0F0F0", width=50)
             self.line_frame.pack(side="left", fill="y")
             
-            self.line_canvas = tk.Canvas(self.line_frame, bg="#F0F0F0", width=50,
-                                       highlightthickness=0)
-            self.line_canvas.pack(fill="both", expand=True)
+        self.line_canvas = tk.Canvas(self.line_frame, bg="#F0F0F0", width=50,
+                                   highlightthickness=0)
+        self.line_canvas.pack(fill="both", expand=True)
         
         # Text widget with scrollbar
         self.text_widget = scrolledtext.ScrolledText(
@@ -45,27 +202,77 @@ class BTkTextEditor(tk.Frame):
             selectbackground="#0078D7",
             selectforeground="white",
             wrap=tk.NONE,
-            undo=True,
-            maxundo=50
+            undo=False
         )
         self.text_widget.pack(fill="both", expand=True, side="right")
         
-        # Bind events
-        if self.line_numbers:
-            self.text_widget.bind("<KeyRelease>", self.update_line_numbers)
-            self.text_widget.bind("<Button-1>", self.update_line_numbers)
-            self.text_widget.bind("<MouseWheel>", self.on_mousewheel)
-            
-        if self.syntax_highlight:
-            self.text_widget.bind("<KeyRelease>", self.highlight_syntax)
+        # Report every edit with its line range to edit listeners
+        self._install_edit_hook()
+        self.add_edit_listener(self._on_highlight_edit)
+        self.add_edit_listener(self._on_undo_edit)
+        self.add_edit_listener(self._on_fold_edit)
+        self.add_edit_listener(self._on_analysis_edit)
+        self.add_edit_listener(self._on_completion_edit)
+        self.add_edit_listener(self._on_spell_edit)
+        self.add_edit_listener(self._on_autosave_edit)
+        
+        # Follow scrolling (gutter and newly visible lines are updated from here)
+        self.text_widget.configure(yscrollcommand=self._on_text_scroll)
+        
+        # Bind events (line count changes and rewrapping may not move the view)
+        self.add_edit_listener(self._on_gutter_edit)
+        self.add_edit_listener(self._on_search_edit)
+        self.text_widget.bind("<Configure>", self._schedule_line_numbers, add="+")
+        self.text_widget.bind("<Control-f>", self.show_search)
+        self.text_widget.bind("<<Undo>>", self.undo)
+        self.text_widget.bind("<<Redo>>", self.redo)
+        self.text_widget.bind("<Control-y>", self.redo)
+        self.line_canvas.bind("<Button-1>", self._on_gutter_click)
+        self.bind("<Destroy>", self._on_destroy, add="+")
+        self.text_widget.bind("<Control-space>", self.show_completion)
+        self.text_widget.bind("<KeyRelease>", self._on_completion_key, add="+")
+        self.text_widget.bind("<Button-1>", self.hide_completion, add="+")
+        for key in ("<Up>", "<Down>", "<Return>", "<Tab>", "<Escape>"):
+            self.text_widget.bind(key, self._on_completion_nav)
+        
+        # Find/replace panel and match markers
+        self.create_search_bar()
+        
+        # Minimap (if enabled)
+        if self.minimap:
+            self.minimap_view = BTkMinimap(self.editor_frame, self)
+            self.minimap_view.pack(side="right", fill="y", before=self.text_widget.frame)
             
         # Configure syntax highlighting tags
         if self.syntax_highlight:
             self.configure_syntax_tags()
+            self._reset_highlight()
+        
+        if self.code_folding:
+            self._reset_fold_index()
+        
+        # Diagnostics are underlined (with a colored squiggle where Tk supports it)
+        self.text_widget.tag_configure("diagnostic", underline=True)
+        try:
+            self.text_widget.tag_configure("diagnostic", underlinefg=self.DIAGNOSTIC_COLOR)
+        except tk.TclError:
+            pass
+        if self.analysis:
+            self._schedule_analysis()
+        if self.completion:
+            self._reset_completion_index()
+        
+        self.text_widget.tag_configure("misspelled", underline=True)
+        try:
+            self.text_widget.tag_configure("misspelled", underlinefg=self.SPELL_COLOR)
+        except tk.TclError:
+            pass
+        self.text_widget.tag_bind("misspelled", "<Button-3>", self._on_misspelled_menu)
+        if self.spell_check:
+            self._start_spell_check()
             
         # Initial line numbers
-        if self.line_numbers:
-            self.update_line_numbers()
+        self._schedule_line_numbers()
     
     def configure_syntax_tags(self):
         """Configure tags for basic syntax highlighting"""
@@ -84,85 +291,488 @@ class BTkTextEditor(tk.Frame):
         # Functions
         self.text_widget.tag_configure("function", foreground="#800080", font=(self.font_family, self.font_size, "bold"))
     
-    def highlight_syntax(self, event=None):
-        """Basic syntax highlighting for Python-like code"""
+    # Lexers
+    @staticmethod
+    def _resolve_lexer(language):
+        """Get a lexer from a BTkLexer, a registered language name or None (plain text)"""
+        if isinstance(language, BTkLexer):
+            return language
+        lexer = get_lexer(language) if language else None
+        if language and lexer is None:
+            print(f"Text editor error: unknown language '{language}'")
+        return lexer or BTkLexer()
+    
+    def set_lexer(self, language):
+        """Highlight with a BTkLexer or registered language name (e.g. "sql")"""
+        self.lexer = self._resolve_lexer(language)
+        if self.syntax_highlight:
+            self._reset_highlight()
+    
+    def set_lexer_for_file(self, filename):
+        """Pick the lexer registered for a file's extension (plain text if none)"""
+        self.lexer = get_lexer_for_filename(filename) or BTkLexer()
+        if self.syntax_highlight:
+            self._reset_highlight()
+    
+    # Edit tracking
+    def _install_edit_hook(self):
+        """Route the text widget's Tcl command through _text_proxy to observe edits"""
+        widget = self.text_widget
+        self._text_orig = widget._w + "_btk_orig"
+        self.tk.call("rename", widget._w, self._text_orig)
+        self.tk.createcommand(widget._w, self._text_proxy)
+        widget.bind("<Destroy>", self._remove_edit_hook, add="+")
+    
+    def _remove_edit_hook(self, event=None):
+        """Drop the proxy command when the text widget is destroyed"""
+        if event is not None and event.widget is not self.text_widget:
+            return
+        try:
+            self.tk.deletecommand(self.text_widget._w)
+        except tk.TclError:
+            pass
+    
+    def _text_proxy(self, *args):
+        """Forward a text widget command, reporting insert/delete/replace edits"""
+        call = self.tk.call
+        orig = self._text_orig
+        operation = args[0] if args else ""
+        
+        if operation == "insert" and len(args) >= 3:
+            start = self._clamp_index(args[1])
+            inserted = "".join(args[2::2])
+            result = call((orig,) + args)
+            change = BTkTextChange(start, 0, inserted.count("\n"), "", inserted)
+        elif operation == "delete" and len(args) in (2, 3):
+            start = self._clamp_index(args[1])
+            if len(args) == 3:
+                end = self._clamp_index(args[2])
+            else:
+                end = self._clamp_index(start + "+1c")
+            if call(orig, "compare", end, "<=", start):
+                return call((orig,) + args)
+            deleted = call(orig, "get", start, end)
+            result = call((orig,) + args)
+            change = BTkTextChange(start, deleted.count("\n"), 0, deleted, "")
+        elif operation == "replace" and len(args) >= 4:
+            start = self._clamp_index(args[1])
+            end = self._clamp_index(args[2])
+            deleted = call(orig, "get", start, end) if call(orig, "compare", end, ">", start) else ""
+            inserted = "".join(args[3::2])
+            result = call((orig,) + args)
+            change = BTkTextChange(start, deleted.count("\n"), inserted.count("\n"), deleted, inserted)
+        elif operation in ("insert", "delete", "edit"):
+            # Multi-range deletes and undo/redo: exact extent unknown, report the whole buffer
+            lines_before = self._line_count()
+            result = call((orig,) + args)
+            if operation == "edit" and (len(args) < 2 or args[1] not in ("undo", "redo")):
+                return result
+            change = BTkTextChange("1.0", lines_before - 1, self._line_count() - 1)
+        else:
+            return call((orig,) + args)
+        
+        self._notify_edit(change)
+        return result
+    
+    def _clamp_index(self, index):
+        """Normalize an index, clamped to the last editable position"""
+        call = self.tk.call
+        index = call(self._text_orig, "index", index)
+        if call(self._text_orig, "compare", index, ">", "end-1c"):
+            index = call(self._text_orig, "index", "end-1c")
+        return index
+    
+    def _line_count(self):
+        """Number of lines in the buffer"""
+        return int(self.tk.call(self._text_orig, "index", "end-1c").split(".")[0])
+    
+    def _notify_edit(self, change):
+        """Pass an edit to all edit listeners"""
+        for listener in list(self._edit_listeners):
+            try:
+                listener(change)
+            except Exception as e:
+                print(f"Text editor listener error: {e}")
+    
+    def add_edit_listener(self, callback):
+        """Call callback(BTkTextChange) after every edit of the text"""
+        self._edit_listeners.append(callback)
+    
+    def remove_edit_listener(self, callback):
+        """Stop reporting edits to callback"""
+        if callback in self._edit_listeners:
+            self._edit_listeners.remove(callback)
+    
+    def add_scroll_listener(self, callback):
+        """Call callback(first, last) with the visible fraction after every view change"""
+        self._scroll_listeners.append(callback)
+    
+    def remove_scroll_listener(self, callback):
+        """Stop reporting view changes to callback"""
+        if callback in self._scroll_listeners:
+            self._scroll_listeners.remove(callback)
+    
+    def get_visible_lines(self):
+        """Get (first, last) buffer lines currently shown in the text widget"""
+        widget = self.text_widget
+        first = int(widget.index("@0,0").split(".")[0])
+        last = int(widget.index(f"@0,{widget.winfo_height()}").split(".")[0])
+        return first, last
+    
+    def _on_text_scroll(self, first, last):
+        """Keep the scrollbar and gutter in sync and highlight newly exposed lines"""
+        if self.large_file is not None:
+            first, last = self._file_fractions()
+            self._schedule_window_check()
+        self.text_widget.vbar.set(first, last)
+        self._schedule_line_numbers()
+        if self.minimap_view is not None:
+            self.minimap_view.update_viewport()
+        if self.search.matches:
+            self._schedule_search_tags()
+        if self.diagnostics:
+            self._schedule_diagnostic_tags()
+        if self.spell_check:
+            self._schedule_spell_check()
+        if self.syntax_highlight and self._highlight_dirty:
+            self._schedule_highlight()
+        for listener in list(self._scroll_listeners):
+            listener(first, last)
+    
+    # Incremental syntax highlighting
+    def highlight_syntax(self, event=None, full=False):
+        """Highlight lines changed since the last pass (everything with full=True)
+        
+        Edits are tracked automatically, so this is only needed to force a
+        pass. Visible lines are highlighted first and the rest of the buffer
+        in idle-time slices.
+        """
+        if not self.syntax_highlight:
+            return
+        if full:
+            self._reset_highlight()
+        else:
+            self._schedule_highlight()
+    
+    def _reset_highlight(self):
+        """Forget all tokenizer state and re-highlight the whole buffer"""
+        line_count = self._line_count()
+        self._line_states = [_UNKNOWN_STATE] * line_count
+        self._highlight_dirty.clear()
+        self._highlight_dirty.add(1, line_count)
+        self._stop_background_highlight()
+        if self.background_highlight_lines and line_count >= self.background_highlight_lines:
+            self._start_background_highlight()
+        self._schedule_highlight()
+    
+    def _on_highlight_edit(self, change):
+        """Track lines whose highlighting is invalidated by an edit"""
+        if not self.syntax_highlight or self._loading:
+            return
+            
+        states = self._line_states
+        first = change.start_line
+        if (change.is_full or len(states) + change.line_delta != self._line_count()
+                or (self.background_highlight_lines
+                    and change.added_lines >= self.background_highlight_lines)):
+            self._reset_highlight()
+            return
+        
+        # Background results no longer match the buffer; finish incrementally
+        self._stop_background_highlight()
+        
+        # Edited block gets fresh states, following lines shift with it
+        states[first - 1:first + change.removed_lines] = [_UNKNOWN_STATE] * (change.added_lines + 1)
+        self._highlight_dirty.shift(change)
+        self._highlight_dirty.add(first, first + change.added_lines)
+        self._schedule_highlight()
+            
+    def _schedule_highlight(self):
+        """Run a highlighting pass at the next idle time, viewport first"""
+        self._highlight_viewport_pending = True
+        if self._highlight_job is None:
+            self._highlight_job = self.after_idle(self._highlight_step)
+        
+    def _cancel_highlight(self):
+        """Cancel a scheduled highlighting pass"""
+        if self._highlight_job is not None:
+            self.after_cancel(self._highlight_job)
+            self._highlight_job = None
+            
+    def _highlight_step(self):
+        """Highlight the viewport, then dirty lines until the time slice is used up"""
+        self._highlight_job = None
         if not self.syntax_highlight:
             return
             
-        content = self.text_widget.get("1.0", tk.END)
-        
-        # Clear previous tags
-        for tag in ["keyword", "string", "comment", "number", "function"]:
-            self.text_widget.tag_delete(tag)
-            
-        # Keywords
-        keywords = ["def", "class", "if", "else", "elif", "for", "while", "try", "except", "import", "from", "return", "break", "continue", "pass", "lambda", "with", "as", "yield", "global", "nonlocal", "assert", "del", "and", "or", "not", "in", "is", "True", "False", "None"]
-        
-        lines = content.split('\n')
-        for line_num, line in enumerate(lines, 1):
-            # Highlight keywords
-            words = line.split()
-            col = 0
-            for word in words:
-                word_start = line.find(word, col)
-                if word in keywords:
-                    start_pos = f"{line_num}.{word_start}"
-                    end_pos = f"{line_num}.{word_start + len(word)}"
-                    self.text_widget.tag_add("keyword", start_pos, end_pos)
-                col = word_start + len(word)
-            
-            # Highlight strings
-            import re
-            for match in re.finditer(r'(["\'])(?:(?=(\\?))\2.)*?\1', line):
-                start_pos = f"{line_num}.{match.start()}"
-                end_pos = f"{line_num}.{match.end()}"
-                self.text_widget.tag_add("string", start_pos, end_pos)
-            
-            # Highlight comments
-            comment_pos = line.find('#')
-            if comment_pos != -1:
-                start_pos = f"{line_num}.{comment_pos}"
-                end_pos = f"{line_num}.{len(line)}"
-                self.text_widget.tag_add("comment", start_pos, end_pos)
-            
-            # Highlight numbers
-            for match in re.finditer(r'\b\d+\.?\d*\b', line):
-                start_pos = f"{line_num}.{match.start()}"
-                end_pos = f"{line_num}.{match.end()}"
-                self.text_widget.tag_add("number", start_pos, end_pos)
+        if self._highlight_viewport_pending:
+            self._highlight_viewport_pending = False
+            self._highlight_viewport()
+        
+        # A worker thread is tokenizing the buffer; only the viewport is done here
+        if self._highlight_worker is not None:
+            return
+            
+        deadline = time.perf_counter() + self.HIGHLIGHT_SLICE_MS / 1000.0
+        dirty = self._highlight_dirty
+        while dirty and time.perf_counter() < deadline:
+            first, last = dirty.first()
+            chunk_last = first + self.HIGHLIGHT_CHUNK_LINES - 1
+            done, converged = self._highlight_lines(first, chunk_last, stop_after=last)
+            
+            dirty.remove(first, done)
+            if not converged and done >= last and done < len(self._line_states):
+                # End state changed, so the next line has to be rescanned too
+                dirty.add(done + 1, done + 1)
+        
+        # Finish off-screen lines in later slices, letting events through in between
+        if dirty:
+            self._highlight_job = self.after(1, self._highlight_step)
+    
+    def _highlight_viewport(self):
+        """Highlight dirty visible lines using the best known start state
+        
+        The lines stay dirty, so the background pass corrects them if an
+        earlier unfinished line turns out to change their state.
+        """
+        try:
+            first, last = self.get_visible_lines()
+        except tk.TclError:
+            return
+        for visible_first, visible_last in self._visible_ranges(first, last):
+            for start, end in self._highlight_dirty.intersect(visible_first, visible_last):
+                self._highlight_lines(start, end)
+    
+    def _highlight_lines(self, first, last, stop_after=None):
+        """Tokenize and tag lines first..last
+        
+        Stops at the first line at or after stop_after whose end state did not
+        change, since later lines cannot be affected. Returns (last line
+        processed, converged).
+        """
+        states = self._line_states
+        last = min(last, len(states))
+        if last < first:
+            return first - 1, True
+        
+        state = self._start_state(first)
+        
+        lines = self.text_widget.get(f"{first}.0", f"{last}.end").split("\n")
+        tokenize_line = self.lexer.tokenize_line
+        results = []
+        converged = False
+        
+        for offset, line in enumerate(lines):
+            line_num = first + offset
+            tokens, state = tokenize_line(line, state)
+            results.append((tokens, state))
+            
+            previous = states[line_num - 1]
+            states[line_num - 1] = state
+            if stop_after is not None and line_num >= stop_after and previous == state:
+                converged = True
+                break
+        
+        self._apply_tokens(first, results)
+        return first + len(results) - 1, converged
+    
+    def _start_state(self, line):
+        """Get the lexer state at the start of a line, None if not known"""
+        states = self._line_states
+        state = states[line - 2] if 1 < line <= len(states) + 1 else None
+        return None if state is _UNKNOWN_STATE else state
+    
+    def _apply_tokens(self, first, results):
+        """Replace syntax tags on the lines starting at first with one tag_add per tag"""
+        ranges = {tag: [] for tag in self.SYNTAX_TAGS}
+        last = first + len(results) - 1
+        
+        # Folded lines are not tagged; unfolding marks them dirty again
+        hidden = []
+        if self._folds:
+            hidden = [(start - first, end - first)
+                      for start, end in self._folded_ranges() if end >= first and start <= last]
+        
+        for offset, (tokens, _) in enumerate(results):
+            if hidden and any(start <= offset <= end for start, end in hidden):
+                continue
+            line_num = first + offset
+            for tag, start, end in tokens:
+                ranges[tag].extend((f"{line_num}.{start}", f"{line_num}.{end}"))
+        
+        widget = self.text_widget
+        for tag, tag_ranges in ranges.items():
+            widget.tag_remove(tag, f"{first}.0", f"{last}.end")
+            if tag_ranges:
+                widget.tag_add(tag, *tag_ranges)
+        
+    # Background highlighting
+    def _start_background_highlight(self):
+        """Tokenize a snapshot of the buffer on a worker thread
+        
+        The worker only sees the text and the lexer; results come back through
+        a queue and are tagged on the Tk thread by _poll_background_highlight.
+        Any edit cancels the job and the remaining dirty lines are finished
+        incrementally.
+        """
+        self._highlight_generation += 1
+        generation = self._highlight_generation
+        text = self.text_widget.get("1.0", "end-1c")
+        lexer = self.lexer
+        results = queue.Queue()
+        chunk_lines = self.HIGHLIGHT_CHUNK_LINES
+        
+        def work():
+            lines = text.split("\n")
+            state = None
+            for start in range(0, len(lines), chunk_lines):
+                if self._highlight_generation != generation:
+                    return
+                chunk = lexer.tokenize_lines(lines[start:start + chunk_lines], state)
+                state = chunk[-1][1]
+                results.put((start + 1, chunk))
+            results.put(None)
+        
+        self._highlight_worker = results
+        threading.Thread(target=work, daemon=True).start()
+        self._highlight_poll_job = self.after(self.HIGHLIGHT_POLL_MS, self._poll_background_highlight)
+    
+    def _poll_background_highlight(self):
+        """Apply finished background chunks within the highlighting time slice"""
+        self._highlight_poll_job = None
+        results = self._highlight_worker
+        if results is None:
+            return
+        
+        states = self._line_states
+        deadline = time.perf_counter() + self.HIGHLIGHT_SLICE_MS / 1000.0
+        while time.perf_counter() < deadline:
+            try:
+                item = results.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Done; anything still dirty is picked up by the incremental pass
+                self._highlight_worker = None
+                if self._highlight_dirty:
+                    self._schedule_highlight()
+                return
+            
+            first, chunk = item
+            last = first + len(chunk) - 1
+            states[first - 1:last] = [state for _, state in chunk]
+            self._apply_tokens(first, chunk)
+            self._highlight_dirty.remove(first, last)
+        
+        self._highlight_poll_job = self.after(self.HIGHLIGHT_POLL_MS, self._poll_background_highlight)
+    
+    def _stop_background_highlight(self):
+        """Cancel a running background highlighting job"""
+        if self._highlight_worker is None:
+            return
+        self._highlight_generation += 1
+        self._highlight_worker = None
+        if self._highlight_poll_job is not None:
+            self.after_cancel(self._highlight_poll_job)
+            self._highlight_poll_job = None
+    
+    # Line number gutter
+    def _on_gutter_edit(self, change):
+        """Redraw the gutter when an edit adds or removes lines"""
+        if change.line_delta or change.is_full:
+            self._schedule_line_numbers()
+    
+    def _schedule_line_numbers(self, event=None):
+        """Redraw the gutter once the pending view changes are done"""
+        if self.line_numbers and self._gutter_job is None:
+            self._gutter_job = self.after_idle(self.update_line_numbers)
     
     def update_line_numbers(self, event=None):
-        """Update line numbers display"""
+        """Update line numbers display
+        
+        Only visible lines are drawn. Numbers are placed with dlineinfo, so
+        wrapped and hidden lines stay aligned, and canvas items are reused:
+        a redraw only changes their text and coordinates.
+        """
+        if self._gutter_job is not None:
+            self.after_cancel(self._gutter_job)
+            self._gutter_job = None
         if not self.line_numbers:
             return
             
-        self.line_canvas.delete("all")
-        
-        # Get visible lines
+        widget = self.text_widget
+        canvas = self.line_canvas
         try:
-            first_line = int(self.text_widget.index("@0,0").split('.')[0])
-            last_line = int(self.text_widget.index(f"@0,{self.text_widget.winfo_height()}").split('.')[0])
-            
-            line_height = self.editor_font.metrics("linespace")
-            
-            for line_num in range(first_line, last_line + 1):
-                y_pos = (line_num - first_line) * line_height + line_height // 2
-                self.line_canvas.create_text(
-                    45, y_pos, 
-                    text=str(line_num), 
-                    anchor="e", 
-                    fill="#666666",
-                    font=(self.font_family, self.font_size - 1)
-                )
-        except Exception:
-            pass  # Handle edge cases gracefully
-            
-        # Schedule next update
-        self.after_idle(lambda: None)
+            first_line = int(widget.index("@0,0").split('.')[0])
+            last_line = int(widget.index(f"@0,{widget.winfo_height()}").split('.')[0])
+        except tk.TclError:
+            return
+        
+        self._update_gutter_width()
+        x = int(canvas.cget("width")) - 5
+        base = self._line_number_base()
+            
+        used = 0
+        items = self._gutter_items
+        folding = self.code_folding and self.large_file is None and self.follower is None
+        for line_num in self._visible_lines(first_line, last_line):
+            info = widget.dlineinfo(f"{line_num}.0")
+            if info is None:
+                continue  # Scrolled partly out of view
+            
+            if used == len(items):
+                item = canvas.create_text(0, 0, anchor="ne", fill="#666666",
+                                          font=self.gutter_font)
+                items.append([item, None, None])
+            entry = items[used]
+            used += 1
+            
+            text = str(line_num + base) if base is not None else ""
+            if folding:
+                text += self._fold_marker(line_num)
+            coords = (x, info[1])
+            if entry[1] != text:
+                canvas.itemconfigure(entry[0], text=text, state="normal")
+                entry[1] = text
+            if entry[2] != coords:
+                canvas.coords(entry[0], *coords)
+                entry[2] = coords
+        
+        # Park unused items instead of deleting them
+        for entry in items[used:]:
+            if entry[1] is not None:
+                canvas.itemconfigure(entry[0], state="hidden")
+                entry[1] = None
+    
+    def _update_gutter_width(self):
+        """Fit the gutter to the digit count of the last line number"""
+        if self.large_file is not None:
+            digits = len(str(self.large_file.line_count))
+        else:
+            digits = len(str(self._line_count() + self._follow_trimmed))
+        if digits == self._gutter_digits:
+            return
+        
+        self._gutter_digits = digits
+        width = self.gutter_font.measure("9" * max(digits, 2)) + 15
+        if self.code_folding:
+            width += self.gutter_font.measure(" \u25be")
+        self.line_canvas.configure(width=width)
+        self.line_frame.configure(width=width)
+        for entry in self._gutter_items:
+            entry[2] = None  # x position moved
+    
+    def _line_number_base(self):
+        """Get the number to add to widget line numbers, None if unknown yet"""
+        if self.large_file is None:
+            return self._follow_trimmed
+        if self._window_first_line is None:
+            return None
+        return self._window_first_line - 1
     
     def on_mousewheel(self, event):
         """Sync line numbers with text scrolling"""
-        self.update_line_numbers()
+        self._schedule_line_numbers()
     
     def get_text(self):
         """Get all text content"""
@@ -170,32 +780,1586 @@ class BTkTextEditor(tk.Frame):
     
     def set_text(self, text):
         """Set text content"""
-        self.text_widget.delete("1.0", tk.END)
-        self.text_widget.insert("1.0", text)
-        if self.line_numbers:
-            self.update_line_numbers()
-        if self.syntax_highlight:
-            self.highlight_syntax()
+        self.stop_following()
+        self.close_large_file()
+        self._cancel_loading()
+        self._follow_trimmed = 0
+        with self.undo_journal.group():
+            self.text_widget.delete("1.0", tk.END)
+            self.text_widget.insert("1.0", text)
+        self._schedule_line_numbers()
     
     def clear(self):
         """Clear all text"""
+        self.stop_following()
+        self.close_large_file()
+        self._cancel_loading()
+        self._follow_trimmed = 0
         self.text_widget.delete("1.0", tk.END)
-        if self.line_numbers:
-            self.update_line_numbers()
+        self._schedule_line_numbers()
     
     def set_font_size(self, size):
         """Change font size"""
         self.font_size = size
         self.editor_font.configure(size=size)
-        if self.line_numbers:
-            self.update_line_numbers()
+        self.gutter_font.configure(size=size - 1)
+        self._gutter_digits = 0
+        self._schedule_line_numbers()
+    
+    # Files
+    @staticmethod
+    def _detect_encoding(head):
+        """Guess a file's encoding from its first bytes (BOM, then UTF-8, then Latin-1)"""
+        for bom, encoding in ((codecs.BOM_UTF32_LE, "utf-32"), (codecs.BOM_UTF32_BE, "utf-32"),
+                              (codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"),
+                              (codecs.BOM_UTF16_BE, "utf-16")):
+            if head.startswith(bom):
+                return encoding
+        try:
+            codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+            return "utf-8"
+        except UnicodeDecodeError:
+            return "latin-1"
+    
+    def open_file(self, path, encoding=None, on_done=None):
+        """Load a file without blocking the UI
+        
+        A worker thread reads and decodes the file in chunks (detecting the
+        encoding unless given, and translating newlines); the text is
+        inserted in batches that fit a frame, so the window paints while
+        loading. Decoding is strict: when bytes past the first chunk are not
+        valid in the detected encoding the load starts over as Latin-1, and
+        with an explicit encoding the load fails. A failed load leaves the
+        buffer empty and without a file path, so nothing partial can be saved
+        over the file. The editor is read-only until on_done(error) is called
+        with None on success.
+        """
+        self.stop_following()
+        self.close_large_file()
+        self._cancel_loading()
+        self._follow_trimmed = 0
+        self._load_generation += 1
+        generation = self._load_generation
+        chunks = queue.Queue()
+        
+        def load(forced):
+            with open(path, "rb") as handle:
+                data = handle.read(self.FILE_CHUNK_BYTES)
+                detected = forced or self._detect_encoding(data)
+                newline = "\r\n" if b"\r\n" in data else "\n"
+                chunks.put((detected, newline))
+                decoder = io.IncrementalNewlineDecoder(
+                    codecs.getincrementaldecoder(detected)(), translate=True)
+                while data:
+                    if self._load_generation != generation:
+                        return
+                    chunks.put(decoder.decode(data))
+                    data = handle.read(self.FILE_CHUNK_BYTES)
+                chunks.put(decoder.decode(b"", final=True))
+        
+        def work():
+            try:
+                try:
+                    load(encoding)
+                except UnicodeDecodeError:
+                    if encoding is not None:
+                        raise
+                    # Detected from the first chunk only: start over as Latin-1,
+                    # which decodes any bytes
+                    chunks.put(False)
+                    load("latin-1")
+                chunks.put(None)
+            except Exception as e:
+                chunks.put(e)
+        
+        widget = self.text_widget
+        self._loading = True
+        self._cancel_highlight()
+        self._stop_background_highlight()
+        widget.configure(state="normal")
+        widget.delete("1.0", tk.END)
+        widget.configure(state="disabled")
+        self.file_path = path
+        self.lexer = get_lexer_for_filename(path) or BTkLexer()
+        
+        threading.Thread(target=work, daemon=True).start()
+        self.after(self.HIGHLIGHT_POLL_MS, lambda: self._insert_file_chunks(generation, chunks, on_done))
+    
+    def _insert_file_chunks(self, generation, chunks, on_done):
+        """Insert decoded chunks for one frame, then let Tk repaint"""
+        if generation != self._load_generation:
+            return
+        
+        widget = self.text_widget
+        deadline = time.perf_counter() + self.FILE_SLICE_MS / 1000.0
+        widget.configure(state="normal")
+        try:
+            while time.perf_counter() < deadline:
+                try:
+                    item = chunks.get_nowait()
+                except queue.Empty:
+                    break
+                
+                if isinstance(item, tuple):
+                    self.file_encoding, self.file_newline = item
+                elif isinstance(item, str):
+                    if item:
+                        widget.insert("end-1c", item)
+                elif item is False:
+                    # Reloading in another encoding
+                    widget.delete("1.0", tk.END)
+                else:
+                    if item is not None:
+                        widget.delete("1.0", tk.END)
+                    self._finish_loading(item)
+                    if on_done:
+                        on_done(item)
+                    return
+        finally:
+            widget.configure(state="disabled" if self._loading else "normal")
+        
+        self.after(1, lambda: self._insert_file_chunks(generation, chunks, on_done))
+    
+    def _finish_loading(self, error):
+        """Make the loaded text editable and highlight it"""
+        self._loading = False
+        widget = self.text_widget
+        widget.configure(state="normal")
+        self.undo_journal.clear()
+        widget.edit_modified(False)
+        widget.mark_set(tk.INSERT, "1.0")
+        widget.see("1.0")
+        if error is not None:
+            print(f"Text editor error: could not open {self.file_path}: {error}")
+            self.file_path = None
+        if self.syntax_highlight:
+            self._reset_highlight()
+        if self.code_folding:
+            self._reset_fold_index()
+        if self.analysis:
+            self._schedule_analysis()
+        if self.completion:
+            self._reset_completion_index()
+        if self.autosave is not None:
+            recovered = False
+            if self._autosave_follows_file:
+                # The journal moves with the file (a leftover one is recovered)
+                self.disable_autosave()
+                recovered = self.enable_autosave()
+            if not recovered:
+                self._restart_autosave(from_file=error is None)
+        self._schedule_line_numbers()
+    
+    def _cancel_loading(self):
+        """Stop a running open_file(), keeping what has been inserted"""
+        if self._loading:
+            self._load_generation += 1
+            self._finish_loading(None)
+    
+    def save_file(self, path=None, encoding=None, on_done=None):
+        """Save the text without blocking the UI or leaving a half-written file
+        
+        The text is copied out of the widget in chunks, a frame at a time,
+        and a worker thread encodes and streams it to a temporary file in the
+        target directory, which then replaces the original with os.replace.
+        Newlines and encoding follow the opened file unless encoding is
+        given. on_done(error) is called with None on success.
+        """
+        if self.large_file is not None:
+            print("Text editor error: the large file view is read-only")
+            return False
+        
+        path = path or self.file_path
+        if path is None:
+            raise ValueError("No file path to save to")
+        encoding = encoding or self.file_encoding
+        newline = self.file_newline
+        
+        self._save_generation += 1
+        generation = self._save_generation
+        chunks = queue.Queue()
+        results = queue.Queue()
+        save_mark = []  # (journal, token) of the autosave journal at the snapshot
+        
+        def work():
+            temp_path = None
+            try:
+                directory = os.path.dirname(os.path.abspath(path))
+                handle, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+                encoder = codecs.getincrementalencoder(encoding)()
+                with os.fdopen(handle, "wb") as output:
+                    while True:
+                        chunk = chunks.get()
+                        if chunk is None:
+                            break
+                        if newline != "\n":
+                            chunk = chunk.replace("\n", newline)
+                        output.write(encoder.encode(chunk))
+                    output.write(encoder.encode("", final=True))
+                    output.flush()
+                    os.fsync(output.fileno())
+                
+                if os.path.exists(path):
+                    os.chmod(temp_path, os.stat(path).st_mode & 0o7777)
+                if self._save_generation != generation:
+                    raise RuntimeError("superseded by a newer save")
+                os.replace(temp_path, path)
+                if save_mark:
+                    journal, token = save_mark
+                    journal.rebase(token, path, encoding)
+                results.put(None)
+            except Exception as e:
+                if temp_path and os.path.exists(temp_path):
+                    os.remove(temp_path)
+                results.put(e)
+        
+        threading.Thread(target=work, daemon=True).start()
+        self.text_widget.configure(state="disabled")
+        self._copy_save_chunks(generation, 1, chunks, results, path, on_done, save_mark)
+        return True
+    
+    def _copy_save_chunks(self, generation, line, chunks, results, path, on_done, save_mark):
+        """Copy one frame's worth of lines to the save worker"""
+        widget = self.text_widget
+        last_line = self._line_count()
+        deadline = time.perf_counter() + self.FILE_SLICE_MS / 1000.0
+        
+        while line <= last_line and time.perf_counter() < deadline:
+            end = line + self.SAVE_CHUNK_LINES
+            chunks.put(widget.get(f"{line}.0", f"{end}.0" if end <= last_line else "end-1c"))
+            line = end
+        
+        if line <= last_line:
+            self.after(1, lambda: self._copy_save_chunks(generation, line, chunks, results,
+                                                         path, on_done, save_mark))
+            return
+        
+        # Snapshot complete: editable again while the worker writes; later edits
+        # stay in the autosave journal after the saved file
+        if self.autosave is not None:
+            save_mark.extend((self.autosave, self.autosave.mark()))
+        chunks.put(None)
+        widget.configure(state="normal")
+        widget.edit_modified(False)
+        self._wait_for_save(generation, results, path, on_done)
+    
+    def _wait_for_save(self, generation, results, path, on_done):
+        """Report the save result once the worker has finished"""
+        try:
+            error = results.get_nowait()
+        except queue.Empty:
+            self.after(self.HIGHLIGHT_POLL_MS,
+                       lambda: self._wait_for_save(generation, results, path, on_done))
+            return
+        
+        if error is None:
+            self.file_path = path
+        else:
+            self.text_widget.edit_modified(True)
+            print(f"Text editor error: could not save {path}: {error}")
+        if on_done:
+            on_done(error)
+    
+    # Autosave
+    def _autosave_path(self):
+        """Get the default journal path: next to the open file, or a new one in the temp directory
+        
+        An untitled buffer gets a path of its own, reserved by creating an
+        empty file there, so editors never share or recover each other's journal.
+        """
+        if self.file_path is None:
+            handle, path = tempfile.mkstemp(prefix="btk_autosave_untitled_")
+            os.close(handle)
+            self._autosave_temp_path = path
+            return path
+        directory, name = os.path.split(os.path.abspath(self.file_path))
+        return os.path.join(directory, f".{name}.btk-autosave")
+    
+    def enable_autosave(self, path=None, recover=True):
+        """Journal every edit so unsaved work survives a crash
+        
+        Edits are appended to a BTkAutosaveJournal at path; by default the
+        journal sits next to the open file and moves with open_file(). An
+        untitled buffer is journaled under a new unique name in the temp
+        directory (autosave.path); pass a path to recover untitled work in a
+        later session. If a journal left by an earlier session is found and
+        recover is true, the text it recorded replaces the buffer as one undo
+        step. Returns True if text was recovered.
+        """
+        if self.large_file is not None:
+            print("Text editor error: autosave is not available in the large file view")
+            return False
+        self.disable_autosave(discard=False)
+        self._autosave_follows_file = path is None
+        journal = BTkAutosaveJournal(path or self._autosave_path())
+        
+        recovered = BTkAutosaveJournal.recover(journal.path) if recover else None
+        if recovered is not None and recovered != self.get_text():
+            self.set_text(recovered)
+            journal.start(text=recovered)
+            self.autosave = journal
+            return True
+        self.autosave = journal
+        self._restart_autosave()
+        return False
+    
+    def disable_autosave(self, discard=True):
+        """Stop journaling edits; discard removes the journal files
+        
+        The journal of an untitled buffer under its reserved temp name is
+        always removed: nothing could find it again once the editor moves on.
+        """
+        if self.autosave is not None:
+            temporary = self.autosave.path == self._autosave_temp_path
+            self.autosave.close(discard=discard or temporary)
+            if temporary:
+                try:
+                    os.remove(self._autosave_temp_path)
+                except OSError:
+                    pass
+                self._autosave_temp_path = None
+            self.autosave = None
+    
+    def _restart_autosave(self, from_file=True):
+        """Base the journal on the saved file when the buffer matches it, else on the text"""
+        if from_file and self.file_path is not None and not self.text_widget.edit_modified():
+            self.autosave.start(file=self.file_path, encoding=self.file_encoding)
+        else:
+            self.autosave.start(text=self.get_text())
+    
+    def _on_autosave_edit(self, change):
+        """Append an edit to the autosave journal"""
+        if self.autosave is None or self._loading or self.large_file is not None or self.follower is not None:
+            return
+        if change.is_full:
+            self._restart_autosave(from_file=False)
+            return
+        line, col = change.start.split(".")
+        self.autosave.append(int(line), int(col), change.deleted, change.inserted)
+    
+    # Follow mode
+    def follow(self, source, max_lines=10000, from_start=False, encoding="utf-8"):
+        """Stream lines into the editor like "tail -f"
+        
+        source is a path to tail, a readable pipe or file object, or a
+        queue.Queue of lines (see BTkLineFollower). New lines are appended
+        once per frame in a single insert and the oldest lines are trimmed
+        so at most max_lines are kept. The view keeps scrolling to the end
+        unless the user has scrolled up. The editor is read-only and edits
+        are not recorded for undo while following.
+        """
+        self.stop_following()
+        self.close_large_file()
+        self._cancel_loading()
+        
+        widget = self.text_widget
+        widget.configure(state="normal")
+        widget.delete("1.0", tk.END)
+        widget.configure(state="disabled")
+        self.undo_journal.clear()
+        
+        self.follow_lines = max_lines
+        self._follow_trimmed = 0
+        self.follower = BTkLineFollower(source, max_lines, from_start, encoding)
+        self.follower.start()
+        self._follow_job = self.after(self.FOLLOW_FRAME_MS, self._follow_step)
+    
+    def stop_following(self):
+        """Stop follow mode, keeping the text received so far
+        
+        Line numbers keep counting the trimmed lines until the text is
+        replaced (set_text(), clear(), open_file() and the like).
+        """
+        if self.follower is None:
+            return
+        self.follower.stop()
+        self.follower = None
+        self._schedule_line_numbers()
+        if self._follow_job is not None:
+            self.after_cancel(self._follow_job)
+            self._follow_job = None
+        self.text_widget.configure(state="normal")
+    
+    def _follow_step(self):
+        """Append the lines received during the last frame and trim the oldest"""
+        self._follow_job = None
+        follower = self.follower
+        done = follower.done  # Read first: lines received before the end are drained below
+        lines = follower.drain()
+        if lines:
+            widget = self.text_widget
+            at_end = widget.yview()[1] >= 1.0
+            top = None if at_end else int(widget.index("@0,0").split(".")[0])
+            
+            text = "\n".join(lines)
+            if widget.compare("end-1c", "!=", "1.0"):
+                text = "\n" + text
+            widget.configure(state="normal")
+            widget.insert("end-1c", text)
+            excess = self._line_count() - self.follow_lines
+            if excess > 0:
+                widget.delete("1.0", f"{excess + 1}.0")
+                self._follow_trimmed += excess
+            widget.configure(state="disabled")
+            
+            if at_end:
+                widget.see("end-1c")
+            elif excess > 0:
+                # Keep the lines the user is reading in place
+                widget.yview(f"{max(top - excess, 1)}.0")
+        
+        if done and not lines:
+            self.stop_following()
+        else:
+            self._follow_job = self.after(self.FOLLOW_FRAME_MS, self._follow_step)
+    
+    # Large file view
+    def open_large_file(self, path, encoding="utf-8", window_lines=None):
+        """Show a file read-only without loading it into the widget
+        
+        The file is memory-mapped and only a window of lines around the
+        viewport is kept in the text widget; the window slides as the view
+        nears its edges. The scrollbar covers the whole file, and the line
+        index used for line numbers and goto_line() is built in the
+        background. get_text() returns the current window only.
+        """
+        self.stop_following()
+        self.close_large_file()
+        self._follow_trimmed = 0
+        self.large_file = BTkMappedFile(path, encoding)
+        self.large_file.start_indexing()
+        self.window_lines = window_lines or self.LARGE_FILE_WINDOW
+        
+        self.text_widget.vbar.configure(command=self._on_virtual_scroll)
+        self._load_window(0, 0)
+        self._poll_file_index()
+    
+    def close_large_file(self):
+        """Leave the large file view and clear the editor"""
+        if self.large_file is None:
+            return
+        
+        self.search.cancel()
+        self.large_file.close()
+        self.large_file = None
+        self._window_offsets = []
+        self._window_first_line = None
+        if self._window_job is not None:
+            self.after_cancel(self._window_job)
+            self._window_job = None
+        
+        widget = self.text_widget
+        widget.vbar.configure(command=widget.yview)
+        widget.configure(state="normal")
+        widget.delete("1.0", tk.END)
+        self.undo_journal.clear()
+    
+    def _load_window(self, offset, top_offset):
+        """Fill the widget with lines around offset, scrolled to top_offset"""
+        mapped = self.large_file
+        start = mapped.lines_before(offset, self.window_lines // 2)
+        offsets, text = mapped.read_lines(start, self.window_lines)
+        
+        widget = self.text_widget
+        widget.configure(state="normal")
+        widget.delete("1.0", tk.END)
+        widget.insert("1.0", text)
+        widget.configure(state="disabled")
+        
+        self._window_offsets = offsets
+        self._window_first_line = mapped.line_number(start, wait=False)
+        top = bisect.bisect_right(offsets, top_offset, hi=len(offsets) - 1)
+        widget.yview(f"{max(top, 1)}.0")
+        self._schedule_line_numbers()
+    
+    def _file_fractions(self):
+        """Get the visible part of the file as scrollbar fractions"""
+        offsets = self._window_offsets
+        size = self.large_file.size
+        if not size:
+            return 0.0, 1.0
+        first, last = self.get_visible_lines()
+        top = offsets[min(first, len(offsets)) - 1]
+        bottom = offsets[min(last, len(offsets) - 1)]
+        return top / size, bottom / size
+    
+    def _on_virtual_scroll(self, *args):
+        """Scrollbar command mapping the whole file onto the window"""
+        if args and args[0] == "moveto":
+            mapped = self.large_file
+            offset = mapped.line_start(int(float(args[1]) * mapped.size))
+            self._load_window(offset, offset)
+        else:
+            # Unit and page steps scroll the window; it slides near its edges
+            self.text_widget.yview(*args)
+    
+    def _schedule_window_check(self):
+        """Check the window position once scrolling settles"""
+        if self._window_job is None:
+            self._window_job = self.after_idle(self._check_window)
+    
+    def _check_window(self):
+        """Recenter the window when the viewport gets close to one of its edges"""
+        self._window_job = None
+        if self.large_file is None:
+            return
+        
+        offsets = self._window_offsets
+        line_count = len(offsets) - 1
+        margin = self.window_lines // 4
+        first, last = self.get_visible_lines()
+        near_start = first <= margin and offsets[0] > 0
+        near_end = last >= line_count - margin and offsets[-1] < self.large_file.size
+        if near_start or near_end:
+            top_offset = offsets[min(first, line_count) - 1]
+            self._load_window(top_offset, top_offset)
+    
+    def _poll_file_index(self):
+        """Refresh line numbers while the background index is being built"""
+        mapped = self.large_file
+        if mapped is None:
+            return
+        if self._window_first_line is None:
+            self._window_first_line = mapped.line_number(self._window_offsets[0], wait=False)
+        self._gutter_digits = 0
+        self._schedule_line_numbers()
+        if not mapped.complete:
+            self.after(100, self._poll_file_index)
+    
+    def goto_line(self, line):
+        """Move the cursor to a line and scroll it into view"""
+        widget = self.text_widget
+        if self.large_file is not None:
+            offset = self.large_file.line_offset(line)
+            self._load_window(offset, offset)
+            local = bisect.bisect_right(self._window_offsets, offset,
+                                        hi=len(self._window_offsets) - 1)
+            index = f"{local}.0"
+        else:
+            index = f"{line}.0"
+        widget.mark_set(tk.INSERT, index)
+        widget.see(index)
+    
+    # Search
+    def create_search_bar(self):
+        """Build the find/replace panel and the match marker strip (hidden until used)"""
+        bar = tk.Frame(self, bg="#F0F0F0")
+        self.search_var = tk.StringVar(self)
+        self.replace_var = tk.StringVar(self)
+        self.search_regex = tk.BooleanVar(self, False)
+        self.search_case = tk.BooleanVar(self, False)
+        
+        tk.Label(bar, text="Find:", bg="#F0F0F0").pack(side="left", padx=(5, 2))
+        self.search_entry = tk.Entry(bar, textvariable=self.search_var, width=24)
+        self.search_entry.pack(side="left", pady=3)
+        tk.Label(bar, text="Replace:", bg="#F0F0F0").pack(side="left", padx=(8, 2))
+        self.replace_entry = tk.Entry(bar, textvariable=self.replace_var, width=18)
+        self.replace_entry.pack(side="left", pady=3)
+        
+        for text, variable in ((".*", self.search_regex), ("Aa", self.search_case)):
+            tk.Checkbutton(bar, text=text, variable=variable, bg="#F0F0F0",
+                           command=self._on_search_changed).pack(side="left")
+        for text, command in (("Prev", lambda: self.find_next(backwards=True)),
+                              ("Next", self.find_next),
+                              ("Replace", self.replace_current),
+                              ("All", self.replace_all),
+                              ("\u2715", self.hide_search)):
+            tk.Button(bar, text=text, command=command, relief="flat",
+                      bg="#E0E0E0", padx=6).pack(side="left", padx=1)
+        
+        self.search_count = tk.Label(bar, text="", bg="#F0F0F0", fg="#666666")
+        self.search_count.pack(side="left", padx=8)
+        self.search_bar = bar
+        
+        self.search_var.trace_add("write", self._on_search_changed)
+        self.search_entry.bind("<Return>", lambda e: self.find_next())
+        self.search_entry.bind("<Shift-Return>", lambda e: self.find_next(backwards=True))
+        for entry in (self.search_entry, self.replace_entry):
+            entry.bind("<Escape>", self.hide_search)
+        
+        # Markers for all matches, next to the scrollbar
+        self.marker_canvas = tk.Canvas(self.editor_frame, width=8, bg=self.bg_color,
+                                       highlightthickness=0)
+        self.marker_canvas.bind("<Configure>", lambda e: self._draw_search_markers(full=True))
+        
+        self.text_widget.tag_configure("search_match", background="#FFF3A0")
+        self.text_widget.tag_configure("search_current", background="#FFB347")
+        self.text_widget.tag_raise("sel")
+    
+    def show_search(self, event=None):
+        """Show the find/replace panel, searching for the selection if any"""
+        if not self.search_bar.winfo_ismapped():
+            self.search_bar.pack(side="top", fill="x", before=self.editor_frame)
+            self.marker_canvas.pack(side="right", fill="y", before=self.text_widget.frame)
+        try:
+            selected = self.text_widget.get(tk.SEL_FIRST, tk.SEL_LAST)
+            if selected and "\n" not in selected:
+                self.search_var.set(selected)
+        except tk.TclError:
+            pass
+        self.search_entry.focus_set()
+        self.search_entry.select_range(0, tk.END)
+        return "break"
+    
+    def hide_search(self, event=None):
+        """Hide the panel and remove all match highlighting"""
+        self.search.cancel()
+        self._clear_search()
+        self.search_bar.pack_forget()
+        self.marker_canvas.pack_forget()
+        self.text_widget.focus_set()
+    
+    def _clear_search(self):
+        """Forget matches and remove their tags and markers"""
+        self.search.matches = []
+        self._match_lines = []
+        self.clear_markers("search")
+        self._search_index = None
+        self._search_resume = None
+        self.text_widget.tag_remove("search_match", "1.0", tk.END)
+        self.text_widget.tag_remove("search_current", "1.0", tk.END)
+        self._draw_search_markers(full=True)
+        self.search_count.configure(text="")
+    
+    def _compile_search(self):
+        """Compile the panel's pattern, or None if empty or invalid"""
+        text = self.search_var.get()
+        if not text:
+            return None
+        encoding = self.large_file.encoding if self.large_file is not None else None
+        return BTkTextSearch.compile(text, self.search_regex.get(), self.search_case.get(),
+                                     binary_encoding=encoding)
+    
+    def _on_search_changed(self, *args):
+        """Restart the search for the current pattern (cancels the running one)"""
+        self._restart_search()
+    
+    def _restart_search(self):
+        """Search for the current pattern in the background"""
+        if self._search_restart_job is not None:
+            self.after_cancel(self._search_restart_job)
+            self._search_restart_job = None
+        self.search.cancel()
+        self._clear_search()
+        try:
+            pattern = self._compile_search()
+        except re.error:
+            self.search_count.configure(text="Invalid pattern")
+            return
+        if pattern is None:
+            return
+        
+        if self.large_file is not None:
+            self._search_total = max(self.large_file.size, 1)
+            self.search.start(pattern, mapped=self.large_file)
+        else:
+            if self._search_snapshot is None:
+                self._search_snapshot = self.text_widget.get("1.0", "end-1c")
+            self._search_total = self._search_snapshot.count("\n") + 1
+            self.search.start(pattern, text=self._search_snapshot)
+        if self._search_job is None:
+            self._search_job = self.after(self.HIGHLIGHT_POLL_MS, self._poll_search)
+    
+    def _on_search_edit(self, change):
+        """Invalidate the snapshot and re-run an active search after edits settle"""
+        if self.large_file is not None:
+            return  # Window reloads; the file itself does not change
+        self._search_snapshot = None
+        if not self.search_var.get() or not self.search_bar.winfo_ismapped():
+            return
+        self._search_index = None
+        if self._search_restart_job is not None:
+            self.after_cancel(self._search_restart_job)
+        self._search_restart_job = self.after(self.SEARCH_RESTART_MS, self._restart_search)
+    
+    def _poll_search(self):
+        """Take streamed matches from the worker and update tags, count and markers"""
+        self._search_job = None
+        search = self.search
+        old_count = len(search.matches)
+        if search.poll():
+            new_matches = search.matches[old_count:]
+            if self.large_file is None:
+                lines = [match[2] for match in new_matches]
+                self._match_lines.extend(lines)
+                self.add_markers("search", lines, "#E0A000")
+            self._schedule_search_tags()
+            self._draw_search_markers(new_matches)
+        self._resume_search()
+        self._update_search_count()
+        if not search.done:
+            self._search_job = self.after(self.HIGHLIGHT_POLL_MS, self._poll_search)
+    
+    def _resume_search(self):
+        """Select the first match after a replacement once it (or the end) has arrived"""
+        offset = self._search_resume
+        matches = self.search.matches
+        if offset is None or not (self.search.done or (matches and matches[-1][0] >= offset)):
+            return
+        self._search_resume = None
+        if matches:
+            self._search_index = bisect.bisect_left(matches, (offset,)) - 1
+            self.find_next()
+    
+    def _update_search_count(self):
+        """Show the match count and the current match"""
+        count = len(self.search.matches)
+        suffix = "+" if self.search.truncated or not self.search.done else ""
+        if self._search_index is not None and count:
+            text = f"{self._search_index + 1} of {count}{suffix}"
+        else:
+            text = f"{count}{suffix} matches" if self.search_var.get() else ""
+        self.search_count.configure(text=text)
+    
+    def _schedule_search_tags(self):
+        """Re-tag visible matches once the view settles"""
+        if self._search_tag_job is None:
+            self._search_tag_job = self.after_idle(self._tag_visible_matches)
+    
+    def _tag_visible_matches(self):
+        """Tag the matches inside the viewport with one tag_add call"""
+        self._search_tag_job = None
+        widget = self.text_widget
+        widget.tag_remove("search_match", "1.0", tk.END)
+        widget.tag_remove("search_current", "1.0", tk.END)
+        matches = self.search.matches
+        if not matches:
+            return
+        
+        first, last = self.get_visible_lines()
+        ranges = []
+        if self.large_file is None:
+            start = bisect.bisect_left(self._match_lines, first)
+            stop = bisect.bisect_right(self._match_lines, last)
+            for match in matches[start:stop]:
+                ranges.extend((match[3], match[4]))
+        else:
+            offsets = self._window_offsets
+            low = offsets[min(first, len(offsets)) - 1]
+            high = offsets[min(last, len(offsets) - 1)]
+            start = bisect.bisect_left(matches, (low,))
+            stop = bisect.bisect_left(matches, (high,))
+            for match in matches[start:stop]:
+                ranges.extend(self._window_index(offset) for offset in match[:2])
+        if ranges:
+            widget.tag_add("search_match", *ranges)
+        
+        current = self._current_match_range()
+        if current:
+            widget.tag_add("search_current", *current)
+    
+    def _window_index(self, offset):
+        """Convert a byte offset inside the large file window to a text index"""
+        offsets = self._window_offsets
+        line = bisect.bisect_right(offsets, offset, hi=len(offsets) - 1)
+        line = max(line, 1)
+        column = len(self.large_file.decode(offsets[line - 1], offset))
+        return f"{line}.{column}"
+    
+    def _current_match_range(self):
+        """Get the text indices of the current match, if it is loaded in the widget"""
+        if self._search_index is None or self._search_index >= len(self.search.matches):
+            return None
+        match = self.search.matches[self._search_index]
+        if self.large_file is None:
+            return match[3], match[4]
+        offsets = self._window_offsets
+        if not offsets[0] <= match[0] < offsets[-1]:
+            return None
+        return self._window_index(match[0]), self._window_index(match[1])
+    
+    def _draw_search_markers(self, new_matches=(), full=False):
+        """Mark match positions along the scrollbar, one marker per pixel row"""
+        canvas = self.marker_canvas
+        if full:
+            canvas.delete("all")
+            self._marker_rows = set()
+            new_matches = self.search.matches
+        height = canvas.winfo_height() - 2
+        if height <= 0 or not new_matches:
+            return
+        
+        total = self._search_total
+        position = 0 if self.large_file is not None else 2
+        rows = self._marker_rows
+        for match in new_matches:
+            row = match[position] * height // total
+            if row not in rows:
+                rows.add(row)
+                canvas.create_rectangle(1, row, 7, row + 2, fill="#E0A000", outline="")
+    
+    def find_next(self, backwards=False):
+        """Select the next (or previous) match; returns False when there is none"""
+        matches = self.search.matches
+        if not matches or (self.large_file is None and self._search_snapshot is None):
+            return False  # No matches, or stale ones until the search re-runs after an edit
+        
+        if self._search_index is None:
+            # Start from the cursor
+            line = int(self.text_widget.index(tk.INSERT).split(".")[0])
+            if self.large_file is None:
+                index = bisect.bisect_left(self._match_lines, line)
+            else:
+                offsets = self._window_offsets
+                index = bisect.bisect_left(matches, (offsets[min(line, len(offsets)) - 1],))
+            index = index - 1 if backwards else index
+        else:
+            index = self._search_index + (-1 if backwards else 1)
+        self._search_index = index % len(matches)
+        
+        match = matches[self._search_index]
+        if self.large_file is not None and self._current_match_range() is None:
+            self._load_window(match[0], match[0])
+        start, end = self._current_match_range()
+        widget = self.text_widget
+        widget.mark_set(tk.INSERT, end)
+        widget.see(start)
+        self._tag_visible_matches()
+        self._update_search_count()
+        return True
+    
+    def _replacement(self, match):
+        """Get the replacement text for a re match"""
+        replacement = self.replace_var.get()
+        return match.expand(replacement) if self.search_regex.get() else replacement
+    
+    def replace_current(self):
+        """Replace the current match, or select the next one if none is current"""
+        if self.large_file is not None:
+            return False
+        if self._search_resume is not None:
+            return False  # The search of the previous replacement is still running
+        if self._search_index is None or self._search_snapshot is None:
+            return self.find_next()
+        
+        match = self.search.matches[self._search_index]
+        found = self.search.pattern.match(self._search_snapshot, match[0])
+        if found is None or found.end() != match[1]:
+            return False
+        replacement = self._replacement(found)
+        self.text_widget.replace(match[3], match[4], replacement)
+        
+        # Search the edited text in the background; the next match after the
+        # replacement is selected as soon as it streams in
+        self._restart_search()
+        if not self.search.done:
+            self._search_resume = match[0] + len(replacement)
+        return True
+    
+    def replace_all(self):
+        """Replace every match in one edit (a single undo step); returns the count"""
+        if self.large_file is not None:
+            return 0
+        try:
+            pattern = self._compile_search()
+        except re.error:
+            return 0
+        if pattern is None:
+            return 0
+        
+        widget = self.text_widget
+        text = widget.get("1.0", "end-1c")
+        pieces = []
+        first = last = None
+        for match in pattern.finditer(text):
+            if match.start() == match.end():
+                continue
+            if first is None:
+                first = match.start()
+            else:
+                pieces.append(text[last:match.start()])
+            pieces.append(self._replacement(match))
+            last = match.end()
+        if first is None:
+            return 0
+        
+        # One replace of the span from the first to the last match, as a checkpoint step
+        with self.undo_journal.group():
+            widget.replace(f"1.0+{first}c", f"1.0+{last}c", "".join(pieces))
+        return (len(pieces) + 1) // 2
+    
+    # Undo/redo
+    def _on_undo_edit(self, change):
+        """Record user edits in the undo journal"""
+        if self._undoing or self._loading or self.large_file is not None or self.follower is not None:
+            return
+        if change.is_full:
+            # Edit extent unknown: the history no longer matches the text
+            self.undo_journal.clear()
+            return
+        line, col = change.start.split(".")
+        self.undo_journal.record(int(line), int(col), change.deleted, change.inserted)
+    
+    def undo(self, event=None):
+        """Undo the last edit step"""
+        if self.large_file is None and not self._loading:
+            edits = self.undo_journal.undo()
+            if edits:
+                self._apply_undo_edits(reversed(edits), True)
+        return "break"
+    
+    def redo(self, event=None):
+        """Redo the last undone edit step"""
+        if self.large_file is None and not self._loading:
+            edits = self.undo_journal.redo()
+            if edits:
+                self._apply_undo_edits(edits, False)
+        return "break"
+    
+    def _apply_undo_edits(self, edits, undo):
+        """Revert (undo) or reapply journal edits without recording them"""
+        widget = self.text_widget
+        self._undoing = True
+        try:
+            for edit in edits:
+                old, new = (edit.inserted, edit.deleted) if undo else (edit.deleted, edit.inserted)
+                index = edit.index
+                if old:
+                    end = "%d.%d" % BTkUndoEdit.end_of(edit.line, edit.col, old)
+                    widget.replace(index, end, new)
+                elif new:
+                    widget.insert(index, new)
+        finally:
+            self._undoing = False
+        
+        widget.tag_remove(tk.SEL, "1.0", tk.END)
+        widget.mark_set(tk.INSERT, "%d.%d" % BTkUndoEdit.end_of(edit.line, edit.col, new))
+        widget.see(tk.INSERT)
+    
+    # Code folding
+    def _reset_fold_index(self):
+        """Rebuild the fold index from the whole buffer"""
+        self.fold_index.reset(self.text_widget.get("1.0", "end-1c").split("\n"))
+        self._schedule_line_numbers()
+    
+    def _on_fold_edit(self, change):
+        """Rescan the edited lines in the fold index"""
+        self._folded_cache = None
+        if (not self.code_folding or self._loading or self.large_file is not None
+                or self.follower is not None):
+            return
+        
+        index = self.fold_index
+        if change.is_full or len(index) + change.line_delta != self._line_count():
+            self._reset_fold_index()
+            return
+        first = change.start_line
+        lines = self.text_widget.get(f"{first}.0", f"{first + change.added_lines}.end").split("\n")
+        index.update(first, change.removed_lines, lines)
+        self._schedule_line_numbers()
+    
+    def _fold_at(self, line):
+        """Get the tag of the fold collapsed under a header line, or None"""
+        widget = self.text_widget
+        start = widget.index(f"{line + 1}.0")
+        for tag in widget.tag_names(start):
+            if tag in self._folds:
+                found = widget.tag_nextrange(tag, start)
+                if found and widget.compare(found[0], "==", start):
+                    return tag
+        return None
+    
+    def _fold_marker(self, line):
+        """Get the gutter marker of a line: collapsed, expandable or none"""
+        if self._folds and self._fold_at(line) is not None:
+            return " \u25b8"
+        if self.fold_index.is_foldable(line):
+            return " \u25be"
+        return "  "
+    
+    def _folded_ranges(self):
+        """Get the merged (first, last) line ranges hidden by folds"""
+        if self._folded_cache is None:
+            widget = self.text_widget
+            hidden = BTkLineRanges()
+            for tag in list(self._folds):
+                ranges = widget.tag_ranges(tag)
+                if not ranges:
+                    # Its text was deleted
+                    widget.tag_delete(tag)
+                    self._folds.discard(tag)
+                    continue
+                first = int(str(ranges[0]).split(".")[0])
+                end_line, end_col = map(int, str(ranges[-1]).split("."))
+                hidden.add(first, end_line - 1 if end_col == 0 else end_line)
+            self._folded_cache = hidden.ranges
+        return self._folded_cache
+    
+    def _visible_ranges(self, first, last):
+        """Get the parts of lines first..last not hidden by folds"""
+        if not self._folds:
+            return [(first, last)]
+        visible = BTkLineRanges()
+        visible.add(first, last)
+        for start, end in self._folded_ranges():
+            visible.remove(start, end)
+        return visible.ranges
+    
+    def _visible_lines(self, first, last):
+        """Iterate over lines first..last not hidden by folds"""
+        for start, end in self._visible_ranges(first, last):
+            yield from range(start, end + 1)
+    
+    def fold(self, line):
+        """Collapse the region starting at a line; returns whether it was folded
+        
+        The region's lines get an elided tag, so Tk neither lays them out nor
+        displays them, and they are skipped by highlighting and the gutter.
+        """
+        if not self.code_folding or self._fold_at(line) is not None:
+            return False
+        end = self.fold_index.fold_end(line)
+        if end is None:
+            return False
+        
+        widget = self.text_widget
+        self._fold_count += 1
+        tag = f"fold{self._fold_count}"
+        widget.tag_configure(tag, elide=True)
+        widget.tag_add(tag, f"{line + 1}.0", f"{end + 1}.0")
+        self._folds.add(tag)
+        self._folded_cache = None
+        
+        # Keep the cursor out of the hidden lines
+        if widget.compare(tk.INSERT, ">=", f"{line + 1}.0") and widget.compare(tk.INSERT, "<", f"{end + 1}.0"):
+            widget.mark_set(tk.INSERT, f"{line}.end")
+        self._schedule_line_numbers()
+        return True
+    
+    def unfold(self, line):
+        """Expand the region collapsed under a line; returns whether one was"""
+        tag = self._fold_at(line)
+        if tag is None:
+            return False
+        self._remove_fold(tag)
+        self._schedule_line_numbers()
+        return True
+    
+    def _remove_fold(self, tag):
+        """Delete a fold tag and highlight the lines it hid"""
+        widget = self.text_widget
+        ranges = widget.tag_ranges(tag)
+        widget.tag_delete(tag)
+        self._folds.discard(tag)
+        self._folded_cache = None
+        if ranges and self.syntax_highlight and self._line_states:
+            first = int(str(ranges[0]).split(".")[0])
+            last = int(str(ranges[-1]).split(".")[0])
+            self._highlight_dirty.add(first, min(last, len(self._line_states)))
+            self._schedule_highlight()
+    
+    def toggle_fold(self, line):
+        """Collapse or expand the region at a line"""
+        return self.unfold(line) or self.fold(line)
+    
+    def unfold_all(self):
+        """Expand every folded region"""
+        for tag in list(self._folds):
+            self._remove_fold(tag)
+        self._schedule_line_numbers()
+    
+    def _on_gutter_click(self, event):
+        """Toggle the fold of the clicked gutter line"""
+        if not self.code_folding or self.large_file is not None or self.follower is not None:
+            return
+        line = int(self.text_widget.index(f"@0,{event.y}").split(".")[0])
+        self.toggle_fold(line)
+    
+    def toggle_code_folding(self):
+        """Toggle code folding and its gutter markers"""
+        self.code_folding = not self.code_folding
+        if self.code_folding:
+            self._reset_fold_index()
+        else:
+            self.unfold_all()
+            self.fold_index.reset([])
+        self._gutter_digits = 0
+        self._schedule_line_numbers()
+    
+    # Background analysis
+    def _on_analysis_edit(self, change):
+        """Count buffer versions and re-analyze once typing pauses"""
+        self.buffer_version += 1
+        if (self.analysis and not self._loading and self.large_file is None
+                and self.follower is None):
+            self._schedule_analysis()
+    
+    def _schedule_analysis(self):
+        """(Re)start the analysis debounce timer"""
+        if self._analysis_job is not None:
+            self.after_cancel(self._analysis_job)
+        self._analysis_job = self.after(self.ANALYSIS_DELAY_MS, self._run_analysis)
+    
+    def _run_analysis(self):
+        """Send a snapshot of the buffer to the analysis worker"""
+        self._analysis_job = None
+        if self.analysis_service is None:
+            self.analysis_service = BTkAnalysisService(self.analyzer)
+        self.analysis_service.submit(self.buffer_version, self.get_text())
+        if self._analysis_poll_job is None:
+            self._analysis_poll_job = self.after(self.ANALYSIS_POLL_MS, self._poll_analysis)
+    
+    def _poll_analysis(self):
+        """Apply finished analysis results that still match the buffer"""
+        self._analysis_poll_job = None
+        service = self.analysis_service
+        if service is None:
+            return
+        result = service.poll()
+        if result is not None and result[0] == self.buffer_version:
+            self._apply_analysis(result[1], result[2])
+        if service.busy:
+            self._analysis_poll_job = self.after(self.ANALYSIS_POLL_MS, self._poll_analysis)
+    
+    def _apply_analysis(self, diagnostics, symbols):
+        """Show diagnostics (squiggles and markers) and publish the outline"""
+        self.diagnostics = sorted(diagnostics, key=lambda diagnostic: diagnostic.line)
+        self._diagnostic_lines = [diagnostic.line for diagnostic in self.diagnostics]
+        self.symbols = symbols
+        
+        self.clear_markers("diagnostics")
+        if self._diagnostic_lines:
+            self.add_markers("diagnostics", self._diagnostic_lines, self.DIAGNOSTIC_COLOR)
+        self._schedule_diagnostic_tags()
+        
+        if self.outline_panel is not None:
+            self._update_outline()
+        for listener in list(self._outline_listeners):
+            try:
+                listener(symbols)
+            except Exception as e:
+                print(f"Text editor listener error: {e}")
+    
+    def _schedule_diagnostic_tags(self):
+        """Re-tag visible diagnostics once the view settles"""
+        if self._diagnostic_tag_job is None:
+            self._diagnostic_tag_job = self.after_idle(self._tag_visible_diagnostics)
+    
+    def _tag_visible_diagnostics(self):
+        """Underline the diagnostics inside the viewport with one tag_add call"""
+        self._diagnostic_tag_job = None
+        widget = self.text_widget
+        widget.tag_remove("diagnostic", "1.0", tk.END)
+        if not self.diagnostics:
+            return
+        
+        first, last = self.get_visible_lines()
+        start = bisect.bisect_left(self._diagnostic_lines, first)
+        stop = bisect.bisect_right(self._diagnostic_lines, last)
+        ranges = []
+        for diagnostic in self.diagnostics[start:stop]:
+            begin = f"{diagnostic.line}.{diagnostic.col}"
+            end = f"{diagnostic.end_line}.{diagnostic.end_col}"
+            if widget.compare(end, "<=", begin):
+                end = begin + "+1c"
+            ranges.extend((begin, end))
+        if ranges:
+            widget.tag_add("diagnostic", *ranges)
+    
+    def set_analyzer(self, analyzer):
+        """Use another analyzer (a picklable function: text -> (diagnostics, symbols))"""
+        self.analyzer = analyzer
+        if self.analysis_service is not None:
+            self.analysis_service.shutdown()
+            self.analysis_service = None
+        if self.analysis:
+            self._schedule_analysis()
+    
+    def toggle_analysis(self):
+        """Toggle background analysis, clearing its results when turned off"""
+        self.analysis = not self.analysis
+        if self.analysis:
+            self._schedule_analysis()
+            return
+        
+        if self._analysis_job is not None:
+            self.after_cancel(self._analysis_job)
+            self._analysis_job = None
+        if self.analysis_service is not None:
+            self.analysis_service.shutdown()
+            self.analysis_service = None
+        self._apply_analysis([], [])
+    
+    def add_outline_listener(self, callback):
+        """Call callback(symbols) with each new outline: (kind, name, line, depth) tuples"""
+        self._outline_listeners.append(callback)
+    
+    def toggle_outline(self):
+        """Toggle the outline panel listing classes and functions"""
+        if self.outline_panel is None:
+            self.outline_panel = tk.Listbox(self.editor_frame, width=28, bg=self.bg_color,
+                                            fg=self.fg_color, font=self.gutter_font,
+                                            relief="flat", highlightthickness=0,
+                                            activestyle="none")
+            self.outline_panel.bind("<<ListboxSelect>>", self._on_outline_select)
+            self._update_outline()
+        if self.outline_panel.winfo_ismapped():
+            self.outline_panel.pack_forget()
+        else:
+            self.outline_panel.pack(side="right", fill="y", before=self.text_widget.frame)
+    
+    def _update_outline(self):
+        """Fill the outline panel from the latest symbols"""
+        panel = self.outline_panel
+        panel.delete(0, tk.END)
+        if self.symbols:
+            panel.insert(tk.END, *("    " * depth + ("class " if kind == "class" else "def ") + name
+                                   for kind, name, line, depth in self.symbols))
+    
+    def _on_outline_select(self, event=None):
+        """Jump to the selected symbol"""
+        selection = self.outline_panel.curselection()
+        if selection and selection[0] < len(self.symbols):
+            self.goto_line(self.symbols[selection[0]][2])
+            self.text_widget.focus_set()
+    
+    def _on_destroy(self, event=None):
+        """Stop the analysis worker, unmap the spelling dictionary and close the autosave journal"""
+        if event is not None and event.widget is not self:
+            return
+        self.disable_autosave(discard=False)
+        if self.analysis_service is not None:
+            self.analysis_service.shutdown()
+            self.analysis_service = None
+        if self.spell_dictionary is not None and self._owns_spell_dictionary:
+            self.spell_dictionary.close()
+    
+    # Word completion
+    def _reset_completion_index(self):
+        """Re-index every line for completion"""
+        self.completion_index.reset(self._line_count())
+        self._schedule_completion_index()
+    
+    def _on_completion_edit(self, change):
+        """Queue the edited lines for re-indexing"""
+        if (not self.completion or self._loading or self.large_file is not None
+                or self.follower is not None):
+            return
+        self.completion_index.apply_change(change, self._line_count())
+        self._schedule_completion_index()
+    
+    def _schedule_completion_index(self):
+        if self._completion_job is None:
+            self._completion_job = self.after_idle(self._completion_index_step)
+    
+    def _completion_index_step(self):
+        """Index queued lines until the time slice is used up"""
+        self._completion_job = None
+        index = self.completion_index
+        deadline = time.perf_counter() + self.HIGHLIGHT_SLICE_MS / 1000.0
+        while index.dirty and time.perf_counter() < deadline:
+            first, last = index.dirty.first()
+            last = min(last, first + self.COMPLETION_CHUNK_LINES - 1, self._line_count())
+            if last < first:
+                index.dirty.clear()
+                break
+            index.index_lines(first, self.text_widget.get(f"{first}.0", f"{last}.end").split("\n"))
+        if index.dirty:
+            self._completion_job = self.after(1, self._completion_index_step)
+    
+    def add_completion_words(self, name, words, weight=1.0):
+        """Offer extra completions (iterable, or dict of word -> weight) ranked with buffer words"""
+        self.completion_index.add_source(name, words, weight)
+    
+    def remove_completion_words(self, name):
+        """Remove words added with add_completion_words"""
+        self.completion_index.remove_source(name)
+    
+    def _word_before_cursor(self):
+        """Get the identifier characters just before the cursor"""
+        match = re.search(r"[^\W\d]\w*$", self.text_widget.get("insert linestart", "insert"))
+        return match.group() if match else ""
+    
+    def show_completion(self, event=None, auto=False):
+        """Show ranked completions for the word before the cursor"""
+        if not self.completion or self.large_file is not None or self.follower is not None:
+            return "break"
+        widget = self.text_widget
+        
+        # The cursor line is indexed now so the word being typed is current
+        index = self.completion_index
+        line = int(widget.index(tk.INSERT).split(".")[0])
+        if index.dirty.contains(line):
+            index.index_lines(line, [widget.get(f"{line}.0", f"{line}.end")])
+        
+        prefix = self._word_before_cursor()
+        words = index.complete(prefix, self.COMPLETION_ROWS) if prefix else []
+        bbox = widget.bbox(tk.INSERT)
+        if not words or bbox is None or (auto and len(prefix) < self.COMPLETION_MIN_PREFIX):
+            self.hide_completion()
+            return "break"
+        
+        if self.completion_popup is None:
+            self.completion_popup = tk.Toplevel(self)
+            self.completion_popup.overrideredirect(True)
+            self._completion_list = tk.Listbox(self.completion_popup, font=self.editor_font,
+                                               bg=self.bg_color, fg=self.fg_color,
+                                               selectbackground="#0078D7", activestyle="none",
+                                               highlightthickness=1, relief="flat")
+            self._completion_list.pack(fill="both", expand=True)
+            self._completion_list.bind("<ButtonRelease-1>", lambda e: self.accept_completion())
+        
+        listbox = self._completion_list
+        listbox.delete(0, tk.END)
+        listbox.insert(tk.END, *words)
+        listbox.configure(height=len(words), width=max(len(word) for word in words) + 2)
+        listbox.selection_set(0)
+        self._completion_prefix = prefix
+        
+        x = widget.winfo_rootx() + bbox[0]
+        y = widget.winfo_rooty() + bbox[1] + bbox[3]
+        self.completion_popup.geometry(f"+{x}+{y}")
+        self.completion_popup.deiconify()
+        self.completion_popup.lift()
+        self._completion_shown = True
+        return "break"
+    
+    def hide_completion(self, event=None):
+        """Close the completion popup"""
+        if self._completion_shown:
+            self.completion_popup.withdraw()
+            self._completion_shown = False
+    
+    def accept_completion(self):
+        """Replace the word before the cursor with the selected completion"""
+        if not self._completion_shown:
+            return
+        selection = self._completion_list.curselection()
+        if selection:
+            word = self._completion_list.get(selection[0])
+            prefix = self._completion_prefix
+            self.text_widget.replace(f"insert-{len(prefix)}c", tk.INSERT, word)
+        self.hide_completion()
+        self.text_widget.focus_set()
+    
+    def _on_completion_key(self, event):
+        """Update the popup while typing, or open it after a few word characters"""
+        if not self.completion or event.keysym in ("Up", "Down", "Return", "Tab", "Escape"):
+            return
+        if self._completion_shown:
+            self.show_completion()
+        elif event.char and (event.char.isalnum() or event.char == "_"):
+            self.show_completion(auto=True)
+    
+    def _on_completion_nav(self, event):
+        """Navigate or accept completions; keys act normally while the popup is closed"""
+        if not self._completion_shown:
+            return None
+        listbox = self._completion_list
+        if event.keysym in ("Up", "Down"):
+            selection = listbox.curselection()
+            current = selection[0] if selection else 0
+            current = (current + (1 if event.keysym == "Down" else -1)) % listbox.size()
+            listbox.selection_clear(0, tk.END)
+            listbox.selection_set(current)
+            listbox.see(current)
+        elif event.keysym == "Escape":
+            self.hide_completion()
+        else:
+            self.accept_completion()
+        return "break"
+    
+    def toggle_completion(self):
+        """Toggle word completion"""
+        self.completion = not self.completion
+        if self.completion:
+            self._reset_completion_index()
+        else:
+            self.hide_completion()
+            self.completion_index.reset(0)
+    
+    # Spell checking
+    def _start_spell_check(self):
+        """Load the dictionary in the background, then check the viewport"""
+        if self.spell_dictionary is None:
+            self.spell_dictionary = BTkSpellDictionary(self._spell_source)
+            self._owns_spell_dictionary = True
+            if self.spell_dictionary.path is None:
+                print("Spell checker error: no word list found")
+        self.spell_dictionary.start_loading()
+        self._spell_checked.clear()
+        self._schedule_spell_check()
+    
+    def _on_spell_edit(self, change):
+        """Mark the edited lines for checking again"""
+        if not self.spell_check:
+            return
+        checked = self._spell_checked
+        if self._spell_state is not None and (change.is_full or change.start_line < self._spell_state[1]):
+            self._spell_state = None
+        if change.is_full:
+            checked.clear()
+        else:
+            checked.shift(change)
+            checked.remove(change.start_line, change.start_line + change.added_lines)
+        self._schedule_spell_check()
+    
+    def _schedule_spell_check(self):
+        if self._spell_job is None:
+            self._spell_job = self.after_idle(self._spell_step)
+    
+    def _spell_step(self):
+        """Check unchecked visible lines until the time slice is used up"""
+        self._spell_job = None
+        dictionary = self.spell_dictionary
+        if not self.spell_check or dictionary is None or self.large_file is not None:
+            return
+        if not dictionary.ready:
+            if dictionary.path is not None:
+                self._spell_job = self.after(self.SPELL_POLL_MS, self._spell_step)
+            return
+        
+        try:
+            first, last = self.get_visible_lines()
+        except tk.TclError:
+            return
+        pending = BTkLineRanges()
+        for start, end in self._visible_ranges(first, last):
+            pending.add(start, end)
+        for start, end in self._spell_checked:
+            pending.remove(start, end)
+        
+        deadline = time.perf_counter() + self.HIGHLIGHT_SLICE_MS / 1000.0
+        while pending and time.perf_counter() < deadline:
+            start, end = pending.first()
+            end = min(end, start + self.SPELL_CHUNK_LINES - 1)
+            self._spell_check_lines(start, end)
+            pending.remove(start, end)
+            self._spell_checked.add(start, end)
+        if pending:
+            self._spell_job = self.after(1, self._spell_step)
+    
+    def _spell_check_lines(self, first, last):
+        """Tag misspelled words on lines first..last
+        
+        Plain text is checked entirely; with a code lexer only comments and
+        strings are.
+        """
+        widget = self.text_widget
+        lexer = self.lexer
+        prose = type(lexer).tokenize_line is BTkLexer.tokenize_line
+        misspelled = self.spell_dictionary.misspelled
+        ranges = []
+        
+        state = None if prose else self._spell_start_state(first)
+        
+        lines = widget.get(f"{first}.0", f"{last}.end").split("\n")
+        for offset, line in enumerate(lines):
+            line_num = first + offset
+            if prose:
+                spans = [(0, len(line))]
+            else:
+                tokens, state = lexer.tokenize_line(line, state)
+                spans = [(start, end) for tag, start, end in tokens if tag in ("comment", "string")]
+            for span_start, span_end in spans:
+                for start, end in misspelled(line, span_start, span_end):
+                    ranges.extend((f"{line_num}.{start}", f"{line_num}.{end}"))
+        
+        widget.tag_remove("misspelled", f"{first}.0", f"{last}.end")
+        if ranges:
+            widget.tag_add("misspelled", *ranges)
+        if not prose:
+            self._spell_state = (lexer, first + len(lines), state)
+    
+    def _spell_start_state(self, first):
+        """Get the lexer state at the start of a line for spell checking
+        
+        Starts from the nearest known state before the line, the highlighter's
+        or the one left by the last checked chunk, at worst from the top of
+        the buffer, and tokenizes the lines in between.
+        """
+        start, state = 1, None
+        states = self._line_states
+        for line in range(min(first, len(states) + 1), 1, -1):
+            if states[line - 2] is not _UNKNOWN_STATE:
+                start, state = line, states[line - 2]
+                break
+        cached = self._spell_state
+        if cached is not None and cached[0] is self.lexer and start < cached[1] <= first:
+            start, state = cached[1], cached[2]
+        
+        if start < first:
+            tokenize_line = self.lexer.tokenize_line
+            for line in self.text_widget.get(f"{start}.0", f"{first - 1}.end").split("\n"):
+                _, state = tokenize_line(line, state)
+        return state
+    
+    def spelling_suggestions(self, index=tk.INSERT):
+        """Get suggestions for the word at a text index"""
+        if self.spell_dictionary is None:
+            return []
+        word = self.text_widget.get(f"{index} wordstart", f"{index} wordend").strip()
+        return self.spell_dictionary.suggest(word)
+    
+    def _on_misspelled_menu(self, event):
+        """Offer suggestions for a right-clicked misspelled word"""
+        widget = self.text_widget
+        index = widget.index(f"@{event.x},{event.y}")
+        start = widget.index(f"{index} wordstart")
+        end = widget.index(f"{index} wordend")
+        word = widget.get(start, end)
+        
+        menu = tk.Menu(self, tearoff=0)
+        for suggestion in self.spelling_suggestions(index):
+            menu.add_command(label=suggestion,
+                             command=lambda text=suggestion: widget.replace(start, end, text))
+        if menu.index(tk.END) is None:
+            menu.add_command(label="(no suggestions)", state="disabled")
+        menu.add_separator()
+        menu.add_command(label=f"Add \"{word}\" to dictionary",
+                         command=lambda: self.add_spelling_word(word))
+        menu.tk_popup(event.x_root, event.y_root)
+        return "break"
+    
+    def add_spelling_word(self, word):
+        """Accept a word for this session and re-check the viewport"""
+        if self.spell_dictionary is not None:
+            self.spell_dictionary.add_word(word)
+            self._spell_checked.clear()
+            self._schedule_spell_check()
+    
+    def toggle_spell_check(self):
+        """Toggle spell checking"""
+        self.spell_check = not self.spell_check
+        if self.spell_check:
+            self._start_spell_check()
+        else:
+            if self._spell_job is not None:
+                self.after_cancel(self._spell_job)
+                self._spell_job = None
+            self.text_widget.tag_remove("misspelled", "1.0", tk.END)
+    
+    # Minimap and markers
+    def add_markers(self, kind, lines, color="#E0A000"):
+        """Add overview markers of one kind (e.g. "search", "diagnostics") at lines"""
+        lines = list(lines)
+        entry = self.markers.setdefault(kind, ([], color))
+        entry[0].extend(lines)
+        if self.minimap_view is not None:
+            self.minimap_view.add_markers(kind, lines, entry[1])
+    
+    def clear_markers(self, kind):
+        """Remove all overview markers of one kind"""
+        self.markers.pop(kind, None)
+        if self.minimap_view is not None:
+            self.minimap_view.clear_markers(kind)
+    
+    def toggle_minimap(self):
+        """Toggle the minimap overview"""
+        self.minimap = not self.minimap
+        if self.minimap:
+            if self.minimap_view is None:
+                self.minimap_view = BTkMinimap(self.editor_frame, self)
+            self.minimap_view.pack(side="right", fill="y", before=self.text_widget.frame)
+        elif self.minimap_view is not None:
+            self.minimap_view.pack_forget()
     
     def toggle_line_numbers(self):
         """Toggle line numbers visibility"""
         self.line_numbers = not self.line_numbers
         if self.line_numbers:
-            self.line_frame.pack(side="left", fill="y", before=self.text_widget)
-            self.update_line_numbers()
+            self.line_frame.pack(side="left", fill="y", before=self.text_widget.frame)
+            self._schedule_line_numbers()
         else:
             self.line_frame.pack_forget()
     
@@ -203,8 +2367,13 @@ class BTkTextEditor(tk.Frame):
         """Toggle syntax highlighting"""
         self.syntax_highlight = not self.syntax_highlight
         if self.syntax_highlight:
-            self.highlight_syntax()
+            self.configure_syntax_tags()
+            self._reset_highlight()
         else:
-            # Clear all syntax tags
-            for tag in ["keyword", "string", "comment", "number", "function"]:
-                self.text_widget.tag_delete(tag)
+            # Clear all syntax tags (tag_remove keeps their configured fonts)
+            self._cancel_highlight()
+            self._stop_background_highlight()
+            self._highlight_dirty.clear()
+            self._line_states = []
+            for tag in self.SYNTAX_TAGS:
+                self.text_widget.tag_remove(tag, "1.0", tk.END)
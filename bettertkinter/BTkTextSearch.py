@@ -0,0 +1,162 @@
+import re
+import queue
+import threading
+
+class BTkTextSearch:
+    """Regex search running on a worker thread over a text snapshot or mapped file
+    
+    Every start() cancels the previous search. Matches stream back in batches
+    through poll(), which the owner calls from its own (Tk) thread. Each match
+    is a tuple (start, end, line, index, end_index): start and end are
+    character offsets into the snapshot, or byte offsets into a mapped file;
+    line, index and end_index (1-based line and Tk "line.col" indices) are
+    only filled in for text snapshots. Empty matches are skipped.
+    """
+    
+    BATCH_SIZE = 500
+    MAX_MATCHES = 200000
+    
+    def __init__(self):
+        self.matches = []
+        self.pattern = None
+        self.done = True
+        self.truncated = False
+        self._generation = 0
+        self._results = None
+    
+    @staticmethod
+    def compile(pattern, regex=False, case_sensitive=False, binary_encoding=None):
+        """Compile a search pattern; raises re.error for invalid regexes"""
+        if not regex:
+            pattern = re.escape(pattern)
+        flags = 0 if case_sensitive else re.IGNORECASE
+        if binary_encoding:
+            return re.compile(pattern.encode(binary_encoding), flags | re.MULTILINE)
+        return re.compile(pattern, flags | re.MULTILINE)
+    
+    def start(self, pattern, text=None, mapped=None):
+        """Search a compiled pattern in text or a BTkMappedFile"""
+        self.cancel()
+        self.matches = []
+        self.pattern = pattern
+        self.done = False
+        self.truncated = False
+        
+        generation = self._generation
+        results = queue.Queue()
+        self._results = results
+        if mapped is not None:
+            target = lambda: self._search_mapped(pattern, mapped, generation, results)
+        else:
+            target = lambda: self._search_text(pattern, text, generation, results)
+        threading.Thread(target=target, daemon=True).start()
+    
+    def cancel(self):
+        """Stop the running search; its remaining results are dropped"""
+        self._generation += 1
+        self._results = None
+        self.done = True
+    
+    def _search_text(self, pattern, text, generation, results):
+        """Worker: find matches in a string, tracking line and column"""
+        batch = []
+        line = 1
+        line_start = 0
+        counted = 0
+        found = 0
+        for match in pattern.finditer(text):
+            if self._generation != generation:
+                return
+            start, end = match.span()
+            if start == end:
+                continue
+            
+            # Advance the line counter incrementally from the previous match
+            newlines = text.count("\n", counted, start)
+            if newlines:
+                line += newlines
+                line_start = text.rfind("\n", counted, start) + 1
+            counted = start
+            
+            span_lines = text.count("\n", start, end)
+            if span_lines:
+                end_col = end - text.rfind("\n", start, end) - 1
+                end_index = f"{line + span_lines}.{end_col}"
+            else:
+                end_index = f"{line}.{end - line_start}"
+            batch.append((start, end, line, f"{line}.{start - line_start}", end_index))
+            
+            found += 1
+            if len(batch) >= self.BATCH_SIZE or found >= self.MAX_MATCHES:
+                results.put(batch)
+                batch = []
+                if found >= self.MAX_MATCHES:
+                    results.put(True)
+                    return
+        results.put(batch)
+        results.put(False)
+    
+    def _search_mapped(self, pattern, mapped, generation, results):
+        """Worker: find matches in a memory-mapped file as byte offsets"""
+        batch = []
+        found = 0
+        try:
+            for match in mapped.finditer(pattern):
+                if self._generation != generation:
+                    return
+                start, end = match.span()
+                if start == end:
+                    continue
+                batch.append((start, end, None, None, None))
+                
+                found += 1
+                if len(batch) >= self.BATCH_SIZE or found >= self.MAX_MATCHES:
+                    results.put(batch)
+                    batch = []
+                    if found >= self.MAX_MATCHES:
+                        results.put(True)
+                        return
+        except ValueError:
+            return  # File closed while searching
+        results.put(batch)
+        results.put(False)
+    
+    def poll(self):
+        """Collect streamed matches; returns the number of new matches"""
+        results = self._results
+        if results is None:
+            return 0
+        
+        added = 0
+        while True:
+            try:
+                item = results.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, bool):
+                # End of search; True means it stopped at MAX_MATCHES
+                self.truncated = item
+                self.done = True
+                self._results = None
+                break
+            self.matches.extend(item)
+            added += len(item)
+        return added
+
+# Benchmark
+if __name__ == "__main__":
+    import time
+    
+    text = "\n".join(f"line {i}: value = compute(x{i % 97}, 'needle' if {i} % 3 else None)"
+                     for i in range(100000))
+    search = BTkTextSearch()
+    
+    start = time.perf_counter()
+    for typed in ("n", "ne", "nee", "need", "needl", "needle"):
+        search.start(BTkTextSearch.compile(typed), text)
+    while not search.done:
+        search.poll()
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    print(f"{len(search.matches)} matches for 'needle' in {elapsed * 1000:.1f} ms "
+          f"(5 stale searches cancelled), first: {search.matches[0]}")
@@ -0,0 +1,307 @@
+import sys
+import weakref
+import tkinter as tk
+from types import MappingProxyType
+from .BTkTclBatch import BTkTclBatch
+
+def shade(color, amount):
+    """Mix a #RRGGBB color toward white (amount > 0) or black (amount < 0)
+    
+    Named colors such as "white" are returned unchanged.
+    """
+    if len(color) != 7 or color[0] != "#":
+        return color
+    channels = [int(color[i:i + 2], 16) for i in (1, 3, 5)]
+    if amount < 0:
+        channels = [round(channel * (1 + amount)) for channel in channels]
+    else:
+        channels = [round(channel + (255 - channel) * amount) for channel in channels]
+    return "#%02X%02X%02X" % tuple(channels)
+
+# Colors of the remaining widgets, keyed by their color options; partial
+# palettes given to a theme are completed from these
+WIDGET_COLORS = {
+    "window": {"bg": "#FFFFFF"},
+    "label": {"text_color": "#333333", "hover_color": "#F8F9FA"},
+    "entry": {"bg_color": "#FFFFFF", "border_color": "#CED4DA", "focus_border_color": "#007BFF",
+              "text_color": "#333333", "placeholder_color": "#6C757D", "selection_bg": "#007BFF"},
+    "checkbox": {"bg_color": "#FFFFFF", "check_color": "#007BFF", "border_color": "#CED4DA",
+                 "text_color": "#333333", "hover_color": "#E3F2FD"},
+    "progress": {"bg_color": "#E9ECEF", "progress_color": "#007BFF", "text_color": "#333333",
+                 "border_color": "#CED4DA"},
+    "switch": {"bg_color_off": "#CCCCCC", "bg_color_on": "#0078D7", "handle_color": "#FFFFFF",
+               "border_color": "#999999"},
+    "slider": {"bg_color": "#E0E0E0", "fg_color": "#0078D7", "handle_color": "#FFFFFF",
+               "handle_border_color": "#0078D7"},
+}
+
+def _palette(values):
+    """Read-only palette with interned color strings"""
+    return MappingProxyType({key: sys.intern(value) if isinstance(value, str) else value
+                             for key, value in values.items()})
+
+class BTkTheme:
+    """Named set of style palettes for buttons, frames and dialog buttons
+    
+    Palettes are built once when the theme is created: hover and press shades
+    missing from a button style are derived from its background, dialog
+    buttons without an active color take the hover shade, and color strings
+    are interned. Widgets of a style share one read-only palette. Unknown
+    styles fall back to "primary" for buttons and "default" for frames and
+    dialog buttons. widgets holds one palette per other widget kind (see
+    WIDGET_COLORS), including the "window" background.
+    """
+    
+    # Constants
+    HOVER_SHADE = -0.15    # Derived hover color, darker by 15 %
+    PRESS_SHADE = -0.28    # Derived press color
+    
+    def __init__(self, name, buttons, frames, dialog_buttons, hover_shade=HOVER_SHADE, press_shade=PRESS_SHADE,
+                 widgets=None):
+        self.name = sys.intern(name)
+        self.buttons = {}
+        for style, colors in buttons.items():
+            self.buttons[style] = _palette({
+                "bg": colors["bg"],
+                "hover": colors.get("hover") or shade(colors["bg"], hover_shade),
+                "press": colors.get("press") or shade(colors["bg"], press_shade),
+                "fg": colors["fg"],
+            })
+        self.frames = {style: _palette(preset) for style, preset in frames.items()}
+        self.dialog_buttons = {}
+        for style, colors in dialog_buttons.items():
+            self.dialog_buttons[style] = _palette({
+                "bg": colors["bg"],
+                "fg": colors["fg"],
+                "active_bg": colors.get("active_bg") or shade(colors["bg"], hover_shade),
+            })
+        widgets = widgets or {}
+        self.widgets = {kind: _palette({**WIDGET_COLORS.get(kind, {}), **widgets.get(kind, {})})
+                        for kind in {**WIDGET_COLORS, **widgets}}
+    
+    def button_palette(self, style):
+        """Get {"bg", "hover", "press", "fg"} for a button style"""
+        return self.buttons.get(style) or self.buttons["primary"]
+    
+    def frame_palette(self, style):
+        """Get {"bg", "border", "radius", "shadow", "shadow_color"} for a frame style"""
+        return self.frames.get(style) or self.frames["default"]
+    
+    def dialog_button_palette(self, style):
+        """Get {"bg", "fg", "active_bg"} for a dialog button style"""
+        return self.dialog_buttons.get(style) or self.dialog_buttons["default"]
+
+    def widget_palette(self, kind):
+        """Get the colors of a widget kind such as "entry", keyed by its color options"""
+        return self.widgets[kind]
+
+# Registry
+_themes = {}
+_current = None
+_subscribers = weakref.WeakSet()
+_backgrounds = {}    # Widget path -> background recorded by the running set_theme()
+
+def register_theme(theme):
+    """Add a theme to the registry, replacing one of the same name"""
+    _themes[theme.name] = theme
+    return theme
+
+def theme_names():
+    """Get the names of the registered themes"""
+    return list(_themes)
+
+def get_theme(name=None):
+    """Get a registered theme by name, or the current theme"""
+    if name is None:
+        return _current
+    try:
+        return _themes[name]
+    except KeyError:
+        raise ValueError(f"Unknown theme: {name!r}") from None
+
+def subscribe(widget):
+    """Recolor a widget on set_theme() while it is alive
+    
+    The widget is held by weak reference and must implement
+    apply_theme(theme, batch), recoloring its items with itemconfigure only
+    (see BTkCanvasWidget.recolor()) and its background with
+    set_background(), recording them into batch.
+    """
+    _subscribers.add(widget)
+
+def set_background(widget, color, batch=None):
+    """Change a widget's background in place, recorded into batch if given
+    
+    Within set_theme() the new color is what parent_background() reports to
+    the widget's children.
+    """
+    command = (widget._w, "configure", "-bg", color)
+    if batch is not None:
+        _backgrounds[widget._w] = color
+        batch.extend((command,))
+    else:
+        widget.tk.call(command)
+
+def parent_background(widget):
+    """Get the background of a widget's parent, as set_theme() is changing it"""
+    parent = widget.master
+    color = _backgrounds.get(parent._w)
+    if color is None:
+        try:
+            color = parent.cget("bg")
+        except tk.TclError:
+            color = WIDGET_COLORS["window"]["bg"]
+    return color
+
+def set_theme(theme):
+    """Make a theme current and recolor every live subscribed widget
+    
+    theme is a registered name or a BTkTheme, which gets registered. The
+    itemconfigure and background commands of all widgets are collected and
+    sent in one Tcl call per interpreter; nothing is resized, moved or
+    recreated. Parents are themed before their children, so a canvas whose
+    corners show its parent's background gets the parent's new color.
+    Commands for widgets destroyed meanwhile are skipped.
+    """
+    global _current
+    if isinstance(theme, BTkTheme):
+        register_theme(theme)
+    else:
+        theme = get_theme(theme)
+    _current = theme
+    
+    batches = {}
+    try:
+        for widget in sorted(_subscribers, key=lambda widget: widget._w.rstrip(".").count(".")):
+            batch = batches.get(widget.tk)
+            if batch is None:
+                batch = batches[widget.tk] = BTkTclBatch(widget, ignore_errors=True)
+            try:
+                widget.apply_theme(theme, batch)
+            except Exception as e:
+                print(f"Theme error: {e}")
+    finally:
+        _backgrounds.clear()
+    for batch in batches.values():
+        batch.run()
+    return theme
+
+# Built-in themes
+LIGHT = register_theme(BTkTheme(
+    "light",
+    buttons={
+        "primary": {"bg": "#007BFF", "hover": "#0056B3", "press": "#004085", "fg": "white"},
+        "success": {"bg": "#28A745", "hover": "#1E7E34", "press": "#155724", "fg": "white"},
+        "warning": {"bg": "#FFC107", "hover": "#E0A800", "press": "#D39E00", "fg": "#212529"},
+        "danger": {"bg": "#DC3545", "hover": "#BD2130", "press": "#A71E2A", "fg": "white"},
+        "secondary": {"bg": "#6C757D", "hover": "#5A6268", "press": "#494F54", "fg": "white"},
+        "light": {"bg": "#F8F9FA", "hover": "#E2E6EA", "press": "#DAE0E5", "fg": "#212529"},
+        "dark": {"bg": "#343A40", "hover": "#23272B", "press": "#1D2024", "fg": "white"},
+    },
+    frames={
+        "default": {"bg": "#FFFFFF", "border": "#E0E0E0", "radius": 8, "shadow": False, "shadow_color": "#E0E0E0"},
+        "card": {"bg": "#FFFFFF", "border": "#D0D0D0", "radius": 12, "shadow": True, "shadow_color": "#E0E0E0"},
+        "modern": {"bg": "#F8F9FA", "border": "#DEE2E6", "radius": 10, "shadow": False, "shadow_color": "#E0E0E0"},
+        "dark": {"bg": "#343A40", "border": "#495057", "radius": 8, "shadow": True, "shadow_color": "#E0E0E0"},
+        "light": {"bg": "#F8F9FA", "border": "#E9ECEF", "radius": 6, "shadow": False, "shadow_color": "#E0E0E0"},
+        "primary": {"bg": "#E3F2FD", "border": "#2196F3", "radius": 8, "shadow": False, "shadow_color": "#E0E0E0"},
+        "success": {"bg": "#E8F5E8", "border": "#4CAF50", "radius": 8, "shadow": False, "shadow_color": "#E0E0E0"},
+    },
+    dialog_buttons={
+        "default": {"bg": "#E9ECEF", "fg": "#333333", "active_bg": "#DEE2E6"},
+        "primary": {"bg": "#007BFF", "fg": "#FFFFFF", "active_bg": "#0056B3"},
+        "success": {"bg": "#28A745", "fg": "#FFFFFF", "active_bg": "#1E7E34"},
+        "warning": {"bg": "#FFC107", "fg": "#212529", "active_bg": "#E0A800"},
+        "danger": {"bg": "#DC3545", "fg": "#FFFFFF", "active_bg": "#C82333"},
+    },
+))
+
+# Hover and press shades are derived, lighter than the background on dark surfaces
+DARK = register_theme(BTkTheme(
+    "dark",
+    buttons={
+        "primary": {"bg": "#3D8BFD", "fg": "white"},
+        "success": {"bg": "#2EA44F", "fg": "white"},
+        "warning": {"bg": "#FFCA2C", "fg": "#212529"},
+        "danger": {"bg": "#E35D6A", "fg": "white"},
+        "secondary": {"bg": "#6C757D", "fg": "white"},
+        "light": {"bg": "#495057", "fg": "#F8F9FA"},
+        "dark": {"bg": "#1D2024", "fg": "#F8F9FA"},
+    },
+    frames={
+        "default": {"bg": "#2B3035", "border": "#495057", "radius": 8, "shadow": False, "shadow_color": "#121416"},
+        "card": {"bg": "#2B3035", "border": "#3D4349", "radius": 12, "shadow": True, "shadow_color": "#121416"},
+        "modern": {"bg": "#212529", "border": "#343A40", "radius": 10, "shadow": False, "shadow_color": "#121416"},
+        "dark": {"bg": "#1D2024", "border": "#343A40", "radius": 8, "shadow": True, "shadow_color": "#121416"},
+        "light": {"bg": "#343A40", "border": "#495057", "radius": 6, "shadow": False, "shadow_color": "#121416"},
+        "primary": {"bg": "#0B2A4A", "border": "#3D8BFD", "radius": 8, "shadow": False, "shadow_color": "#121416"},
+        "success": {"bg": "#0F2E1A", "border": "#2EA44F", "radius": 8, "shadow": False, "shadow_color": "#121416"},
+    },
+    dialog_buttons={
+        "default": {"bg": "#495057", "fg": "#F8F9FA"},
+        "primary": {"bg": "#3D8BFD", "fg": "#FFFFFF"},
+        "success": {"bg": "#2EA44F", "fg": "#FFFFFF"},
+        "warning": {"bg": "#FFCA2C", "fg": "#212529"},
+        "danger": {"bg": "#E35D6A", "fg": "#FFFFFF"},
+    },
+    hover_shade=0.12,
+    press_shade=0.24,
+    widgets={
+        "window": {"bg": "#212529"},
+        "label": {"text_color": "#E9ECEF", "hover_color": "#343A40"},
+        "entry": {"bg_color": "#2B3035", "border_color": "#495057", "focus_border_color": "#3D8BFD",
+                  "text_color": "#E9ECEF", "placeholder_color": "#ADB5BD", "selection_bg": "#3D8BFD"},
+        "checkbox": {"bg_color": "#2B3035", "check_color": "#3D8BFD", "border_color": "#6C757D",
+                     "text_color": "#E9ECEF", "hover_color": "#1C3553"},
+        "progress": {"bg_color": "#343A40", "progress_color": "#3D8BFD", "text_color": "#E9ECEF",
+                     "border_color": "#495057"},
+        "switch": {"bg_color_off": "#495057", "bg_color_on": "#3D8BFD", "handle_color": "#F8F9FA",
+                   "border_color": "#6C757D"},
+        "slider": {"bg_color": "#495057", "fg_color": "#3D8BFD", "handle_color": "#F8F9FA",
+                   "handle_border_color": "#3D8BFD"},
+    },
+))
+
+_current = LIGHT
+
+# Benchmark
+if __name__ == "__main__":
+    import time
+    import tkinter as tk
+    from .BTkButton import BTkButton
+    from .BTkFrame import BTkFrame
+    
+    root = tk.Tk()
+    root.title("BTkTheme Benchmark")
+    root.configure(bg="#FFFFFF")
+    
+    # 2,000 themed widgets: 1,000 buttons of every style and 1,000 frames
+    button_styles = list(LIGHT.buttons)
+    frame_styles = list(LIGHT.frames)
+    widgets = []
+    for i in range(1000):
+        button = BTkButton(root, text=f"B{i}", style=button_styles[i % len(button_styles)], width=60, height=30)
+        button.grid(row=i // 40, column=i % 40)
+        frame = BTkFrame(root, style=frame_styles[i % len(frame_styles)], width=60, height=30)
+        frame.grid(row=25 + i // 40, column=i % 40)
+        widgets.extend((button, frame))
+    root.update()
+    
+    def switch_direct(theme):
+        """The same recoloring with one Tcl call per itemconfigure"""
+        global _current
+        _current = theme
+        for widget in widgets:
+            widget.apply_theme(theme)
+    
+    for switch in (switch_direct, set_theme):
+        timings = []
+        for theme in (DARK, LIGHT) * 5:
+            start = time.perf_counter()
+            switch(theme)
+            timings.append((time.perf_counter() - start) * 1000)
+            root.update()
+        print(f"{switch.__name__:13} {len(widgets)} widgets: {sum(timings) / len(timings):6.2f} ms per switch "
+              f"(max {max(timings):.2f} ms, frame budget {1000 / 60:.1f} ms)")
+    
+    root.destroy()
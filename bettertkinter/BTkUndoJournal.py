@@ -0,0 +1,266 @@
+import time
+import zlib
+from collections import deque
+from contextlib import contextmanager
+
+class BTkUndoEdit:
+    """One recorded edit: text deleted and inserted at (line, col)
+    
+    Texts above BTkUndoJournal.COMPRESS_CHARS are kept zlib-compressed.
+    """
+    
+    __slots__ = ('line', 'col', '_deleted', '_inserted', 'size')
+    
+    def __init__(self, line, col, deleted, inserted):
+        self.line = line
+        self.col = col
+        self._deleted = BTkUndoJournal.pack(deleted)
+        self._inserted = BTkUndoJournal.pack(inserted)
+        self.size = BTkUndoJournal.text_size(self._deleted) + BTkUndoJournal.text_size(self._inserted)
+    
+    @property
+    def deleted(self):
+        return BTkUndoJournal.unpack(self._deleted)
+    
+    @property
+    def inserted(self):
+        return BTkUndoJournal.unpack(self._inserted)
+    
+    @property
+    def index(self):
+        """Text widget index of the edit"""
+        return f"{self.line}.{self.col}"
+    
+    @staticmethod
+    def end_of(line, col, text):
+        """Get (line, col) after text inserted at (line, col)"""
+        newlines = text.count("\n")
+        if newlines:
+            return line + newlines, len(text) - text.rfind("\n") - 1
+        return line, col + len(text)
+    
+    def is_typing(self):
+        """Whether this is a short single-line insertion"""
+        return (not self._deleted and isinstance(self._inserted, str)
+                and "\n" not in self._inserted)
+    
+    def is_deleting(self):
+        """Whether this is a short single-line deletion"""
+        return (not self._inserted and isinstance(self._deleted, str)
+                and "\n" not in self._deleted)
+
+class BTkUndoStep:
+    """Edits undone and redone together"""
+    
+    __slots__ = ('edits', 'size', 'time', 'closed')
+    
+    def __init__(self, edit, now):
+        self.edits = [edit]
+        self.size = edit.size
+        self.time = now
+        self.closed = False
+
+class BTkUndoJournal:
+    """Undo/redo history with edit coalescing and a memory budget
+    
+    Consecutive typing or deleting within group_timeout seconds is merged
+    into one step, broken at word boundaries and newlines; edits arriving
+    within action_gap seconds of each other (e.g. a selection being
+    replaced) share a step. group() turns everything recorded inside it
+    into one closed step, which is how bulk operations such as replace-all
+    become a single checkpoint. The oldest steps are evicted once the
+    history holds more than max_bytes.
+    """
+    
+    # Texts at least this long are stored compressed
+    COMPRESS_CHARS = 64 * 1024
+    
+    def __init__(self, max_bytes=32 * 1024 * 1024, group_timeout=1.0, action_gap=0.05,
+                 clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.group_timeout = group_timeout
+        self.action_gap = action_gap
+        self.clock = clock
+        
+        self._undo = deque()
+        self._redo = []
+        self._group_depth = 0
+        self._group_step = None
+        self.bytes = 0
+    
+    # Storage
+    @staticmethod
+    def pack(text):
+        if len(text) >= BTkUndoJournal.COMPRESS_CHARS:
+            return zlib.compress(text.encode("utf-8", "surrogatepass"), 1)
+        return text
+    
+    @staticmethod
+    def unpack(data):
+        if isinstance(data, bytes):
+            return zlib.decompress(data).decode("utf-8", "surrogatepass")
+        return data
+    
+    @staticmethod
+    def text_size(data):
+        """Approximate bytes held by a stored text"""
+        if isinstance(data, bytes):
+            return len(data)
+        return len(data) if data.isascii() else 4 * len(data)
+    
+    # Recording
+    def record(self, line, col, deleted, inserted):
+        """Record an edit at (line, col) that replaced deleted with inserted"""
+        edit = BTkUndoEdit(line, col, deleted, inserted)
+        now = self.clock()
+        self._drop_redo()
+        
+        if self._group_depth:
+            if self._group_step is None:
+                self._group_step = BTkUndoStep(edit, now)
+                self._group_step.closed = True
+                self._push(self._group_step)
+            else:
+                self._append(self._group_step, edit, now)
+            self._evict()
+            return
+        
+        last = self._undo[-1] if self._undo else None
+        if last is not None and not last.closed:
+            if now - last.time <= self.group_timeout and self._merge(last, edit, now):
+                self._evict()
+                return
+            if now - last.time <= self.action_gap:
+                self._append(last, edit, now)
+                self._evict()
+                return
+        
+        self._push(BTkUndoStep(edit, now))
+        self._evict()
+    
+    def _merge(self, step, edit, now):
+        """Coalesce typing or deleting into the step's last edit"""
+        previous = step.edits[-1]
+        if edit.is_typing() and previous.is_typing():
+            end = BTkUndoEdit.end_of(previous.line, previous.col, previous._inserted)
+            text = edit._inserted
+            if (edit.line, edit.col) != end or not text:
+                return False
+            if text[0].isspace() and not previous._inserted[-1:].isspace():
+                return False  # Word boundary
+            merged = BTkUndoEdit(previous.line, previous.col, "", previous._inserted + text)
+        elif edit.is_deleting() and previous.is_deleting():
+            end = BTkUndoEdit.end_of(edit.line, edit.col, edit._deleted)
+            if end == (previous.line, previous.col):
+                # Backspace
+                merged = BTkUndoEdit(edit.line, edit.col, edit._deleted + previous._deleted, "")
+            elif (edit.line, edit.col) == (previous.line, previous.col):
+                # Forward delete
+                merged = BTkUndoEdit(edit.line, edit.col, previous._deleted + edit._deleted, "")
+            else:
+                return False
+        else:
+            return False
+        
+        step.edits[-1] = merged
+        self._resize(step, merged.size - previous.size)
+        step.time = now
+        return True
+    
+    def _append(self, step, edit, now):
+        step.edits.append(edit)
+        self._resize(step, edit.size)
+        step.time = now
+    
+    def _push(self, step):
+        self._undo.append(step)
+        self.bytes += step.size
+    
+    def _resize(self, step, delta):
+        # Only the newest step (or the open group) grows, always on the undo stack
+        step.size += delta
+        self.bytes += delta
+    
+    def _drop_redo(self):
+        for step in self._redo:
+            self.bytes -= step.size
+        self._redo = []
+    
+    def _evict(self):
+        """Drop the oldest steps until the history fits max_bytes"""
+        while self.bytes > self.max_bytes and self._undo:
+            step = self._undo.popleft()
+            self.bytes -= step.size
+            if step is self._group_step:
+                self._group_step = None
+    
+    def checkpoint(self):
+        """End the current step; the next edit starts a new one"""
+        if self._undo:
+            self._undo[-1].closed = True
+    
+    @contextmanager
+    def group(self):
+        """Record everything inside the block as one closed undo step (a checkpoint)"""
+        if self._group_depth == 0:
+            self.checkpoint()
+            self._group_step = None
+        self._group_depth += 1
+        try:
+            yield self
+        finally:
+            self._group_depth -= 1
+            if self._group_depth == 0:
+                self._group_step = None
+    
+    # Undo/redo
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+    
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+    
+    def undo(self):
+        """Take the latest step; returns its edits (apply them in reverse) or None"""
+        if not self._undo:
+            return None
+        step = self._undo.pop()
+        step.closed = True
+        self._redo.append(step)
+        return step.edits
+    
+    def redo(self):
+        """Take the next undone step; returns its edits (apply them in order) or None"""
+        if not self._redo:
+            return None
+        step = self._redo.pop()
+        self._undo.append(step)
+        return step.edits
+    
+    def clear(self):
+        """Forget all history"""
+        self._undo.clear()
+        self._redo = []
+        self.bytes = 0
+        self._group_step = None
+
+# Demo
+if __name__ == "__main__":
+    clock = [0.0]
+    journal = BTkUndoJournal(max_bytes=1024 * 1024, clock=lambda: clock[0])
+    
+    # Typing "hello world" quickly, then a pause and a paste
+    col = 0
+    for char in "hello world":
+        clock[0] += 0.1
+        journal.record(1, col, "", char)
+        col += 1
+    clock[0] += 5
+    journal.record(1, col, "", "x" * 500000)
+    print(f"{len(journal._undo)} steps, {journal.bytes} bytes held")
+    
+    while journal.can_undo:
+        edits = journal.undo()
+        print("undo:", [(edit.index, edit.inserted[:12]) for edit in edits])
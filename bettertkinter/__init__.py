@@ -4,18 +4,25 @@ from .BTkFrame import BTkFrame
 from .BTk import BTk
 from .BTkLabel import BTkLabel
 from .BTkEntry import BTkEntry
-from .BTkDialog import BTkDialog
+from .BTkDialog import BTkDialog, BTkOverlayDialog
 from .BTkNavBar import BTkNavBar
 from .BTkProgressBar import BTkProgressBar
 from .BTkCheckBox import BTkCheckBox
 from .BTkColorPicker import BTkColorPicker
 from .BTkSystemTray import BTkSystemTray
+from .BTkNotificationCenter import (BTkNotificationCenter, BTkNotificationBackend,
+                                    BTkTrayNotificationBackend, BTkMemoryNotificationBackend)
 from .BTkSlider import BTkSlider
+from .BTkAnimator import BTkAnimator
+from .BTkCanvasWidget import BTkCanvasWidget
+from .BTkTheme import BTkTheme, register_theme, get_theme, set_theme
 
 __version__ = "2.0.0"
 __author__ = "BetterTkinter Team"
 __all__ = [
     "BTkButton", "BTkFrame", "BTk", "BTkLabel", "BTkEntry", 
-    "BTkDialog", "BTkNavBar", "BTkProgressBar", "BTkCheckBox", "BTkColorPicker", 
-    "BTkSystemTray", "BTkSlider"
+    "BTkDialog", "BTkOverlayDialog", "BTkNavBar", "BTkProgressBar", "BTkCheckBox", "BTkColorPicker", 
+    "BTkSystemTray", "BTkSlider", "BTkNotificationCenter", "BTkNotificationBackend",
+    "BTkTrayNotificationBackend", "BTkMemoryNotificationBackend", "BTkAnimator",
+    "BTkCanvasWidget", "BTkTheme", "register_theme", "get_theme", "set_theme"
 ]
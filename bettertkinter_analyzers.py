@@ -0,0 +1,68 @@
+import ast
+
+class BTkDiagnostic:
+    """A problem reported by an analyzer; lines are 1-based, columns 0-based"""
+    
+    __slots__ = ('line', 'col', 'end_line', 'end_col', 'message', 'severity')
+    
+    def __init__(self, line, col, end_line, end_col, message, severity="error"):
+        self.line = line
+        self.col = col
+        self.end_line = end_line
+        self.end_col = end_col
+        self.message = message
+        self.severity = severity
+    
+    def __repr__(self):
+        return f"BTkDiagnostic({self.line}:{self.col}, {self.message!r})"
+
+def analyze_python(text):
+    """Analyzer for Python source: syntax diagnostics and a class/function outline
+    
+    Analyzers run in a spawned worker process, so they must be picklable
+    top-level functions in a module that does not import the GUI package,
+    like this one: the worker imports that module and nothing else of
+    bettertkinter. They take the buffer text and return (diagnostics,
+    symbols): a list of BTkDiagnostic and a list of (kind, name, line,
+    depth) tuples.
+    """
+    try:
+        tree = ast.parse(text, "<buffer>")
+        # Errors only found while compiling (e.g. "return" outside a function)
+        compile(tree, "<buffer>", "exec", dont_inherit=True)
+    except SyntaxError as e:
+        line = e.lineno or 1
+        col = max((e.offset or 1) - 1, 0)
+        return [BTkDiagnostic(line, col, line, col + 1, e.msg)], []
+    except (ValueError, RecursionError) as e:
+        return [BTkDiagnostic(1, 0, 1, 1, str(e))], []
+    
+    symbols = []
+    kinds = {ast.ClassDef: "class", ast.FunctionDef: "function",
+             ast.AsyncFunctionDef: "function"}
+    
+    def visit(node, depth):
+        for child in ast.iter_child_nodes(node):
+            kind = kinds.get(type(child))
+            if kind is not None:
+                symbols.append((kind, child.name, child.lineno, depth))
+                visit(child, depth + 1)
+            elif not isinstance(child, (ast.expr, ast.Lambda)):
+                visit(child, depth)
+    
+    visit(tree, 0)
+    return [], symbols
+
+# Benchmark
+if __name__ == "__main__":
+    import time
+    
+    source = "\n".join(
+        f"class Model{i}:\n    def method(self, value):\n        return value * {i}\n"
+        for i in range(10000))
+    
+    start = time.perf_counter()
+    diagnostics, symbols = analyze_python(source)
+    elapsed = time.perf_counter() - start
+    print(f"{len(symbols)} symbols, {len(diagnostics)} diagnostics in {elapsed * 1000:.0f} ms "
+          f"for {source.count(chr(10)) + 1} lines")
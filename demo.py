@@ -4,6 +4,7 @@ import logging
 import sys
 import traceback
 import threading
+import queue
 import time
 from datetime import datetime
 import os
@@ -146,11 +147,16 @@ class ErrorHandler:
 class LogDisplay:
     """Real-time log display widget"""
     
+    MAX_LINES = 5000  # Oldest lines are trimmed beyond this
+    FRAME_MS = 16     # Queued records are appended once per frame
+    
     def __init__(self, parent):
         self.logger = logging.getLogger('BTkDemo.LogDisplay')
         self.parent = parent
+        self.pending = queue.Queue()
         self.setup_ui()
         self.setup_log_handler()
+        self.log_text.after(self.FRAME_MS, self.flush_logs)
     
     def setup_ui(self):
         """Setup the log display UI"""
@@ -196,43 +202,21 @@ class LogDisplay:
         """Setup custom log handler to display logs in real-time"""
         try:
             class TextHandler(logging.Handler):
-                def __init__(self, text_widget, logger_ref):
+                def __init__(self, pending, logger_ref):
                     super().__init__()
-                    self.text_widget = text_widget
+                    self.pending = pending
                     self.logger_ref = logger_ref
                 
                 def emit(self, record):
                     try:
-                        msg = self.format(record)
-                        
-                        # Color coding based on log level
-                        color = {
-                            'DEBUG': '#888888',
-                            'INFO': '#ffffff', 
-                            'WARNING': '#ffaa00',
-                            'ERROR': '#ff4444',
-                            'CRITICAL': '#ff0000'
-                        }.get(record.levelname, '#ffffff')
-                        
-                        # Thread-safe GUI update
-                        def update_gui():
-                            try:
-                                self.text_widget.configure(state='normal')
-                                self.text_widget.insert('end', msg + '\n')
-                                self.text_widget.configure(state='disabled')
-                                self.text_widget.see('end')
-                            except tk.TclError:
-                                pass  # Widget destroyed
-                        
-                        if self.text_widget.winfo_exists():
-                            self.text_widget.after_idle(update_gui)
-                            
+                        # Thread-safe: records are queued and appended by flush_logs()
+                        self.pending.put(self.format(record))
                     except Exception as e:
                         # Avoid recursive logging errors
                         print(f"Log handler error: {e}")
             
             # Create and add the handler
-            self.text_handler = TextHandler(self.log_text, self.logger)
+            self.text_handler = TextHandler(self.pending, self.logger)
             formatter = logging.Formatter('%(asctime)s | %(levelname)8s | %(name)s | %(message)s',
                                         datefmt='%H:%M:%S')
             self.text_handler.setFormatter(formatter)
@@ -246,6 +230,31 @@ class LogDisplay:
         except Exception as e:
             self.logger.error(f"Failed to setup log handler: {e}")
     
+    def flush_logs(self):
+        """Append queued log lines in one insert and trim the oldest lines"""
+        lines = []
+        while True:
+            try:
+                lines.append(self.pending.get_nowait())
+            except queue.Empty:
+                break
+        
+        try:
+            if lines:
+                text = self.log_text
+                at_end = text.yview()[1] >= 1.0
+                text.configure(state='normal')
+                text.insert('end', '\n'.join(lines[-self.MAX_LINES:]) + '\n')
+                excess = int(text.index('end-1c').split('.')[0]) - 1 - self.MAX_LINES
+                if excess > 0:
+                    text.delete('1.0', f'{excess + 1}.0')
+                text.configure(state='disabled')
+                if at_end:
+                    text.see('end')  # Only follow while the user is at the bottom
+            self.log_text.after(self.FRAME_MS, self.flush_logs)
+        except tk.TclError:
+            pass  # Widget destroyed
+    
     def clear_logs(self):
         """Clear the log display"""
         try: